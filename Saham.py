@@ -13,6 +13,8 @@ from pwa_setup import inject_pwa_support, inject_keepalive
 from pages_trade_planner import trade_planner_page
 from pages_analysis import analysis_dashboard_page
 from pages_market_overview import market_overview_page
+from pages_news_universe import universe_sentiment_page
+from pages_scanner import scanner_page
 from pages_technical_tools import technical_tools_page
 from pages_right_issue import right_issue_calculator_page
 from state_manager import get_param, set_param
@@ -217,6 +219,8 @@ def main() -> None:
                 "Screener Saham",
                 "Kalkulator Saham",
                 "Market Overview",
+                "Sentimen Pasar",
+                "Scanner Saham",
                 "Technical Tools",
                 "Analisa Lengkap",
                 "Trade Planner",
@@ -231,7 +235,7 @@ def main() -> None:
         menu_selection = option_menu(
             None,
             _menu_items,
-            icons=["graph-up", "search", "calculator", "grid", "tools", "activity", "clipboard-data", "bookmark", "percent", "briefcase", "ticket-perforated"],
+            icons=["graph-up", "search", "calculator", "grid", "newspaper", "radar", "tools", "activity", "clipboard-data", "bookmark", "percent", "briefcase", "ticket-perforated"],
             menu_icon="cast",
             default_index=_default_idx,
             orientation="vertical",
@@ -288,6 +292,10 @@ def main() -> None:
             calculator_page(calculator_submenu, fee_beli, fee_jual)
         elif menu_selection == "Market Overview":
             market_overview_page()
+        elif menu_selection == "Sentimen Pasar":
+            universe_sentiment_page()
+        elif menu_selection == "Scanner Saham":
+            scanner_page()
         elif menu_selection == "Technical Tools":
             technical_tools_page()
         elif menu_selection == "Analisa Lengkap":
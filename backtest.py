@@ -0,0 +1,121 @@
+"""Vectorized Signal Backtester.
+
+Turns a per-bar signal series into long-only trades without a Python loop
+over bars: the position is the forward-filled last entry/exit event, trades
+are its 0->1 / 1->0 transitions, and the equity curve is built from
+per-segment cash and share counts with cumulative sums.
+
+Orders fill at the next bar's open (no look-ahead), rounded to the IDX tick
+(buys up, sells down) with ``utils.round_price_to_tick``, in whole lots,
+with the broker fees of ``config.PLATFORM_CONFIG``.
+
+Compliance: OWASP API4 (Unrestricted Resource Consumption), CWE-400
+"""
+import math
+from typing import Any, Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+from config import PLATFORM_CONFIG
+from utils import get_tick_size, round_price_to_tick
+
+LOT_SIZE = 100                    # Shares per lot on IDX
+DEFAULT_CAPITAL = 10_000_000      # Rp
+DEFAULT_PLATFORM = "Stockbit"
+ENTRY_SIGNALS = ("BUY", "STRONG BUY")
+EXIT_SIGNALS = ("SELL", "STRONG SELL", "WEAK SELL")
+
+
+def positions_from_signals(signals: pd.Series, entry_signals: Iterable[str] = ENTRY_SIGNALS,
+                           exit_signals: Iterable[str] = EXIT_SIGNALS) -> np.ndarray:
+    """1 from an entry signal until the next exit signal, else 0 (decided at each bar's close)."""
+    values = np.asarray(signals)
+    events = np.where(np.isin(values, list(entry_signals)), 1.0,
+                      np.where(np.isin(values, list(exit_signals)), 0.0, np.nan))
+    return pd.Series(events).ffill().fillna(0).to_numpy(dtype=int)
+
+
+def _fill_price(price: float, side: str) -> int:
+    return round_price_to_tick(price, get_tick_size(price), 'ceil' if side == 'buy' else 'floor')
+
+
+def backtest_signals(
+    history: pd.DataFrame,
+    signals: pd.Series,
+    platform: str = DEFAULT_PLATFORM,
+    capital: float = DEFAULT_CAPITAL,
+    entry_signals: Iterable[str] = ENTRY_SIGNALS,
+    exit_signals: Iterable[str] = EXIT_SIGNALS,
+) -> Dict[str, Any]:
+    """Backtest a per-bar signal series on ``history`` (Open/Close, same index).
+
+    Returns dict with 'trades' (DataFrame), 'equity' (Series), 'total_pl',
+    'return_pct', 'win_rate', 'max_drawdown_pct', 'num_trades',
+    'buy_hold_pct' and 'fees'.
+    """
+    fee_buy, fee_sell = PLATFORM_CONFIG.get(platform, (0, 0))
+    opens = history['Open'].to_numpy(dtype=float)
+    closes = history['Close'].to_numpy(dtype=float)
+    n = len(closes)
+
+    # Decided at close t, executed at open t+1
+    held = np.zeros(n, dtype=int)
+    if n > 1:
+        held[1:] = positions_from_signals(signals, entry_signals, exit_signals)[:-1]
+    change = np.diff(np.concatenate([[0], held, [0]]))
+    entries = np.flatnonzero(change == 1)
+    exits = np.flatnonzero(change == -1)  # == n for a position still open at the end
+
+    cash = float(capital)
+    rows = []
+    seg_cash = np.zeros(len(entries))
+    seg_shares = np.zeros(len(entries))
+    total_fees = 0.0
+    # One iteration per trade (not per bar): lot sizing compounds on the cash left
+    for i, (entry, exit_) in enumerate(zip(entries, exits)):
+        buy = _fill_price(opens[entry], 'buy')
+        lots = math.floor(cash / (buy * LOT_SIZE * (1 + fee_buy))) if buy > 0 else 0
+        shares = lots * LOT_SIZE
+        cost = shares * buy * (1 + fee_buy)
+        still_open = exit_ >= n
+        sell = closes[-1] if still_open else _fill_price(opens[exit_], 'sell')
+        proceeds = shares * sell * (1 - (0 if still_open else fee_sell))
+        seg_cash[i], seg_shares[i] = cash - cost, shares
+        total_fees += shares * buy * fee_buy + (0 if still_open else shares * sell * fee_sell)
+        rows.append({
+            'Tanggal Beli': history.index[entry], 'Harga Beli': buy, 'Lot': lots,
+            'Tanggal Jual': None if still_open else history.index[exit_], 'Harga Jual': sell,
+            'P/L (Rp)': proceeds - cost, 'Return %': (proceeds / cost - 1) * 100 if cost else 0.0,
+            'Status': 'Terbuka' if still_open else 'Selesai',
+        })
+        cash = cash - cost + proceeds
+
+    # Equity curve: base cash, replaced inside each holding segment by (cash left + shares x close)
+    cash_curve = np.full(n, float(capital))
+    if len(entries):
+        final_cash = np.array([r['P/L (Rp)'] for r in rows]).cumsum() + capital
+        after_exit = np.concatenate([[capital], final_cash])
+        seg_id = np.searchsorted(entries, np.arange(n), side='right') - 1
+        in_trade = (seg_id >= 0) & (np.arange(n) < exits[np.maximum(seg_id, 0)])
+        cash_curve = np.where(in_trade, seg_cash[np.maximum(seg_id, 0)], after_exit[seg_id + 1])
+        shares_curve = np.where(in_trade, seg_shares[np.maximum(seg_id, 0)], 0.0)
+    else:
+        shares_curve = np.zeros(n)
+    equity = pd.Series(cash_curve + shares_curve * closes, index=history.index, name='Equity')
+
+    trades = pd.DataFrame(rows, columns=['Tanggal Beli', 'Harga Beli', 'Lot', 'Tanggal Jual', 'Harga Jual',
+                                         'P/L (Rp)', 'Return %', 'Status'])
+    closed = trades[trades['Status'] == 'Selesai']
+    drawdown = equity / equity.cummax() - 1 if n else pd.Series(dtype=float)
+    return {
+        'trades': trades,
+        'equity': equity,
+        'total_pl': float(equity.iloc[-1] - capital) if n else 0.0,
+        'return_pct': float((equity.iloc[-1] / capital - 1) * 100) if n else 0.0,
+        'win_rate': float((closed['P/L (Rp)'] > 0).mean() * 100) if len(closed) else 0.0,
+        'max_drawdown_pct': float(drawdown.min() * 100) if n else 0.0,
+        'num_trades': int(len(trades)),
+        'buy_hold_pct': float((closes[-1] / opens[0] - 1) * 100) if n and opens[0] else 0.0,
+        'fees': total_fees,
+    }
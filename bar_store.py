@@ -0,0 +1,268 @@
+"""Incremental OHLCV Bar Store.
+
+Keeps daily history per symbol on local disk (Parquet when pyarrow is
+available, CSV otherwise) and only asks Yahoo for bars after the last stored
+date. Overlapping bars are compared on every delta fetch: if Yahoo has
+re-adjusted past prices (split or dividend), or the new bars carry a split
+or dividend, the symbol is rebuilt from a full download.
+
+Every history consumer reads through ``bar_store.get_history`` so a symbol's
+five years of bars are downloaded once and then topped up bar by bar. Each
+Yahoo request the store makes takes a ``yfinance_limiter`` token (coalesced
+waiters and disk hits take none); without one the stored bars are served.
+
+Compliance: OWASP API4 (Unrestricted Resource Consumption), CWE-400
+"""
+import os
+import re
+import time
+import threading
+from typing import Dict, Optional
+
+import pandas as pd
+import yfinance as yf
+
+from logger import get_logger, log_security_event
+from rate_limiter import RateLimiter, yfinance_limiter
+from singleflight import yahoo_flight
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'bars')
+STORE_PERIOD = '5y'          # Depth kept on disk; longer periods bypass the store
+STORE_DAYS = 5 * 365
+REFRESH_INTERVAL = 300       # Seconds between delta fetches for the same symbol
+OVERLAP_DAYS = 7             # Calendar days re-fetched to detect re-adjusted prices
+ADJUSTMENT_RTOL = 1e-4       # Relative Close drift on overlapping bars that forces a rebuild
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume', 'Dividends', 'Stock Splits']
+IDX_TIMEZONE = 'Asia/Jakarta'
+
+
+class RateLimitedError(RuntimeError):
+    """No ``yfinance_limiter`` token was available for a Yahoo request."""
+
+
+_UNIT_DAYS = {'d': 1, 'wk': 7, 'mo': 30, 'y': 365}
+
+_PERIOD_PATTERN = re.compile(r'^(\d+)(d|wk|mo|y)$')
+
+
+def _period_offset(period: str) -> Optional[pd.DateOffset]:
+    """Translate a yfinance period ('1mo', '5y', ...) into a DateOffset; None for 'max'/unknown."""
+    match = _PERIOD_PATTERN.match(period)
+    if not match:
+        return None
+    n, unit = int(match.group(1)), match.group(2)
+    return {
+        'd': pd.DateOffset(days=n),
+        'wk': pd.DateOffset(weeks=n),
+        'mo': pd.DateOffset(months=n),
+        'y': pd.DateOffset(years=n),
+    }[unit]
+
+
+def slice_period(history: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Return the trailing ``period`` of ``history`` the way ``Ticker.history(period=...)`` would.
+
+    Day periods count trading bars ('5d' = last five bars); longer periods are
+    calendar offsets from the last bar.
+    """
+    if history.empty:
+        return history.copy()
+    match = _PERIOD_PATTERN.match(period)
+    if match and match.group(2) == 'd':
+        return history.iloc[-int(match.group(1)):].copy()
+    offset = _period_offset(period)
+    if offset is None:
+        return history.copy()
+    return history[history.index > history.index[-1] - offset].copy()
+
+
+def _covers(period: str) -> bool:
+    """True if ``period`` fits inside the depth kept on disk."""
+    match = _PERIOD_PATTERN.match(period)
+    if not match:
+        return False
+    return int(match.group(1)) * _UNIT_DAYS[match.group(2)] <= STORE_DAYS
+
+
+class BarStore:
+    """Per-symbol daily OHLCV store with delta fetching.
+
+    Args:
+        root: Directory holding one file per symbol; defaults to
+            ``$SAHAM_CACHE_DIR/bars`` or ./cache/bars.
+        refresh_interval: Seconds a symbol is served from disk before the next delta fetch.
+        use_parquet: Force the file format; defaults to Parquet when pyarrow is installed.
+        limiter: Token bucket charged per Yahoo request; defaults to ``yfinance_limiter``.
+    """
+
+    def __init__(self, root: Optional[str] = None, refresh_interval: float = REFRESH_INTERVAL,
+                 use_parquet: Optional[bool] = None, limiter: Optional[RateLimiter] = None):
+        self._root = root
+        self.limiter = limiter
+        self.refresh_interval = refresh_interval
+        self.use_parquet = PARQUET_AVAILABLE if use_parquet is None else use_parquet
+        self._checked_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.disabled = False
+        self.full_fetches = 0
+        self.delta_fetches = 0
+        self.rebuilds = 0
+
+    @property
+    def root(self) -> str:
+        if self._root is None:
+            cache_dir = os.environ.get('SAHAM_CACHE_DIR')
+            self._root = os.path.join(cache_dir, 'bars') if cache_dir else DEFAULT_STORE_DIR
+        return self._root
+
+    def _path(self, symbol: str) -> str:
+        safe = re.sub(r'[^A-Za-z0-9._^-]', '_', symbol)
+        return os.path.join(self.root, f"{safe}.{'parquet' if self.use_parquet else 'csv'}")
+
+    # ── Disk I/O ─────────────────────────────────────────────
+    def load(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Read the stored bars for ``symbol`` (no network), or None if absent/unreadable."""
+        path = self._path(symbol)
+        if not os.path.exists(path):
+            return None
+        try:
+            if self.use_parquet:
+                return pd.read_parquet(path)
+            df = pd.read_csv(path, index_col=0)
+            index = pd.to_datetime(df.index)  # No format= (pandas >= 2.0 only); stored stamps are uniform
+            df.index = index.tz_convert(IDX_TIMEZONE) if index.tz is not None else index
+            df.index.name = 'Date'
+            return df
+        except Exception as e:
+            get_logger().warning(f"Bar store read failed for {symbol}: {type(e).__name__}: {e}")
+            return None
+
+    def _save(self, symbol: str, bars: pd.DataFrame) -> None:
+        if self.disabled:
+            return
+        path = self._path(symbol)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            if self.use_parquet:
+                bars.to_parquet(tmp_path)
+            else:
+                bars.to_csv(tmp_path)
+            os.replace(tmp_path, path)  # Atomic so concurrent readers never see a partial file
+        except (OSError, ValueError, ImportError) as e:
+            get_logger().warning(f"Bar store disabled ({self.root}): {e}")
+            self.disabled = True
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    # ── Sync ─────────────────────────────────────────────────
+    @staticmethod
+    def _clean(bars: Optional[pd.DataFrame]) -> pd.DataFrame:
+        if bars is None or bars.empty:
+            return pd.DataFrame()
+        bars = bars[[c for c in OHLCV_COLUMNS if c in bars.columns]]
+        bars = bars[~bars.index.duplicated(keep='last')].sort_index()
+        return bars.dropna(subset=['Close']) if 'Close' in bars.columns else bars
+
+    def _download(self, symbol: str, **kwargs) -> pd.DataFrame:
+        """One rate-limited ``Ticker.history`` request."""
+        limiter = self.limiter or yfinance_limiter
+        if not limiter.acquire():
+            log_security_event('rate_limit', f'Rate limit hit for bar store: {symbol}', 'WARNING')
+            raise RateLimitedError(f'Rate limited: {symbol}')
+        return yf.Ticker(symbol).history(**kwargs)
+
+    def _full_fetch(self, symbol: str) -> pd.DataFrame:
+        self.full_fetches += 1
+        bars = self._clean(self._download(symbol, period=STORE_PERIOD))
+        if not bars.empty:
+            self._save(symbol, bars)
+        return bars
+
+    @staticmethod
+    def _needs_rebuild(stored: pd.DataFrame, delta: pd.DataFrame) -> bool:
+        """Detect a split/dividend adjustment between the stored bars and a delta fetch.
+
+        The last stored bar is left out of the comparison because it may have
+        been saved while the session was still trading.
+        """
+        overlap = stored.index[:-1].intersection(delta.index)
+        if len(overlap):
+            old = stored.loc[overlap, 'Close'].astype(float)
+            new = delta.loc[overlap, 'Close'].astype(float)
+            if ((old - new).abs() > ADJUSTMENT_RTOL * new.abs()).any():
+                return True
+        fresh = delta[delta.index > stored.index[-1]]
+        for column in ('Stock Splits', 'Dividends'):
+            if column in fresh.columns and (fresh[column].fillna(0) != 0).any():
+                return True
+        return False
+
+    def sync(self, symbol: str) -> pd.DataFrame:
+        """Bring the stored bars for ``symbol`` up to date and return all of them."""
+        stored = self._clean(self.load(symbol))
+        if stored.empty:
+            bars = self._full_fetch(symbol)
+        else:
+            start = (stored.index[-1] - pd.Timedelta(days=OVERLAP_DAYS)).strftime('%Y-%m-%d')
+            self.delta_fetches += 1
+            delta = self._clean(self._download(symbol, start=start))
+            if delta.empty:
+                bars = stored
+            elif self._needs_rebuild(stored, delta):
+                get_logger().info(f"Bar store rebuild for {symbol}: price adjustment detected")
+                self.rebuilds += 1
+                bars = self._full_fetch(symbol)
+                if bars.empty:
+                    bars = stored
+            else:
+                bars = pd.concat([stored[stored.index < delta.index[0]], delta])
+                bars = slice_period(bars, STORE_PERIOD)
+                self._save(symbol, bars)
+        with self._lock:
+            self._checked_at[symbol] = time.monotonic()
+        return bars
+
+    def get_history(self, symbol: str, period: str = STORE_PERIOD,
+                    max_age: Optional[float] = None) -> pd.DataFrame:
+        """Return daily bars for ``symbol`` over ``period``, like ``Ticker.history(period=...)``.
+
+        Served from disk while the last sync is younger than ``max_age``
+        (default ``refresh_interval``); otherwise a delta fetch runs first,
+        coalesced across sessions. If Yahoo fails, the stored bars are returned as they are.
+        """
+        if not _covers(period):
+            try:
+                return self._download(symbol, period=period)
+            except RateLimitedError:
+                return pd.DataFrame()
+        max_age = self.refresh_interval if max_age is None else max_age
+        with self._lock:
+            checked = self._checked_at.get(symbol)
+        bars = None
+        if checked is not None and time.monotonic() - checked < max_age:
+            bars = self.load(symbol)
+        if bars is None:
+            try:
+                bars = yahoo_flight.do(('bars', symbol), self.sync, symbol)
+            except Exception as e:
+                get_logger().warning(f"Bar store sync failed for {symbol}: {type(e).__name__}: {e}")
+                bars = self._clean(self.load(symbol))
+        return slice_period(bars, period)
+
+    def stats(self) -> Dict[str, int]:
+        """Return counters for full fetches, delta fetches and adjustment rebuilds."""
+        return {'full_fetches': self.full_fetches, 'delta_fetches': self.delta_fetches,
+                'rebuilds': self.rebuilds}
+
+
+# Global bar store shared by every page in this process
+bar_store = BarStore()
@@ -0,0 +1,59 @@
+"""Benchmark: per-bar signal series and vectorized backtest.
+
+Times ``multi_timeframe_signal_series`` (every bar at once) against calling
+``get_multi_timeframe_signals`` on each growing prefix of the history, then
+``backtest_signals`` on the resulting series, for a synthetic daily history.
+
+Usage:
+    python benchmarks/bench_backtest.py --bars 1250 --replay 200
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backtest import backtest_signals  # noqa: E402
+from signals import get_multi_timeframe_signals, multi_timeframe_signal_series  # noqa: E402
+
+
+def make_history(n: int, seed: int = 11) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.025, n)))
+    return pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.005, n)), 'High': close * 1.02, 'Low': close * 0.98,
+        'Close': close, 'Volume': rng.integers(1000, 9000, n).astype(float),
+    }, index=pd.date_range('2020-01-01', periods=n, freq='B'))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bars', type=int, default=1250, help='Daily bars (1250 ~ 5 years)')
+    parser.add_argument('--replay', type=int, default=200, help='Prefixes replayed for the per-bar baseline')
+    args = parser.parse_args()
+
+    history = make_history(args.bars)
+    start = time.perf_counter()
+    for i in range(args.bars - args.replay, args.bars):
+        get_multi_timeframe_signals(history.iloc[:i + 1])
+    per_bar = (time.perf_counter() - start) / args.replay
+
+    start = time.perf_counter()
+    signals = multi_timeframe_signal_series(history)
+    series = time.perf_counter() - start
+    start = time.perf_counter()
+    result = backtest_signals(history, signals['1 Bulan Sinyal'])
+    backtest = time.perf_counter() - start
+
+    print(f"History: {args.bars} bars | {len(result['trades'])} trades")
+    print(f"{'replay per bar (ms)':>27} {per_bar * 1000:>9.2f}  (x{args.bars} bars ~ {per_bar * args.bars:.1f} s)")
+    print(f"{'signal series, all bars (s)':>27} {series:>9.3f}")
+    print(f"{'backtest_signals (s)':>27} {backtest:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark: compound interest scenario grids and Monte Carlo projections.
+
+Times ``compound_grid`` (closed form, and with per-month cent rounding)
+against looping ``calculate_compound_interest`` over every scenario, then
+``simulate_wealth`` for each return source at the page's path counts and
+horizons (the page needs every run under one second).
+
+Usage:
+    python benchmarks/bench_compound.py --rates 50 --years 100
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from compound_engine import (MC_MAX_PATHS, bootstrap_sampler, compound_grid,  # noqa: E402
+                             distribution_sampler, simulate_wealth)
+from pages_compound import calculate_compound_interest  # noqa: E402
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rates', type=int, default=50, help='Interest rates in the grid (0-30%%)')
+    parser.add_argument('--years', type=int, default=100, help='Horizons in the grid (1..N years)')
+    parser.add_argument('--loop-sample', type=int, default=20, help='Scenarios timed for the loop baseline')
+    args = parser.parse_args()
+
+    rates = np.linspace(0, 30, args.rates)
+    horizons = np.arange(1, args.years + 1)
+    monthly = [0, 1_000_000]
+    scenarios = len(rates) * len(horizons) * len(monthly)
+
+    _, closed = timed(lambda: compound_grid(1_000_000, rates, horizons, monthly))
+    _, rounded = timed(lambda: compound_grid(1_000_000, rates, horizons, monthly, round_steps=True))
+    sample = [(r, y) for r in rates for y in horizons][::max(1, len(rates) * len(horizons) // args.loop_sample)]
+    _, loop = timed(lambda: [calculate_compound_interest(1_000_000, r, y, 1_000_000) for r, y in sample])
+    loop_total = loop / len(sample) * scenarios
+
+    print(f"Grid: {len(rates)} rates x {len(horizons)} horizons x {len(monthly)} contributions = {scenarios} scenarios")
+    print(f"{'closed form (s)':>22} {closed:>9.4f}")
+    print(f"{'rounded per month (s)':>22} {rounded:>9.4f}")
+    print(f"{'page loop, est. (s)':>22} {loop_total:>9.2f}")
+
+
+    samplers = {
+        'normal': distribution_sampler(10, 20),
+        'student-t': distribution_sampler(10, 20, 'student-t', seed=1),
+        'bootstrap': bootstrap_sampler(np.random.default_rng(0).normal(0.008, 0.06, 60)),
+    }
+    print()
+    print(f"{'Monte Carlo':>12} {'years':>6} {'paths':>8} " + " ".join(f"{name + ' (s)':>15}" for name in samplers))
+    for paths, years in [(10_000, 10), (MC_MAX_PATHS, 10), (MC_MAX_PATHS, 30), (MC_MAX_PATHS, 100)]:
+        runs = [simulate_wealth(1e6, 1e6, years, sampler, paths, seed=1) for sampler in samplers.values()]
+        print(f"{'':>12} {years:>6} {runs[0]['paths']:>8} " + " ".join(f"{r['elapsed']:>15.3f}" for r in runs))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark: sequential vs concurrent Yahoo fetches against a fake transport.
+
+Replaces ``yf.Ticker`` with a stub that sleeps for a fixed latency, then
+times ``utils._fetch_raw_info`` driven by the fetch engine with one worker
+(sequential) and with a worker pool (concurrent).
+
+Usage:
+    python benchmarks/bench_fetch_engine.py --latency 0.2 --workers 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utils  # noqa: E402
+from fetch_engine import fetch_concurrently  # noqa: E402
+from rate_limiter import RateLimiter  # noqa: E402
+from snapshot_cache import SnapshotCache  # noqa: E402
+
+SYMBOL_COUNTS = [1, 5, 10, 25, 50]
+
+
+def make_fake_ticker(latency: float):
+    """Build a yf.Ticker stand-in whose .info blocks for ``latency`` seconds."""
+
+    class FakeTicker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        @property
+        def info(self):
+            time.sleep(latency)
+            return {
+                'regularMarketPrice': 1000,
+                'priceToBook': 1.2,
+                'trailingPE': 10.5,
+                'debtToEquity': 45.0,
+                'returnOnEquity': 0.18,
+                'trailingEps': 95,
+                'dividendRate': 40,
+                'dividendYield': 4.0,
+            }
+
+    return FakeTicker
+
+
+def time_batch(symbols, workers: int) -> float:
+    limiter = RateLimiter(max_calls=10_000, period=60.0)
+    start = time.perf_counter()
+    data, failed = fetch_concurrently(symbols, utils._fetch_raw_info, max_workers=workers, limiter=limiter)
+    elapsed = time.perf_counter() - start
+    assert len(data) == len(symbols) and not failed
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.2, help='Fake per-request latency in seconds')
+    parser.add_argument('--workers', type=int, default=utils.DEFAULT_MAX_WORKERS, help='Concurrent worker count')
+    args = parser.parse_args()
+
+    print(f"Fake latency: {args.latency:.3f}s | workers: {args.workers}")
+    print(f"{'symbols':>8} {'sequential (s)':>15} {'concurrent (s)':>15} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp, \
+            patch.object(utils.yf, 'Ticker', make_fake_ticker(args.latency)), \
+            patch.object(utils, 'snapshot_cache', SnapshotCache(path=os.path.join(tmp, 'bench.sqlite3'))):
+        for n in SYMBOL_COUNTS:
+            symbols = [f"SYM{i:03d}.JK" for i in range(n)]
+            seq = time_batch(symbols, workers=1)
+            conc = time_batch(symbols, workers=args.workers)
+            print(f"{n:>8} {seq:>15.3f} {conc:>15.3f} {seq / conc:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
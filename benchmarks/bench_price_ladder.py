@@ -0,0 +1,62 @@
+"""Benchmark: ARA/ARB lookups on the precomputed price ladder vs the tick rules.
+
+Times next-session limits for single prices (``utils.ara_arb_limits`` vs
+``price_ladder.limits``), multi-day ARA sequences (stepping the rules vs
+``price_ladder.sequence``) and the vectorized ``price_ladder.chase`` over
+every valid price up to Rp 50,000.
+
+Usage:
+    python benchmarks/bench_price_ladder.py --prices 2000 --days 10
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from price_ladder import price_ladder  # noqa: E402
+from utils import ara_arb_limits  # noqa: E402
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def rule_sequence(price: int, days: int):
+    path = []
+    for _ in range(days):
+        price = ara_arb_limits(price)[0]
+        path.append(price)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--prices', type=int, default=2000, help='Random valid prices per scalar test')
+    parser.add_argument('--days', type=int, default=10, help='Consecutive ARA sessions per sequence')
+    args = parser.parse_args()
+
+    ladder = price_ladder.prices
+    prices = [int(p) for p in np.random.default_rng(1).choice(ladder[ladder <= 50_000], args.prices)]
+    universe = ladder[ladder <= 50_000]
+
+    rules = timed(lambda: [ara_arb_limits(p) for p in prices])
+    table = timed(lambda: [price_ladder.limits(p) for p in prices])
+    rule_seq = timed(lambda: [rule_sequence(p, args.days) for p in prices])
+    table_seq = timed(lambda: [price_ladder.sequence(p, steps=args.days) for p in prices])
+    chase = timed(lambda: price_ladder.chase(universe, steps=args.days))
+
+    print(f"Ladder: {len(price_ladder)} rungs | {args.prices} prices | {args.days} sessions")
+    print(f"{'':>22} {'rules (ms)':>11} {'ladder (ms)':>12} {'speedup':>8}")
+    print(f"{'limits, per price':>22} {rules * 1000:>11.1f} {table * 1000:>12.1f} {rules / table:>7.1f}x")
+    print(f"{'ARA sequence':>22} {rule_seq * 1000:>11.1f} {table_seq * 1000:>12.1f} {rule_seq / table_seq:>7.1f}x")
+    print(f"chase() over {len(universe)} prices: {chase * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark: vectorized universe scan vs one IndicatorSet per symbol.
+
+Builds a synthetic dates x symbols panel and times ``scanner.scan_panel``
+(all symbols at once) against scoring each symbol on its own with
+``get_technical_signals``, plus the ARA/ARB proximity scan
+(``scanner.limits_from_panel``).
+
+Usage:
+    python benchmarks/bench_scanner.py --symbols 300 --bars 250
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from signals import get_technical_signals  # noqa: E402
+from scanner import limits_from_panel, scan_panel  # noqa: E402
+
+
+def make_panel(n_symbols: int, n_bars: int, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    close = np.round(1000 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_bars, n_symbols)), axis=0)))
+    index = pd.date_range('2024-01-01', periods=n_bars, freq='B')
+    columns = [f"S{i:03d}" for i in range(n_symbols)]
+    frame = lambda values: pd.DataFrame(values, index=index, columns=columns)
+    return {'Close': frame(close), 'High': frame(close * 1.01), 'Low': frame(close * 0.99),
+            'Volume': frame(rng.integers(1_000, 100_000, close.shape).astype(float))}
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--symbols', type=int, default=300, help='Symbols in the panel')
+    parser.add_argument('--bars', type=int, default=250, help='Daily bars per symbol')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    panel = make_panel(args.symbols, args.bars)
+    histories = [pd.DataFrame({field: panel[field][s] for field in panel}) for s in panel['Close'].columns]
+    per_symbol = best_of(lambda: [get_technical_signals(h) for h in histories], 1)
+    vectorized = best_of(lambda: scan_panel(panel), args.repeat)
+    limits = best_of(lambda: limits_from_panel(panel), args.repeat)
+
+    print(f"Panel: {args.symbols} symbols x {args.bars} bars")
+    print(f"{'per-symbol signals (s)':>24} {per_symbol:>8.3f}")
+    print(f"{'scan_panel (s)':>24} {vectorized:>8.3f}   ({per_symbol / vectorized:.1f}x)")
+    print(f"{'limits_from_panel (s)':>24} {limits:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+"""Vectorized Compound Interest Engine.
+
+Monthly compounding with a contribution added at the start of each month
+(the rule of ``pages_compound.calculate_compound_interest``)::
+
+    b[m] = (b[m-1] + c) * g,   g = 1 + rate / 100 / 12
+
+closed form ``b[m] = P*g^m + c*g*(g^m - 1)/(g - 1)``, evaluated for every
+month (or every scenario) in one NumPy expression.
+
+``round_steps=True`` keeps the page's semantics of rounding the balance to
+cents after every month. That recursion cannot be closed: a single path
+steps with Python's ``round``, a grid advances one month per step for all
+scenarios at once with ``round_cents`` - identical to Python's
+``round(x, 2)`` (``np.round`` scales by 100 first and disagrees on some ties).
+
+``simulate_wealth`` is the Monte Carlo counterpart: monthly log returns are
+drawn from a normal or Student-t distribution, or bootstrapped from a
+symbol's monthly history, and every path's balance follows from cumulative
+sums (``b[m] = G[m] * (P + c * sum(1 / G[k-1]))`` with ``G`` the cumulative
+growth) with no loop over months. Paths are simulated in chunks of bounded
+size and only year-end balances are kept (float32), so memory stays flat
+while percentile fan bands remain exact.
+
+Compliance: OWASP API4 (Unrestricted Resource Consumption), CWE-400
+"""
+import time
+from typing import Callable, Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from utils import MAX_YEARS_COMPOUND
+
+MIN_YEARS = 0.1
+MAX_GRID_CELLS = 2_000_000          # Scenarios x months evaluated per grid call
+_SPLIT = 134217729.0                # 2**27 + 1 (Veltkamp split)
+_EXACT_CENTS_LIMIT = 2.0 ** 52 / 100  # Above this x * 100 has no fractional bits left
+
+# Monte Carlo
+MC_DEFAULT_PATHS = 10_000
+MC_MAX_PATHS = 100_000
+MC_CHUNK_CELLS = 1_000_000         # Paths x months simulated at once (~8 MB per array)
+MC_MAX_CELLS = 12_000_000          # Paths x months per run (< 1 s); longer horizons use fewer paths
+MC_MIN_HISTORY_MONTHS = 12         # Monthly returns needed to bootstrap
+MC_STUDENT_T_DF = 4
+MC_T_POOL = 1 << 20                # Student-t variates drawn once per run, then resampled
+PERCENTILES = (5, 25, 50, 75, 95)
+
+ArrayLike = Union[float, np.ndarray, list]
+Sampler = Callable[[np.random.Generator, tuple], np.ndarray]
+
+
+def clamp_years(years: ArrayLike) -> np.ndarray:
+    """Horizon in years, clamped like the calculator (0.1 .. 100)."""
+    return np.clip(np.asarray(years, dtype=float), MIN_YEARS, MAX_YEARS_COMPOUND)
+
+
+def months_for(years: ArrayLike) -> np.ndarray:
+    return (clamp_years(years) * 12).astype(int)
+
+
+def round_cents(values: ArrayLike) -> np.ndarray:
+    """``round(x, 2)`` for every element, exactly as Python rounds floats."""
+    x = np.asarray(values, dtype=float)
+    p = x * 100
+    c = _SPLIT * x
+    hi = c - (c - x)
+    err = (hi * 100 - p) + (x - hi) * 100  # x * 100 == p + err exactly
+    n = np.rint(p)
+    r = p - n
+    out = (n + ((r == 0.5) & (err > 0)) - ((r == -0.5) & (err < 0))) / 100
+    big = np.abs(x) >= _EXACT_CENTS_LIMIT
+    if big.any():
+        out = np.array(out, dtype=float, copy=True)
+        out[big] = [round(float(v), 2) for v in x[big]]
+    return out
+
+
+def _growth(rate: ArrayLike) -> np.ndarray:
+    return 1 + np.asarray(rate, dtype=float) / 100 / 12
+
+
+def _closed_form(principal, monthly, g, m) -> np.ndarray:
+    """Balance after ``m`` months (all arguments broadcast)."""
+    gm = np.power(g, m)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annuity = np.where(g == 1, m, g * (gm - 1) / (g - 1))
+    return principal * gm + monthly * annuity
+
+
+def compound_path(principal: float, rate: float, years: float, monthly: float = 0.0,
+                  round_steps: bool = False) -> np.ndarray:
+    """Balance at the end of every month, months 1..int(years * 12)."""
+    total = int(months_for(years))
+    if not round_steps:
+        return _closed_form(principal, monthly, _growth(rate), np.arange(1, total + 1))
+    g = float(_growth(rate))
+    out = np.empty(total)
+    amount = principal
+    for month in range(total):  # Scalar path: Python's round, one float op per month
+        amount = round((amount + monthly) * g, 2)
+        out[month] = amount
+    return out
+
+
+def compound_frame(principal: float, rate: float, years: float, monthly: float = 0.0,
+                   round_steps: bool = True) -> pd.DataFrame:
+    """Monthly table with columns Year, Month, Amount (as ``calculate_compound_interest``)."""
+    amounts = compound_path(principal, rate, years, monthly, round_steps)
+    months = np.arange(1, len(amounts) + 1)
+    return pd.DataFrame({'Year': (months - 1) // 12 + 1, 'Month': months, 'Amount': amounts})
+
+
+def yearly_summary(frame: pd.DataFrame, principal: float, monthly: float = 0.0) -> pd.DataFrame:
+    """Year-end balance, cumulative deposits and growth per year of a ``compound_frame``."""
+    year_end = frame.groupby('Year', sort=True).agg(Month=('Month', 'last'), Amount=('Amount', 'last'))
+    deposits = principal + monthly * year_end['Month']
+    return pd.DataFrame({'Bulan': year_end['Month'], 'Saldo Akhir': year_end['Amount'],
+                         'Total Setor': deposits, 'Hasil Bunga': year_end['Amount'] - deposits})
+
+
+def compound_grid(principal: ArrayLike, rates: ArrayLike, years: ArrayLike, monthly: ArrayLike = 0.0,
+                  round_steps: bool = False) -> Dict[str, np.ndarray]:
+    """Final balance for every (rate, horizon, contribution[, principal]) combination.
+
+    ``principal``, ``rates``, ``years`` and ``monthly`` are scalars or 1-D
+    arrays; the result 'balance' has shape (len(rates), len(years),
+    len(monthly), len(principal)) with length-1 axes for scalars, plus
+    'deposits' (same shape) and the axis values.
+    """
+    p = np.atleast_1d(np.asarray(principal, dtype=float))
+    r = np.atleast_1d(np.asarray(rates, dtype=float))
+    y = np.atleast_1d(clamp_years(years))
+    c = np.atleast_1d(np.asarray(monthly, dtype=float))
+    m = (y * 12).astype(int)
+    scenarios = len(r) * len(c) * len(p)
+    if scenarios * (int(m.max()) if round_steps else len(m)) > MAX_GRID_CELLS:
+        raise ValueError("Scenario grid too large")
+
+    g = _growth(r)[:, None, None, None]
+    m4 = m[None, :, None, None]
+    c4 = c[None, None, :, None]
+    p4 = p[None, None, None, :]
+    if not round_steps:
+        balance = _closed_form(p4, c4, g, m4)
+    else:
+        balance = np.empty((len(r), len(m), len(c), len(p)))
+        amount = np.broadcast_to(p4[:, 0], (len(r), len(c), len(p))).copy()
+        g3, c3 = g[:, 0], c4[:, 0]
+        order = np.argsort(m, kind='stable')
+        k = 0
+        for month in range(1, int(m.max()) + 1):
+            amount = round_cents((amount + c3) * g3)
+            while k < len(order) and m[order[k]] == month:
+                balance[:, order[k]] = amount
+                k += 1
+    deposits = np.broadcast_to(p4 + c4 * m4, balance.shape)
+    return {'balance': balance, 'deposits': deposits, 'rates': r, 'years': y, 'monthly': c, 'principal': p}
+
+
+# ── Monte Carlo ──────────────────────────────────────────────
+def distribution_sampler(mean_annual: float, vol_annual: float, dist: str = 'normal',
+                         df: int = MC_STUDENT_T_DF, seed: Optional[int] = None) -> Sampler:
+    """Monthly log returns with the given expected annual return and volatility (both in %).
+
+    The log drift is set so the expected monthly growth compounds to
+    ``1 + mean_annual/100`` a year; 'student-t' has the same volatility with
+    fatter tails. Drawing t variates costs ~3x a normal one, so a pool of
+    ``MC_T_POOL`` is drawn once here (from ``seed``) and resampled per path.
+    """
+    sigma = vol_annual / 100 / np.sqrt(12)
+    mu = np.log1p(mean_annual / 100) / 12 - sigma ** 2 / 2
+    if dist == 'student-t':
+        scale = sigma * np.sqrt((df - 2) / df)
+        pool = mu + scale * np.random.default_rng(seed).standard_t(df, size=MC_T_POOL)
+        return lambda rng, shape: pool[rng.integers(0, MC_T_POOL, size=shape)]
+    if dist != 'normal':
+        raise ValueError(f"Unknown distribution: {dist!r}")
+    return lambda rng, shape: mu + sigma * rng.standard_normal(shape)
+
+
+def monthly_log_returns(history: pd.DataFrame) -> np.ndarray:
+    """Month-end to month-end log returns of a daily OHLCV history."""
+    if history is None or history.empty:
+        return np.array([])
+    close = history['Close']
+    # Grouped by calendar month: the resample alias changed ('M' -> 'ME' in pandas 2.2)
+    month_end = close.groupby([close.index.year, close.index.month]).last().dropna()
+    returns = np.log(month_end / month_end.shift()).to_numpy()
+    return returns[np.isfinite(returns)]
+
+
+def bootstrap_sampler(log_returns: Sequence[float]) -> Sampler:
+    """Draw monthly log returns with replacement from a symbol's history."""
+    pool = np.asarray(log_returns, dtype=float)
+    if len(pool) < MC_MIN_HISTORY_MONTHS:
+        raise ValueError(f"Need at least {MC_MIN_HISTORY_MONTHS} monthly returns to bootstrap")
+    return lambda rng, shape: pool[rng.integers(0, len(pool), size=shape)]
+
+
+def simulate_wealth(principal: float, monthly: float, years: float, sampler: Sampler,
+                    n_paths: int = MC_DEFAULT_PATHS, seed: Optional[int] = None,
+                    percentiles: Sequence[float] = PERCENTILES) -> Dict:
+    """Monte Carlo balance paths (contribution at the start of each month, as the calculator).
+
+    Returns dict with 'bands' (DataFrame: one row per year end - or per month
+    under a year - with Bulan, Total Setor and a 'P<q>' column per
+    percentile), 'final' (float32 final balances), 'deposits', 'paths'
+    (actually simulated, capped by ``MC_MAX_CELLS``) and 'elapsed'.
+    """
+    start = time.perf_counter()
+    months = int(months_for(years))
+    n_paths = int(np.clip(n_paths, 1, min(MC_MAX_PATHS, max(1, MC_MAX_CELLS // months))))
+    sample = np.arange(12, months + 1, 12) if months >= 12 else np.arange(1, months + 1)
+    if sample[-1] != months:
+        sample = np.append(sample, months)
+    cols = sample - 1
+
+    rng = np.random.default_rng(seed)
+    kept = np.empty((n_paths, len(sample)), dtype=np.float32)
+    chunk = max(1, MC_CHUNK_CELLS // months)
+    for lo in range(0, n_paths, chunk):
+        hi = min(lo + chunk, n_paths)
+        log_r = sampler(rng, (hi - lo, months))
+        cum = np.cumsum(log_r, axis=1)                 # log G[m]
+        np.subtract(log_r, cum, out=log_r)             # -log G[m-1]
+        np.exp(log_r, out=log_r)
+        np.cumsum(log_r, axis=1, out=log_r)            # sum of 1 / G[k-1], k <= m
+        kept[lo:hi] = np.exp(cum[:, cols]) * (principal + monthly * log_r[:, cols])
+
+    bands = pd.DataFrame({'Bulan': sample, 'Total Setor': principal + monthly * sample})
+    for q, values in zip(percentiles, np.percentile(kept, percentiles, axis=0)):
+        bands[f"P{q:g}"] = values
+    return {
+        'bands': bands,
+        'final': kept[:, -1],
+        'deposits': float(principal + monthly * months),
+        'paths': n_paths,
+        'elapsed': time.perf_counter() - start,
+    }
@@ -0,0 +1,219 @@
+"""In-Memory Data Cache Module.
+
+Provides a thread-safe, size-bounded TTL cache keyed per item (for example
+per ticker symbol), so batch callers can look up each key on its own and
+fetch only the misses instead of caching a whole request list as one entry.
+A stale-while-revalidate variant serves expired entries while refreshing
+them in the background, up to a hard staleness limit.
+
+Compliance: OWASP API4 (Unrestricted Resource Consumption), CWE-770
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from logger import get_logger
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after ``ttl`` seconds.
+
+    Args:
+        ttl: Seconds an entry stays fresh after it is stored.
+        max_entries: Maximum entries kept; least recently used are evicted first.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: Hashable, now: float) -> Tuple[bool, Any]:
+        """Return (found, value) for a fresh entry. Caller must hold the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        stored_at, value = entry
+        if now - stored_at >= self.ttl:
+            del self._entries[key]
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` if missing/expired."""
+        with self._lock:
+            found, value = self._lookup(key, time.monotonic())
+            return value if found else default
+
+    def get_many(self, keys: Iterable[Hashable]) -> Tuple[Dict[Hashable, Any], List[Hashable]]:
+        """Look up several keys at once.
+
+        Returns:
+            Tuple of (fresh hits keyed by key, list of missing keys in input order).
+        """
+        hits: Dict[Hashable, Any] = {}
+        missing: List[Hashable] = []
+        with self._lock:
+            now = time.monotonic()
+            for key in dict.fromkeys(keys):
+                found, value = self._lookup(key, now)
+                if found:
+                    hits[key] = value
+                else:
+                    missing.append(key)
+        return hits, missing
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entries if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SWRCache:
+    """Stale-while-revalidate cache with a hard staleness limit.
+
+    Entries younger than ``ttl`` are fresh. Entries between ``ttl`` and
+    ``max_stale`` are served immediately while one background refresh per
+    key replaces them. Older entries are dropped, so the caller blocks on a
+    fresh load. Timestamps are wall-clock so callers can show "as of".
+
+    Args:
+        ttl: Seconds an entry is served without triggering a refresh.
+        max_stale: Seconds after which a stale entry is no longer served.
+        max_entries: Maximum entries kept; least recently used are evicted first.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_stale: float = 1800.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_stale = max(max_stale, ttl)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._refreshing: Set[Hashable] = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def lookup_many(self, keys: Iterable[Hashable]) -> Tuple[Dict[Hashable, Any], List[Hashable], List[Hashable]]:
+        """Look up several keys at once.
+
+        Returns:
+            Tuple of (servable values keyed by key, missing keys, stale keys
+            among the servable ones that need a refresh), all in input order.
+        """
+        values: Dict[Hashable, Any] = {}
+        missing: List[Hashable] = []
+        stale: List[Hashable] = []
+        with self._lock:
+            now = time.time()
+            for key in dict.fromkeys(keys):
+                entry = self._entries.get(key)
+                age = now - entry[0] if entry is not None else None
+                if entry is None or age >= self.max_stale:
+                    self._entries.pop(key, None)
+                    self.misses += 1
+                    missing.append(key)
+                    continue
+                self._entries.move_to_end(key)
+                values[key] = entry[1]
+                if age >= self.ttl:
+                    self.stale_hits += 1
+                    stale.append(key)
+                else:
+                    self.hits += 1
+        return values, missing, stale
+
+    def as_of(self, keys: Iterable[Hashable]) -> Optional[float]:
+        """Return the oldest store time (epoch seconds) among cached ``keys``, if any."""
+        with self._lock:
+            stamps = [self._entries[k][0] for k in keys if k in self._entries]
+        return min(stamps) if stamps else None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key`` as fresh, evicting the oldest entries if full."""
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def claim_refresh(self, keys: Iterable[Hashable]) -> List[Hashable]:
+        """Mark keys as being refreshed; returns only those not already claimed."""
+        with self._lock:
+            claimed = [k for k in dict.fromkeys(keys) if k not in self._refreshing]
+            self._refreshing.update(claimed)
+            self.refreshes += len(claimed)
+            return claimed
+
+    def release_refresh(self, keys: Iterable[Hashable]) -> None:
+        """Clear the refresh mark set by ``claim_refresh``."""
+        with self._lock:
+            self._refreshing.difference_update(keys)
+
+    def get(self, key: Hashable, loader: Callable[[], Any],
+            cacheable: Optional[Callable[[Any], bool]] = None) -> Tuple[Any, float]:
+        """Return ``(value, as_of)`` for ``key``, loading or refreshing it as needed.
+
+        Missing or too-stale entries are loaded synchronously. Stale entries
+        are returned at once and refreshed on a daemon thread; if that refresh
+        fails - raises, or returns a value ``cacheable`` rejects (e.g. an empty
+        result from an outage) - the stale value keeps being served until
+        ``max_stale``. A rejected synchronous load is returned but not stored.
+        """
+        values, missing, stale = self.lookup_many([key])
+        if missing:
+            value = loader()
+            if cacheable is None or cacheable(value):
+                self.set(key, value)
+            return value, time.time()
+        if stale and self.claim_refresh([key]):
+            threading.Thread(target=self._refresh, args=(key, loader, cacheable),
+                             name="swr-refresh", daemon=True).start()
+        return values[key], self.as_of([key]) or time.time()
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any],
+                 cacheable: Optional[Callable[[Any], bool]] = None) -> None:
+        try:
+            value = loader()
+            if cacheable is None or cacheable(value):
+                self.set(key, value)
+            else:
+                get_logger().warning(f"Background refresh for {key!r} returned no usable data; keeping stale value")
+        except Exception as e:
+            get_logger().warning(f"Background refresh failed for {key!r}: {type(e).__name__}: {e}")
+        finally:
+            self.release_refresh([key])
+
+    def clear(self) -> None:
+        """Drop every entry and refresh mark, and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._refreshing.clear()
+            self.hits = self.stale_hits = self.misses = self.refreshes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,107 @@
+"""Concurrent Fetch Engine for Yahoo Finance Requests.
+
+Runs per-symbol fetch jobs on a bounded thread pool so a batch finishes in
+roughly the slowest request instead of the sum of every request plus a fixed
+sleep. Each job draws a token from a shared RateLimiter before it touches the
+network, so adding workers never raises the upstream request budget.
+
+Compliance: OWASP API4 (Unrestricted Resource Consumption), CWE-770
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from logger import get_logger, log_security_event
+from rate_limiter import RateLimiter
+from singleflight import SingleFlight
+
+DEFAULT_MAX_WORKERS = 8   # Concurrent Yahoo requests per batch
+MAX_WORKERS_LIMIT = 16    # Hard cap regardless of caller input
+BACKGROUND_WORKERS = 2    # Long-lived threads for fire-and-forget prefetches
+
+_background_pool = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix="yf-background")
+
+# A fetch job returns (row, None) on success or (None, reason) on failure.
+FetchOutcome = Tuple[Optional[Dict[str, Any]], Optional[str]]
+
+
+def clamp_workers(max_workers: int) -> int:
+    """Clamp a requested worker count into [1, MAX_WORKERS_LIMIT]."""
+    try:
+        return max(1, min(int(max_workers), MAX_WORKERS_LIMIT))
+    except (ValueError, TypeError):
+        return DEFAULT_MAX_WORKERS
+
+
+def fetch_concurrently(
+    symbols: Sequence[str],
+    fetch_one: Callable[[str], FetchOutcome],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    limiter: Optional[RateLimiter] = None,
+    label: str = "fetch",
+    flight: Optional[SingleFlight] = None,
+) -> Tuple[Dict[str, Dict[str, Any]], List[Tuple[str, str]]]:
+    """Run ``fetch_one`` for every symbol on a bounded thread pool.
+
+    Args:
+        symbols: Symbols to fetch. Duplicates are fetched once.
+        fetch_one: Job returning ``(row, None)`` or ``(None, reason)``.
+        max_workers: Maximum concurrent jobs; 1 runs the batch sequentially.
+        limiter: Shared token bucket; a job without a token fails as 'Rate limited'.
+        label: Short job description used in rate-limit audit events.
+        flight: Optional coalescer; a symbol already being fetched under the
+            same label (by another session) is awaited instead of refetched
+            and costs no rate-limit token.
+
+    Returns:
+        Tuple of (rows keyed by symbol in input order, list of (symbol, reason) failures).
+    """
+    unique_symbols = list(dict.fromkeys(symbols))
+    if not unique_symbols:
+        return {}, []
+
+    def guarded(symbol: str) -> FetchOutcome:
+        if limiter is not None and not limiter.acquire():
+            log_security_event('rate_limit', f'Rate limit hit for {label}: {symbol}', 'WARNING')
+            return None, 'Rate limited'
+        try:
+            return fetch_one(symbol)
+        except Exception as e:
+            get_logger().error(f"Exception in {label} for {symbol}: {type(e).__name__}: {e}")
+            return None, str(e)[:100]
+
+    def run(symbol: str) -> FetchOutcome:
+        if flight is None:
+            return guarded(symbol)
+        return flight.do((label, symbol), guarded, symbol)
+
+    workers = min(clamp_workers(max_workers), len(unique_symbols))
+    if workers == 1:
+        outcomes = [run(symbol) for symbol in unique_symbols]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="yf-fetch") as pool:
+            outcomes = list(pool.map(run, unique_symbols))
+
+    data: Dict[str, Dict[str, Any]] = {}
+    failed: List[Tuple[str, str]] = []
+    for symbol, (row, reason) in zip(unique_symbols, outcomes):
+        if row is not None:
+            data[symbol] = row
+        else:
+            failed.append((symbol, reason or 'Unknown error'))
+    return data, failed
+
+
+def run_in_background(fn: Callable[..., Any], *args: Any) -> Future:
+    """Run ``fn(*args)`` on the shared background pool and return its Future.
+
+    Exceptions are logged instead of propagating, so a failed prefetch never
+    surfaces in the page that triggered it.
+    """
+    def job() -> Any:
+        try:
+            return fn(*args)
+        except Exception as e:
+            get_logger().error(f"Background job {getattr(fn, '__name__', fn)} failed: {type(e).__name__}: {e}")
+            return None
+
+    return _background_pool.submit(job)
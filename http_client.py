@@ -0,0 +1,125 @@
+"""Shared HTTP Client and Conditional Feed Fetching.
+
+One pooled ``requests.Session`` (keep-alive, gzip) serves every RSS source
+instead of a fresh connection per ``feedparser.parse(url)`` call. Feed
+validators (ETag / Last-Modified) are remembered per URL, so unchanged feeds
+come back as "304 Not Modified" and are answered from the local feed cache.
+
+Compliance: OWASP API4 (Unrestricted Resource Consumption), CWE-400
+"""
+import threading
+from typing import Any, Dict, Optional
+
+import feedparser
+import requests
+from requests.adapters import HTTPAdapter
+
+from data_cache import TTLCache
+from logger import get_logger
+
+FEED_TIMEOUT = (3.05, 5)          # (connect, read) seconds
+POOL_CONNECTIONS = 8              # Distinct hosts kept alive
+POOL_MAXSIZE = 16                 # Concurrent connections per host
+MAX_FEED_BYTES = 2 * 1024 * 1024  # Reject oversized feed bodies
+READ_CHUNK_BYTES = 64 * 1024      # Streamed body read size
+FEED_CACHE_TTL = 24 * 3600        # Validators older than this are dropped
+FEED_CACHE_MAX_ENTRIES = 512
+USER_AGENT = 'Mozilla/5.0 (compatible; SahamDashboard/1.0)'
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# url -> {'etag', 'modified', 'feed'}
+feed_cache = TTLCache(ttl=FEED_CACHE_TTL, max_entries=FEED_CACHE_MAX_ENTRIES)
+feed_stats = {'requests': 0, 'not_modified': 0, 'errors': 0}
+_stats_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update({
+                    'User-Agent': USER_AGENT,
+                    'Accept': 'application/rss+xml, application/atom+xml, application/xml;q=0.9, */*;q=0.8',
+                    'Accept-Encoding': 'gzip, deflate',
+                })
+                _session = session
+    return _session
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        feed_stats[key] += 1
+
+
+def _read_limited(response: requests.Response, limit: int = MAX_FEED_BYTES) -> Optional[bytes]:
+    """Read a streamed body, or None once it is known to exceed ``limit`` bytes.
+
+    A declared Content-Length over the limit is rejected before reading; an
+    undeclared or understated body is abandoned as soon as it passes the limit.
+    """
+    try:
+        declared = int(response.headers.get('Content-Length') or 0)
+    except ValueError:
+        declared = 0
+    if declared > limit:
+        return None
+    body = bytearray()
+    for chunk in response.iter_content(chunk_size=READ_CHUNK_BYTES):
+        body.extend(chunk)
+        if len(body) > limit:
+            return None
+    return bytes(body)
+
+
+def fetch_feed(url: str, timeout=FEED_TIMEOUT) -> Any:
+    """Fetch and parse an RSS/Atom feed using a conditional GET.
+
+    Drop-in replacement for ``feedparser.parse(url)``: returns the parsed
+    feed (with ``.entries``). On 304 the previously parsed feed is returned;
+    on network errors the cached feed (or an empty feed) is returned.
+    """
+    cached: Optional[Dict[str, Any]] = feed_cache.get(url)
+    headers = {}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('modified'):
+            headers['If-Modified-Since'] = cached['modified']
+
+    _count('requests')
+    try:
+        response = get_session().get(url, headers=headers, timeout=timeout, stream=True)
+        try:
+            content = _read_limited(response) if response.status_code == 200 else None
+        finally:
+            response.close()  # Return the connection to the pool even when the body was abandoned
+    except requests.RequestException as e:
+        _count('errors')
+        get_logger().warning(f"Feed request failed ({type(e).__name__}): {url[:120]}")
+        return cached['feed'] if cached else feedparser.parse(b'')
+
+    if response.status_code == 304 and cached:
+        _count('not_modified')
+        feed_cache.set(url, cached)
+        return cached['feed']
+    if content is None:
+        _count('errors')
+        reason = f"HTTP {response.status_code}" if response.status_code != 200 else f"over {MAX_FEED_BYTES} bytes"
+        get_logger().warning(f"Feed rejected ({reason}): {url[:120]}")
+        return cached['feed'] if cached else feedparser.parse(b'')
+
+    feed = feedparser.parse(content)
+    feed_cache.set(url, {
+        'etag': response.headers.get('ETag'),
+        'modified': response.headers.get('Last-Modified'),
+        'feed': feed,
+    })
+    return feed
@@ -0,0 +1,184 @@
+"""Unified Indicator Engine.
+
+One ``IndicatorSet`` wraps an OHLCV frame and computes named indicator
+series (EMA, SMA, RSI, MACD, ATR, ADX, ...) lazily, on first request, and
+keeps them. Intermediate series are shared: ATR and ADX reuse the same true
+range, MACD's signal line reuses the MACD line.
+
+``get_indicators(history, symbol)`` memoizes the set on (symbol, last bar
+timestamp, bar count, last bar OHLCV, first close), so every consumer of a
+symbol's history - the signal generators, the smart summary and the
+technical tools chart - and every Streamlit rerun reuses the same rolling
+windows until the data changes: a new bar, an intraday update of the open
+session's bar, or a split/dividend re-adjustment of the whole history.
+
+Compliance: OWASP API4 (Unrestricted Resource Consumption), CWE-400
+"""
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_cache import TTLCache
+
+INDICATOR_CACHE_TTL = 24 * 3600   # A new bar changes the key long before this
+INDICATOR_CACHE_MAX_ENTRIES = 64  # Symbols kept in memory
+KEY_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+IndicatorKey = Tuple[str, Optional[int]]
+
+
+def _true_range(ind: 'IndicatorSet', window: Optional[int]) -> pd.Series:
+    high, low, close = ind.history['High'], ind.history['Low'], ind.history['Close']
+    prev_close = close.shift()
+    return pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+
+
+def _sma(ind: 'IndicatorSet', window: int) -> pd.Series:
+    return ind.history['Close'].rolling(window=window).mean()
+
+
+def _ema(ind: 'IndicatorSet', window: int) -> pd.Series:
+    return ind.history['Close'].ewm(span=window, adjust=False).mean()
+
+
+def _rsi(ind: 'IndicatorSet', window: int) -> pd.Series:
+    """Cutler's RSI: simple rolling mean of gains and losses."""
+    delta = ind.history['Close'].diff()
+    gain = delta.where(delta > 0, 0).rolling(window=window).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+    return 100 - (100 / (1 + gain / loss))
+
+
+def _macd(ind: 'IndicatorSet', window: Optional[int]) -> pd.Series:
+    return ind.series('ema', 12) - ind.series('ema', 26)
+
+
+def _macd_signal(ind: 'IndicatorSet', window: Optional[int]) -> pd.Series:
+    return ind.series('macd').ewm(span=9, adjust=False).mean()
+
+
+def _atr(ind: 'IndicatorSet', window: int) -> pd.Series:
+    return ind.series('true_range').rolling(window=window).mean()
+
+
+def _plus_dm(ind: 'IndicatorSet', window: Optional[int]) -> pd.Series:
+    up, down = ind.history['High'].diff(), -ind.history['Low'].diff()
+    return up.mask((up < 0) | (up <= down), 0)
+
+
+def _minus_dm(ind: 'IndicatorSet', window: Optional[int]) -> pd.Series:
+    up, down = ind.history['High'].diff(), -ind.history['Low'].diff()
+    return down.mask((down < 0) | (down <= up), 0)
+
+
+def _plus_di(ind: 'IndicatorSet', window: int) -> pd.Series:
+    return 100 * (ind.series('plus_dm').rolling(window=window).mean() / ind.series('atr', window))
+
+
+def _minus_di(ind: 'IndicatorSet', window: int) -> pd.Series:
+    return 100 * (ind.series('minus_dm').rolling(window=window).mean() / ind.series('atr', window))
+
+
+def _adx(ind: 'IndicatorSet', window: int) -> pd.Series:
+    """Simplified ADX: rolling means instead of Wilder smoothing."""
+    plus_di, minus_di = ind.series('plus_di', window), ind.series('minus_di', window)
+    dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di + 0.0001)
+    return dx.rolling(window=window).mean()
+
+
+def _volume_sma(ind: 'IndicatorSet', window: int) -> pd.Series:
+    return ind.history['Volume'].rolling(window=window).mean()
+
+
+# name -> (compute(indicator_set, window), takes a window)
+INDICATORS: Dict[str, Tuple[Callable[['IndicatorSet', Optional[int]], pd.Series], bool]] = {
+    'sma': (_sma, True),
+    'ema': (_ema, True),
+    'rsi': (_rsi, True),
+    'macd': (_macd, False),
+    'macd_signal': (_macd_signal, False),
+    'true_range': (_true_range, False),
+    'atr': (_atr, True),
+    'plus_dm': (_plus_dm, False),
+    'minus_dm': (_minus_dm, False),
+    'plus_di': (_plus_di, True),
+    'minus_di': (_minus_di, True),
+    'adx': (_adx, True),
+    'volume_sma': (_volume_sma, True),
+}
+
+
+def column_name(name: str, window: Optional[int] = None) -> str:
+    """Column label for an indicator: ('rsi', 14) -> 'RSI14', ('macd', None) -> 'MACD'."""
+    return f"{name.upper()}{window if window is not None else ''}"
+
+
+class IndicatorSet:
+    """Lazily computed, memoized indicator series over one OHLCV frame."""
+
+    def __init__(self, history: pd.DataFrame):
+        self.history = history
+        self._series: Dict[IndicatorKey, pd.Series] = {}
+        self._lock = threading.RLock()
+        self.computed = 0
+
+    def series(self, name: str, window: Optional[int] = None) -> pd.Series:
+        """Return indicator ``name`` over the whole history, computing it on first use."""
+        if name not in INDICATORS:
+            raise ValueError(f"Unknown indicator: {name!r}")
+        compute, windowed = INDICATORS[name]
+        if windowed and window is None:
+            raise ValueError(f"Indicator {name!r} needs a window")
+        key = (name, window if windowed else None)
+        with self._lock:
+            if key not in self._series:
+                self._series[key] = compute(self, key[1])
+                self.computed += 1
+            return self._series[key]
+
+    def last(self, name: str, window: Optional[int] = None, default: Any = np.nan) -> Any:
+        """Latest value of an indicator, or ``default`` if it is NaN or there is no data."""
+        series = self.series(name, window)
+        if series.empty or pd.isna(series.iloc[-1]):
+            return default
+        return series.iloc[-1]
+
+    def frame(self, *specs: Tuple[str, Optional[int]]) -> pd.DataFrame:
+        """Copy of the history with the requested indicators added as columns ('RSI14', 'SMA50', ...)."""
+        df = self.history.copy()
+        for name, window in specs:
+            df[column_name(name, window)] = self.series(name, window)
+        return df
+
+
+_indicator_cache = TTLCache(ttl=INDICATOR_CACHE_TTL, max_entries=INDICATOR_CACHE_MAX_ENTRIES)
+
+
+def _fingerprint(history: pd.DataFrame) -> Tuple[Optional[float], ...]:
+    """Last bar's OHLCV plus the first close (NaN as None so equal frames give equal keys)."""
+    columns = [c for c in KEY_COLUMNS if c in history.columns]
+    values = history[columns].iloc[-1].tolist()
+    if 'Close' in history.columns:
+        values.append(history['Close'].iloc[0])
+    return tuple(None if pd.isna(v) else float(v) for v in values)
+
+
+def get_indicators(history: pd.DataFrame, symbol: Optional[str] = None) -> IndicatorSet:
+    """Return the shared ``IndicatorSet`` for ``symbol``'s current history.
+
+    Without a symbol (or for an empty frame) a private, uncached set is returned.
+    """
+    if not symbol or history is None or history.empty:
+        return IndicatorSet(history if history is not None else pd.DataFrame())
+    key = (symbol, history.index[-1], len(history), _fingerprint(history))
+    indicators = _indicator_cache.get(key)
+    if indicators is None:
+        indicators = IndicatorSet(history)
+        _indicator_cache.set(key, indicators)
+    return indicators
+
+
+def clear_indicator_cache() -> None:
+    _indicator_cache.clear()
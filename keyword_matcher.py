@@ -0,0 +1,86 @@
+"""Compiled Multi-Keyword Matcher.
+
+Compiles every keyword of every tag (e.g. 'positive' / 'negative') into one
+alternation regex, longest keyword first, so a text is scanned once and
+matches never overlap: 'melemah' counts as 'melemah', not also as 'lemah'.
+A batch of titles is joined and scanned in a single pass.
+
+Each keyword can carry a boundary rule:
+    'substring'  match anywhere (default, the old ``word in title`` behaviour)
+    'prefix'     must start a word ('utang' matches 'utangnya', not 'piutang')
+    'word'       must be a whole word ('jual' does not match 'penjualan')
+
+Compliance: CWE-1333 (ReDoS) — patterns are escaped literals, no backtracking groups
+"""
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+BOUNDARY_RULES = ('substring', 'prefix', 'word')
+_SEPARATOR = '\n'
+
+# A match is (tag, keyword)
+Match = Tuple[str, str]
+
+
+class KeywordMatcher:
+    """Match tagged keyword lists against texts with one compiled regex.
+
+    Args:
+        keywords: Mapping of tag -> keywords. A keyword listed under two tags
+            keeps the first tag.
+        boundaries: Optional keyword -> boundary rule overrides.
+        default_boundary: Rule for keywords without an override.
+        case_sensitive: Match exact case (e.g. tickers 'BUMI' vs the word 'bumi').
+    """
+
+    def __init__(self, keywords: Mapping[str, Sequence[str]],
+                 boundaries: Optional[Mapping[str, str]] = None,
+                 default_boundary: str = 'substring',
+                 case_sensitive: bool = False):
+        boundaries = dict(boundaries or {})
+        for rule in list(boundaries.values()) + [default_boundary]:
+            if rule not in BOUNDARY_RULES:
+                raise ValueError(f"Unknown boundary rule: {rule!r}")
+
+        self._tag_of: Dict[str, str] = {}
+        for tag, words in keywords.items():
+            for word in words:
+                self._tag_of.setdefault(word if case_sensitive else word.lower(), tag)
+
+        alternatives = []
+        self._groups: List[str] = []
+        for word in sorted(self._tag_of, key=len, reverse=True):
+            rule = boundaries.get(word, default_boundary)
+            pattern = re.escape(word)
+            if rule in ('prefix', 'word'):
+                pattern = r'\b' + pattern
+            if rule == 'word':
+                pattern += r'\b'
+            self._groups.append(word)
+            alternatives.append(f'({pattern})')
+        flags = 0 if case_sensitive else re.IGNORECASE
+        self._regex = re.compile('|'.join(alternatives), flags) if alternatives else None
+
+    def _iter(self, text: str):
+        if self._regex is None:
+            return
+        for m in self._regex.finditer(text):
+            word = self._groups[m.lastindex - 1]
+            yield m.start(), (self._tag_of[word], word)
+
+    def find(self, text: str) -> List[Match]:
+        """Return non-overlapping (tag, keyword) matches in ``text``, left to right."""
+        return [match for _, match in self._iter(text or '')]
+
+    def find_batch(self, texts: Iterable[str]) -> List[List[Match]]:
+        """Match many texts in one regex pass; returns one match list per text."""
+        texts = [(t or '').replace(_SEPARATOR, ' ') for t in texts]
+        starts, offset = [], 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + len(_SEPARATOR)
+        results: List[List[Match]] = [[] for _ in texts]
+        for position, match in self._iter(_SEPARATOR.join(texts)):
+            results[bisect_right(starts, position) - 1].append(match)
+        return results
@@ -0,0 +1,125 @@
+"""Historical Auto-Reject Event Detector.
+
+Marks every daily bar of a dates x symbols panel as an ARA or ARB hit by
+rebuilding that session's limits from the previous traded close with the
+BEI tick rules (``utils.ara_arb_limits``, one vectorized pass over the
+whole panel), then finds consecutive-hit streaks for every symbol at once.
+
+Suspension days (no bar, or a zero-volume bar, between a symbol's first and
+last bar) do not break a streak - as in the ARA beruntun preset, where a
+stock is suspended between ARA days - and are counted per event.
+
+Yahoo bars are dividend/split adjusted, so a close that sat exactly on the
+limit can land a fraction of a tick off the rebuilt one; ``tolerance_ticks``
+absorbs that.
+
+Compliance: OWASP API4 (Unrestricted Resource Consumption), CWE-400
+"""
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from scanner import load_panel
+from utils import ara_arb_limits, tick_sizes
+
+STREAK_PERIOD = '5y'
+MIN_STREAK = 2             # Consecutive limit days that make an event
+HIT_TOLERANCE_TICKS = 0.5  # Close within this many ticks of the rebuilt limit counts as a hit
+
+EVENT_COLUMNS = ['Saham', 'Tipe', 'Mulai', 'Selesai', 'Hari Limit', 'Hari Suspensi', 'Harga Awal',
+                 'Harga Akhir', 'Return %', 'Return Hari Berikut %']
+
+
+def mark_limit_hits(close: pd.DataFrame, volume: pd.DataFrame = None, board: str = 'regular',
+                    tolerance_ticks: float = HIT_TOLERANCE_TICKS) -> Dict[str, np.ndarray]:
+    """Per-bar limit state for an aligned dates x symbols close (and volume) frame.
+
+    Returns 2-D arrays 'prev_close', 'ara', 'arb' (NaN where unknown) and
+    boolean 'traded', 'suspended', 'ara_hit', 'arb_hit'.
+    """
+    c = close.to_numpy(dtype=float)
+    traded = np.isfinite(c) & (c > 0)
+    if volume is not None:
+        traded &= volume.reindex_like(close).fillna(0).to_numpy(dtype=float) > 0
+    listed = np.isfinite(c)
+    first = np.maximum.accumulate(listed, axis=0)
+    last = np.maximum.accumulate(listed[::-1], axis=0)[::-1]
+    suspended = ~traded & first & last
+
+    prev = pd.DataFrame(np.where(traded, c, np.nan)).ffill().shift(1).to_numpy()
+    ara = np.full(c.shape, np.nan)
+    arb = np.full(c.shape, np.nan)
+    known = np.isfinite(prev) & (prev > 0)
+    if known.any():
+        ara[known], arb[known] = (x.astype(float) for x in ara_arb_limits(prev[known], board))
+
+    with np.errstate(invalid='ignore'):
+        ara_hit = traded & known & (c > prev) & (c >= ara - tolerance_ticks * tick_sizes(np.nan_to_num(ara)))
+        arb_hit = traded & known & (c < prev) & (c <= arb + tolerance_ticks * tick_sizes(np.nan_to_num(arb)))
+    return {'prev_close': prev, 'ara': ara, 'arb': arb, 'traded': traded, 'suspended': suspended,
+            'ara_hit': ara_hit, 'arb_hit': arb_hit}
+
+
+def _streaks(hit: np.ndarray, traded: np.ndarray, min_length: int) -> Tuple[np.ndarray, ...]:
+    """Runs of hits over each symbol's traded bars (suspended days skipped).
+
+    Returns (symbol, start row, end row, hits, next traded row or -1) arrays.
+    """
+    sym, row = np.nonzero(traded.T)  # Symbol-major, dates ascending
+    h = hit.T[sym, row]
+    same_next = np.r_[sym[1:] == sym[:-1], False]
+    same_prev = np.r_[False, sym[1:] == sym[:-1]]
+    prev_h = np.r_[False, h[:-1]] & same_prev
+    next_h = np.r_[h[1:], False] & same_next
+    starts = np.flatnonzero(h & ~prev_h)
+    ends = np.flatnonzero(h & ~next_h)
+    length = ends - starts + 1
+    keep = length >= min_length
+    starts, ends, length = starts[keep], ends[keep], length[keep]
+    after = np.where(same_next[ends], row[np.minimum(ends + 1, len(row) - 1)], -1)
+    return sym[starts], row[starts], row[ends], length, after
+
+
+def find_limit_streaks(panel: Dict[str, pd.DataFrame], board: str = 'regular', min_length: int = MIN_STREAK,
+                       tolerance_ticks: float = HIT_TOLERANCE_TICKS) -> pd.DataFrame:
+    """Event table of consecutive ARA and ARB streaks in a dates x symbols panel.
+
+    One row per streak: symbol, type, first and last limit day, limit and
+    suspension days inside, the close before the streak, the last close, the
+    streak return and the return of the next traded day (NaN if none yet).
+    """
+    close = panel['Close']
+    if close.empty:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+    state = mark_limit_hits(close, panel.get('Volume'), board, tolerance_ticks)
+    c = close.to_numpy(dtype=float)
+    dates, symbols = close.index, np.asarray(close.columns, dtype=object)
+
+    frames = []
+    for kind in ('ARA', 'ARB'):
+        sym, start, end, hits, after = _streaks(state[f"{kind.lower()}_hit"], state['traded'], min_length)
+        base = state['prev_close'][start, sym]
+        final = c[end, sym]
+        next_close = np.where(after >= 0, c[np.maximum(after, 0), sym], np.nan)
+        frames.append(pd.DataFrame({
+            'Saham': symbols[sym],
+            'Tipe': kind,
+            'Mulai': dates[start],
+            'Selesai': dates[end],
+            'Hari Limit': hits,
+            'Hari Suspensi': (end - start + 1) - hits,  # Rows inside a streak are hits or suspensions
+            'Harga Awal': base,
+            'Harga Akhir': final,
+            'Return %': (final / base - 1) * 100,
+            'Return Hari Berikut %': (next_close / final - 1) * 100,
+        }, columns=EVENT_COLUMNS))
+    events = pd.concat(frames, ignore_index=True)
+    return events.sort_values(['Mulai', 'Saham']).reset_index(drop=True)
+
+
+def scan_limit_streaks(symbols: Sequence[str], period: str = STREAK_PERIOD, board: str = 'regular',
+                       min_length: int = MIN_STREAK) -> Tuple[pd.DataFrame, List[Tuple[str, str]]]:
+    """Load bars (gaps kept) from the bar store and detect streaks; returns (events, failures)."""
+    panel, failed = load_panel(symbols, period, ffill=False)
+    return find_limit_streaks(panel, board, min_length), failed
@@ -0,0 +1,82 @@
+"""Concurrent News Aggregator with Latency Budgets.
+
+Runs every news source at once on a shared thread pool. Each source has its
+own deadline and the whole batch has one overall budget, so a slow or hung
+feed costs at most its deadline instead of stalling the page. Whatever
+arrived in time is returned together with a per-source status.
+
+Compliance: OWASP API4 (Unrestricted Resource Consumption), CWE-400
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from logger import get_logger
+
+DEFAULT_SOURCE_TIMEOUT = 4.0   # seconds per source
+DEFAULT_TOTAL_BUDGET = 6.0     # seconds for the whole batch
+NEWS_POOL_WORKERS = 16         # Shared across sessions; hung feeds only hold a worker
+
+_news_pool = ThreadPoolExecutor(max_workers=NEWS_POOL_WORKERS, thread_name_prefix="news")
+
+
+class NewsSource(NamedTuple):
+    """One news source: a display name, a zero-argument fetch and an optional deadline."""
+    name: str
+    fetch: Callable[[], List[Dict[str, Any]]]
+    timeout: Optional[float] = None
+
+
+def aggregate_news(
+    sources: List[NewsSource],
+    total_budget: float = DEFAULT_TOTAL_BUDGET,
+    source_timeout: float = DEFAULT_SOURCE_TIMEOUT,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Fetch all sources concurrently and collect what arrives before the deadlines.
+
+    Args:
+        sources: Sources to query; results are merged in this order.
+        total_budget: Seconds after which the aggregator returns regardless.
+        source_timeout: Default per-source deadline when a source sets none.
+
+    Returns:
+        Tuple of (merged news items, status per source name). A status has
+        'status' ('ok', 'empty', 'error' or 'timeout'), 'count' and 'elapsed'.
+    """
+    start = time.monotonic()
+    futures: Dict[Future, Tuple[int, NewsSource, float]] = {}
+    for order, source in enumerate(sources):
+        deadline = start + min(source.timeout or source_timeout, total_budget)
+        futures[_news_pool.submit(source.fetch)] = (order, source, deadline)
+
+    results: Dict[int, List[Dict[str, Any]]] = {}
+    status: Dict[str, Dict[str, Any]] = {}
+    pending = set(futures)
+    while pending:
+        now = time.monotonic()
+        for future in [f for f in pending if futures[f][2] <= now and not f.done()]:
+            _, source, deadline = futures[future]
+            future.cancel()
+            status[source.name] = {'status': 'timeout', 'count': 0, 'elapsed': round(deadline - start, 2)}
+            pending.discard(future)
+        if not pending:
+            break
+        next_deadline = min(futures[f][2] for f in pending)
+        done, pending = wait(pending, timeout=max(0.0, next_deadline - time.monotonic()),
+                             return_when=FIRST_COMPLETED)
+        for future in done:
+            order, source, _ = futures[future]
+            elapsed = round(time.monotonic() - start, 2)
+            try:
+                items = future.result() or []
+            except Exception as e:
+                get_logger().warning(f"News source {source.name} failed: {type(e).__name__}: {e}")
+                status[source.name] = {'status': 'error', 'count': 0, 'elapsed': elapsed}
+                continue
+            results[order] = list(items)
+            status[source.name] = {'status': 'ok' if items else 'empty', 'count': len(items), 'elapsed': elapsed}
+
+    news: List[Dict[str, Any]] = []
+    for order in sorted(results):
+        news.extend(results[order])
+    return news, {source.name: status[source.name] for source in sources if source.name in status}
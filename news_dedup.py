@@ -0,0 +1,118 @@
+"""Near-Duplicate Headline Clustering.
+
+The same story reaches the dashboard through Google News, Kontan, CNBC and
+Bisnis with slightly different titles. Each title is reduced to character
+shingles, summarised by a MinHash signature and filed into LSH bands, so an
+incoming headline is only compared with the few earlier headlines that share
+a band bucket (sub-linear in the size of the list) instead of with all of them.
+Candidates are confirmed by exact shingle Jaccard similarity.
+
+Every cluster is collapsed into its first item (merged news keeps source
+priority order), annotated with ``source_count`` and ``sources``.
+
+Compliance: OWASP API4 (Unrestricted Resource Consumption), CWE-400
+"""
+import re
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import numpy as np
+
+SHINGLE_SIZE = 4          # Characters per shingle
+NUM_PERM = 64             # MinHash signature length
+BANDS = 16                # LSH bands of NUM_PERM // BANDS rows (candidate threshold ~0.5)
+SIMILARITY_THRESHOLD = 0.6  # Shingle Jaccard needed to merge two titles
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240601)  # Fixed seed: signatures are stable across runs
+_PERM_A = _rng.integers(1, _PRIME, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _PRIME, size=NUM_PERM, dtype=np.uint64)
+
+# "Judul berita - Kontan" -> the publisher suffix Google News appends
+_PUBLISHER_SUFFIX = re.compile(r'\s+[-|–—]\s+[^-|–—]{1,40}$')
+_NON_WORD = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase, drop a trailing ' - Publisher' and collapse punctuation to spaces."""
+    title = _PUBLISHER_SUFFIX.sub('', str(title or '')).lower()
+    return _NON_WORD.sub(' ', title).strip()
+
+
+def shingles(title: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """Hashed character shingles of the normalized title."""
+    text = normalize_title(title)
+    if len(text) <= size:
+        return {zlib.crc32(text.encode())} if text else set()
+    return {zlib.crc32(text[i:i + size].encode()) for i in range(len(text) - size + 1)}
+
+
+def minhash(shingle_set: Set[int]) -> np.ndarray:
+    """MinHash signature (NUM_PERM values) of a shingle set."""
+    hashes = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set)) % np.uint64(_PRIME)
+    return ((_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % np.uint64(_PRIME)).min(axis=1)
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _default_title(item: Dict[str, Any]) -> str:
+    return item.get('title', '') if isinstance(item, dict) else ''
+
+
+def collapse_near_duplicates(
+    news: List[Dict[str, Any]],
+    title_of: Optional[Callable[[Dict[str, Any]], str]] = None,
+    threshold: float = SIMILARITY_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """Keep one representative per near-duplicate cluster, in original order.
+
+    Items with the same link, or titles whose shingle Jaccard similarity is at
+    least ``threshold``, form a cluster. The representative is a copy of the
+    first item with ``source_count`` (cluster size) and ``sources`` (distinct
+    publishers). Items without a title are kept as they are.
+    """
+    title_of = title_of or _default_title
+    rows = NUM_PERM // BANDS
+    buckets: Dict[tuple, List[int]] = {}
+    by_link: Dict[str, int] = {}
+    reps: List[Dict[str, Any]] = []
+    rep_shingles: List[Set[int]] = []
+
+    for item in news or []:
+        title = title_of(item)
+        grams = shingles(title)
+        if not grams:
+            reps.append(item)
+            rep_shingles.append(set())
+            continue
+
+        link = item.get('link') if isinstance(item, dict) else None
+        match = by_link.get(link) if link and link != '#' else None
+        signature = minhash(grams)
+        keys = [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(BANDS)]
+        if match is None:
+            candidates = {idx for key in keys for idx in buckets.get(key, ())}
+            for idx in sorted(candidates):
+                if jaccard(grams, rep_shingles[idx]) >= threshold:
+                    match = idx
+                    break
+
+        publisher = item.get('publisher', 'Unknown') if isinstance(item, dict) else 'Unknown'
+        if match is not None:
+            rep = reps[match]
+            rep['source_count'] += 1
+            if publisher not in rep['sources']:
+                rep['sources'].append(publisher)
+        else:
+            match = len(reps)
+            reps.append(dict(item, source_count=1, sources=[publisher]))
+            rep_shingles.append(grams)
+            for key in keys:
+                buckets.setdefault(key, []).append(match)
+        if link and link != '#':
+            by_link.setdefault(link, match)
+    return reps
@@ -0,0 +1,196 @@
+"""Universe-Wide News Index.
+
+Instead of querying every news source once per symbol, a background job
+fetches each source's general market feed once, tags every headline with
+the tickers it mentions (one compiled matcher over all symbols in
+``config.MARKET_INDICES``) and files it into a local in-memory index.
+Per-symbol pages and the universe sentiment view then read the index
+without touching the network.
+
+Tickers are matched case-sensitively as whole words, so 'BUMI' tags
+Bumi Resources while the common word 'bumi' does not.
+
+Compliance: OWASP API4 (Unrestricted Resource Consumption), CWE-400
+"""
+import calendar
+import threading
+import time
+import urllib.parse
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from config import MARKET_INDICES
+from fetch_engine import run_in_background
+from http_client import fetch_feed
+from keyword_matcher import KeywordMatcher
+from logger import get_logger
+from news_aggregator import NewsSource, aggregate_news
+
+INDEX_REFRESH_INTERVAL = 600   # Seconds between background ingestions
+MAX_ITEMS_PER_SYMBOL = 30      # Newest headlines kept per ticker
+MAX_ENTRIES_PER_FEED = 100     # Entries read from one general feed
+FEED_TIMEOUT = 8.0             # Per-feed deadline (runs off the request path)
+INGEST_BUDGET = 15.0           # Deadline for one whole ingestion
+
+_GOOGLE_RSS = "https://news.google.com/rss/search?q={query}&hl=id-ID&gl=ID&ceid=ID:id"
+
+# (publisher, search query) — one general feed per source, not one per symbol
+GENERAL_FEEDS: List[Tuple[str, str]] = [
+    ('Google News', 'saham IHSG'),
+    ('Google News', 'saham emiten'),
+    ('KabarBursa', 'saham site:kabarbursa.com'),
+    ('Kontan', 'saham site:kontan.co.id'),
+    ('CNBC Indonesia', 'saham site:cnbcindonesia.com'),
+    ('Bisnis.com', 'saham site:bisnis.com'),
+    ('Detik Finance', 'saham site:finance.detik.com'),
+    ('IDX Channel', 'saham site:idxchannel.com'),
+    ('Investing.com ID', 'saham site:id.investing.com'),
+]
+
+
+def universe_symbols() -> List[str]:
+    """Every distinct ticker listed in ``config.MARKET_INDICES``, sorted."""
+    return sorted({symbol for symbols in MARKET_INDICES.values() for symbol in symbols})
+
+
+def _feed_url(query: str) -> str:
+    return _GOOGLE_RSS.format(query=urllib.parse.quote_plus(query, safe=':'))
+
+
+def _read_feed(publisher: str, query: str) -> List[Dict[str, Any]]:
+    """Fetch one general feed and return items in the per-symbol source format."""
+    feed = fetch_feed(_feed_url(query))
+    items = []
+    for entry in feed.entries[:MAX_ENTRIES_PER_FEED]:
+        published = entry.get('published_parsed')
+        items.append({
+            'title': entry.get('title', 'No Title'),
+            'link': entry.get('link', '#'),
+            'publisher': publisher,
+            'providerPublishTime': calendar.timegm(published) if published else 0,
+        })
+    return items
+
+
+class NewsIndex:
+    """Ticker -> recent headlines, filled from general feeds in the background.
+
+    Args:
+        symbols: Tickers to tag (without the '.JK' suffix).
+        feeds: (publisher, query) general feeds fetched on each ingestion.
+        refresh_interval: Seconds before ``ensure_fresh`` schedules a new ingestion.
+        max_items: Headlines kept per ticker (newest first).
+    """
+
+    def __init__(self, symbols: Iterable[str], feeds: Optional[List[Tuple[str, str]]] = None,
+                 refresh_interval: float = INDEX_REFRESH_INTERVAL,
+                 max_items: int = MAX_ITEMS_PER_SYMBOL):
+        self.symbols = sorted(set(symbols))
+        self.feeds = list(GENERAL_FEEDS if feeds is None else feeds)
+        self.refresh_interval = refresh_interval
+        self.max_items = max_items
+        self._matcher = KeywordMatcher({s: [s] for s in self.symbols},
+                                       default_boundary='word', case_sensitive=True)
+        self._items: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._links: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self.last_refresh: Optional[float] = None
+        self.last_status: Dict[str, Dict[str, Any]] = {}
+        self.ingestions = 0
+
+    # ── Tagging & storage ────────────────────────────────────
+    def tag(self, titles: Iterable[str]) -> List[List[str]]:
+        """Return the distinct tickers mentioned in each title, in order of appearance."""
+        return [list(dict.fromkeys(tag for tag, _ in matches))
+                for matches in self._matcher.find_batch(titles)]
+
+    def add(self, items: List[Dict[str, Any]]) -> int:
+        """File news items under every ticker their title mentions; returns new (ticker, item) pairs."""
+        added = 0
+        tags = self.tag(item.get('title', '') for item in items)
+        with self._lock:
+            for item, symbols in zip(items, tags):
+                for symbol in symbols:
+                    links = self._links.setdefault(symbol, set())
+                    key = item.get('link') or item.get('title')
+                    if key in links:
+                        continue
+                    bucket = self._items.setdefault(symbol, deque(maxlen=self.max_items))
+                    if len(bucket) == bucket.maxlen:
+                        evicted = bucket[-1]
+                        links.discard(evicted.get('link') or evicted.get('title'))
+                    bucket.appendleft(dict(item, symbols=symbols))
+                    links.add(key)
+                    added += 1
+        return added
+
+    def headlines(self, symbol: str) -> List[Dict[str, Any]]:
+        """Indexed headlines for ``symbol`` ('BBCA' or 'BBCA.JK'), newest first."""
+        symbol = symbol[:-3] if symbol.endswith('.JK') else symbol
+        with self._lock:
+            items = list(self._items.get(symbol, ()))
+        return sorted(items, key=lambda i: i.get('providerPublishTime', 0), reverse=True)
+
+    def snapshot(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Headlines for many tickers at once (all indexed tickers by default)."""
+        with self._lock:
+            wanted = list(self._items) if symbols is None else list(symbols)
+        return {symbol: self.headlines(symbol) for symbol in wanted}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._links.clear()
+            self.last_refresh = None
+
+    # ── Ingestion ────────────────────────────────────────────
+    def refresh(self) -> int:
+        """Fetch every general feed once and index the tagged headlines."""
+        sources = [NewsSource(f"{publisher}: {query}", lambda p=publisher, q=query: _read_feed(p, q))
+                   for publisher, query in self.feeds]
+        news, status = aggregate_news(sources, total_budget=INGEST_BUDGET, source_timeout=FEED_TIMEOUT)
+        added = self.add(news)
+        with self._lock:
+            self.last_refresh = time.time()
+            self.last_status = status
+            self.ingestions += 1
+        get_logger().info(f"News index ingested {len(news)} headlines, {added} new ticker tags")
+        return added
+
+    def _refresh_job(self) -> None:
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def is_stale(self) -> bool:
+        return self.last_refresh is None or time.time() - self.last_refresh >= self.refresh_interval
+
+    def ensure_fresh(self, wait: bool = False) -> None:
+        """Schedule a background ingestion when the index is stale.
+
+        With ``wait=True`` an index that has never been filled is ingested
+        synchronously, so the first caller sees results instead of nothing.
+        """
+        if wait and self.last_refresh is None:
+            with self._lock:
+                if self._refreshing:
+                    wait = False
+                else:
+                    self._refreshing = True
+            if wait:
+                self._refresh_job()
+                return
+        if not self.is_stale():
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        run_in_background(self._refresh_job)
+
+
+# Global index over the whole MARKET_INDICES universe
+news_index = NewsIndex(universe_symbols())
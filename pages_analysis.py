@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 import yfinance as yf
 import datetime
 from utils import format_rupiah, format_percent, format_large_number, get_tick_size, round_price_to_tick
@@ -16,16 +15,28 @@ import requests
 from bs4 import BeautifulSoup
 import re
 import time
-import feedparser
+from http_client import fetch_feed
 import urllib.parse
 from utils import sanitize_url
+from bar_store import bar_store
+from data_cache import TTLCache
+from news_aggregator import NewsSource, aggregate_news
+from keyword_matcher import KeywordMatcher
+from snapshot_cache import snapshot_cache
+from singleflight import yahoo_flight
+from news_index import news_index
+from news_dedup import collapse_near_duplicates
+from indicators import get_indicators
+from signals import TIMEFRAME_LABELS, get_multi_timeframe_signals, multi_timeframe_signal_series
+from backtest import backtest_signals, DEFAULT_CAPITAL
+from config import PLATFORM_CONFIG
 
 def get_kabarbursa_news(symbol):
     """Scrape KabarBursa via Google RSS using feedparser"""
     try:
         safe_symbol = urllib.parse.quote(symbol, safe='')
         url = f"https://news.google.com/rss/search?q={safe_symbol}+site:kabarbursa.com&hl=id-ID&gl=ID&ceid=ID:id"
-        feed = feedparser.parse(url)
+        feed = fetch_feed(url)
         news_items = []
         for entry in feed.entries[:5]:
             try:
@@ -47,7 +58,7 @@ def get_kontan_news(symbol):
     try:
         safe_symbol = urllib.parse.quote(symbol, safe='')
         url = f"https://news.google.com/rss/search?q={safe_symbol}+site:kontan.co.id&hl=id-ID&gl=ID&ceid=ID:id"
-        feed = feedparser.parse(url)
+        feed = fetch_feed(url)
         news_items = []
         for entry in feed.entries[:5]:
             try:
@@ -69,7 +80,7 @@ def get_cnbc_news(symbol):
     try:
         safe_symbol = urllib.parse.quote(symbol, safe='')
         url = f"https://news.google.com/rss/search?q={safe_symbol}+site:cnbcindonesia.com&hl=id-ID&gl=ID&ceid=ID:id"
-        feed = feedparser.parse(url)
+        feed = fetch_feed(url)
         news_items = []
         for entry in feed.entries[:5]:
             try:
@@ -104,7 +115,7 @@ def get_google_news_rss(symbol):
     for query in search_terms:
         try:
             url = f"https://news.google.com/rss/search?q={query}&hl=id-ID&gl=ID&ceid=ID:id"
-            feed = feedparser.parse(url)
+            feed = fetch_feed(url)
             
             for entry in feed.entries[:10]:
                 try:
@@ -122,9 +133,7 @@ def get_google_news_rss(symbol):
                     
             if len(news_items) >= 20:
                 break
-                
-            # Small delay to avoid rate limiting
-            time.sleep(0.5)
+            # Tanpa jeda antar query: sumber ini berjalan dengan batas waktu per sumber di aggregator
         except Exception:
             continue
     
@@ -135,7 +144,7 @@ def get_bisnis_news(symbol):
     try:
         safe_symbol = urllib.parse.quote(symbol, safe='')
         url = f"https://news.google.com/rss/search?q={safe_symbol}+site:bisnis.com&hl=id-ID&gl=ID&ceid=ID:id"
-        feed = feedparser.parse(url)
+        feed = fetch_feed(url)
         news_items = []
         for entry in feed.entries[:7]:
             try:
@@ -157,7 +166,7 @@ def get_detik_finance_news(symbol):
     try:
         safe_symbol = urllib.parse.quote(symbol, safe='')
         url = f"https://news.google.com/rss/search?q={safe_symbol}+site:detik.com&hl=id-ID&gl=ID&ceid=ID:id"
-        feed = feedparser.parse(url)
+        feed = fetch_feed(url)
         news_items = []
         for entry in feed.entries[:7]:
             try:
@@ -179,7 +188,7 @@ def get_idx_channel_news(symbol):
     try:
         safe_symbol = urllib.parse.quote(symbol, safe='')
         url = f"https://news.google.com/rss/search?q={safe_symbol}+site:idx.co.id&hl=id-ID&gl=ID&ceid=ID:id"
-        feed = feedparser.parse(url)
+        feed = fetch_feed(url)
         news_items = []
         for entry in feed.entries[:5]:
             try:
@@ -201,7 +210,7 @@ def get_investing_indonesia_news(symbol):
     try:
         safe_symbol = urllib.parse.quote(symbol, safe='')
         url = f"https://news.google.com/rss/search?q={safe_symbol}+site:id.investing.com&hl=id-ID&gl=ID&ceid=ID:id"
-        feed = feedparser.parse(url)
+        feed = fetch_feed(url)
         news_items = []
         for entry in feed.entries[:5]:
             try:
@@ -219,10 +228,46 @@ def get_investing_indonesia_news(symbol):
     return []
 
 
+# ── Sentiment Keywords ───────────────────────────────────────
+SENTIMENT_POSITIVE_KEYWORDS = [
+    'naik', 'melonjak', 'reli', 'menguat', 'tumbuh', 'growth', 'positif', 
+    'dividen', 'buy', 'beli', 'akuisisi', 'tertinggi', 'rebound', 'proyek', 
+    'kerjasama', 'profit', 'laba', 'surplus', 'bullish', 'ekspansi', 
+    'berkembang', 'meningkat', 'kenaikan', 'prestasi', 'inovasi', 'cemerlang'
+]
+SENTIMENT_NEGATIVE_KEYWORDS = [
+    'turun', 'merosot', 'anjlok', 'jatuh', 'rugi', 'loss', 'negatif', 
+    'utang', 'debt', 'sell', 'jual', 'gugat', 'bangkrut', 'pkpu', 
+    'suspend', 'bearish', 'deficit', 'weak', 'lemah', 'penurunan', 
+    'gagal', 'kerugian', 'ambles', 'terpuruk', 'koreksi', 'nyangkut',
+    'tertahan', 'tertekan', 'melemah'
+]
+# Kata pendek yang sering muncul di dalam kata lain (penjualan, pembelian, piutang, ...)
+SENTIMENT_BOUNDARIES = {
+    'jual': 'word', 'beli': 'word', 'reli': 'word', 'buy': 'word', 'sell': 'word',
+    'utang': 'prefix', 'laba': 'prefix',
+}
+_sentiment_matcher = KeywordMatcher(
+    {'positive': SENTIMENT_POSITIVE_KEYWORDS, 'negative': SENTIMENT_NEGATIVE_KEYWORDS},
+    boundaries=SENTIMENT_BOUNDARIES,
+)
+_keyword_rank = {w: i for i, w in enumerate(SENTIMENT_POSITIVE_KEYWORDS + SENTIMENT_NEGATIVE_KEYWORDS)}
+
+
+def _news_title(item):
+    """Extract title properly from mixed format (yfinance nests it under 'content')."""
+    if isinstance(item, dict):
+        content = item.get('content', item)
+        return content.get('title', item.get('title', ""))
+    return ""
+
+
 def analyze_sentiment(news_list):
     """
     Analyze sentiment from news titles using advanced keyword scoring.
     Returns detailed breakdown of positive/negative news.
+    All titles are scored in one pass of a compiled keyword matcher; overlapping
+    keywords (e.g. 'lemah' inside 'melemah') count once.
     """
     if not news_list:
         return {
@@ -233,60 +278,30 @@ def analyze_sentiment(news_list):
             "negative_news": [],
             "neutral_news": []
         }
-        
-    # Expanded and improved keyword lists
-    pos_keywords = [
-        'naik', 'melonjak', 'reli', 'menguat', 'tumbuh', 'growth', 'positif', 
-        'dividen', 'buy', 'beli', 'akuisisi', 'tertinggi', 'rebound', 'proyek', 
-        'kerjasama', 'profit', 'laba', 'surplus', 'bullish', 'ekspansi', 
-        'berkembang', 'meningkat', 'kenaikan', 'prestasi', 'inovasi', 'cemerlang'
-    ]
-    
-    neg_keywords = [
-        'turun', 'merosot', 'anjlok', 'jatuh', 'rugi', 'loss', 'negatif', 
-        'utang', 'debt', 'sell', 'jual', 'gugat', 'bangkrut', 'pkpu', 
-        'suspend', 'bearish', 'deficit', 'weak', 'lemah', 'penurunan', 
-        'gagal', 'kerugian', 'ambles', 'terpuruk', 'koreksi', 'nyangkut',
-        'tertahan', 'tertekan', 'melemah'
-    ]
     
     score = 0
     positive_news = []
     negative_news = []
     neutral_news = []
-    
-    for item in news_list:
-        # Extract title properly from mixed format
-        title = ""
-        if isinstance(item, dict):
-            content = item.get('content', item)
-            title = content.get('title', item.get('title', ""))
-            
-        if not title: 
-            continue
-            
-        title_lower = title.lower()
-        
-        # Calculate sentiment for this specific news
-        news_sentiment = 0
-        matched_pos = []
-        matched_neg = []
-        
-        for word in pos_keywords:
-            if word in title_lower:
-                news_sentiment += 1
-                matched_pos.append(word)
-        
-        for word in neg_keywords:
-            if word in title_lower:
-                news_sentiment -= 1
-                matched_neg.append(word)
+
+    titled = [(item, _news_title(item)) for item in news_list]
+    titled = [(item, title) for item, title in titled if title]
+    matches = _sentiment_matcher.find_batch(title for _, title in titled)
+    
+    for (item, title), title_matches in zip(titled, matches):
+        # Each keyword counts once per title, listed in keyword order
+        found = sorted({word: tag for tag, word in title_matches}.items(), key=lambda kv: _keyword_rank[kv[0]])
+        matched_pos = [word for word, tag in found if tag == 'positive']
+        matched_neg = [word for word, tag in found if tag == 'negative']
+        news_sentiment = len(matched_pos) - len(matched_neg)
         
         # Categorize this news
         news_item_tagged = {
             'title': title,
             'link': item.get('link', '#'),
             'publisher': item.get('publisher', 'Unknown'),
+            'source_count': item.get('source_count', 1),
+            'sources': item.get('sources', []),
             'sentiment_score': news_sentiment,
             'positive_keywords': matched_pos,
             'negative_keywords': matched_neg
@@ -403,25 +418,115 @@ def analyze_fundamental_quality(info):
         "reasons": reasons
     }
 
+# ── Analysis Bundle Cache ────────────────────────────────────
+ANALYSIS_INFO_TTL = 6 * 3600   # Fundamental & rekomendasi analis: berjam-jam
+ANALYSIS_NEWS_TTL = 600        # Berita multi-sumber: 10 menit
+ANALYSIS_INTRADAY_TTL = 300    # Bar harian yang masih terbentuk selama sesi bursa
+NEWS_SOURCE_TIMEOUT = 4.0      # Batas waktu per sumber berita (detik)
+NEWS_TOTAL_BUDGET = 6.0        # Batas waktu seluruh agregasi berita (detik)
+WIB = datetime.timezone(datetime.timedelta(hours=7))
+IDX_SESSION_OPEN = datetime.time(9, 0)
+IDX_SESSION_CLOSE = datetime.time(16, 30)  # Setelah pre-closing & penyesuaian bar harian
+# Entry menyimpan (expires_at, value); TTL cache hanya batas atas (libur akhir pekan)
+_bundle_cache = TTLCache(ttl=4 * 24 * 3600, max_entries=512)
+
+
+def _next_bar_expiry(now):
+    """Waktu (epoch) saat bar harian berikutnya bisa berubah.
+
+    Selama sesi bursa bar hari ini masih terbentuk, jadi riwayat hanya disimpan
+    ANALYSIS_INTRADAY_TTL detik; di luar sesi riwayat valid sampai sesi berikutnya dibuka.
+    """
+    local = datetime.datetime.fromtimestamp(now, WIB)
+    is_weekday = local.weekday() < 5
+    if is_weekday and IDX_SESSION_OPEN <= local.time() < IDX_SESSION_CLOSE:
+        return now + ANALYSIS_INTRADAY_TTL
+    day = local.date()
+    if not is_weekday or local.time() >= IDX_SESSION_CLOSE:
+        day += datetime.timedelta(days=1)
+    while day.weekday() >= 5:
+        day += datetime.timedelta(days=1)
+    return datetime.datetime.combine(day, IDX_SESSION_OPEN, WIB).timestamp()
+
+
+def _cached_component(component, ticker_symbol, loader, expires_at, cacheable):
+    """Ambil satu komponen bundle dari cache, atau muat sekali (single-flight) lalu simpan."""
+    key = (component, ticker_symbol)
+    entry = _bundle_cache.get(key)
+    if entry is not None and time.time() < entry[0]:
+        return entry[1]
+    value = yahoo_flight.do(key, loader)
+    if cacheable(value):
+        _bundle_cache.set(key, (expires_at(time.time()), value))
+    return value
+
+
+def _load_info(ticker, ticker_symbol):
+    info = snapshot_cache.get(ticker_symbol)
+    if not info:
+        info = ticker.info
+        if info and len(info) > 1:
+            snapshot_cache.put(ticker_symbol, info)
+    return info
+
+
+def _collect_news(ticker, symbol):
+    """Gabungkan berita dari yfinance dan seluruh sumber RSS secara paralel.
+
+    Tiap sumber punya batas waktu sendiri dan seluruh agregasi dibatasi
+    NEWS_TOTAL_BUDGET detik. Returns (news, status per sumber).
+    """
+    sources = [
+        NewsSource('Yahoo Finance', lambda: ticker.news),                 # Source A: yFinance (Original API)
+        NewsSource('Google News', lambda: get_google_news_rss(symbol),    # Source B: Multi-query
+                   timeout=NEWS_TOTAL_BUDGET),
+        NewsSource('KabarBursa', lambda: get_kabarbursa_news(symbol)),
+        NewsSource('Kontan', lambda: get_kontan_news(symbol)),
+        NewsSource('CNBC Indonesia', lambda: get_cnbc_news(symbol)),
+        NewsSource('Bisnis.com', lambda: get_bisnis_news(symbol)),
+        NewsSource('Detik Finance', lambda: get_detik_finance_news(symbol)),
+        NewsSource('IDX Channel', lambda: get_idx_channel_news(symbol)),
+        NewsSource('Investing.com ID', lambda: get_investing_indonesia_news(symbol)),
+        NewsSource('Indeks Berita', lambda: news_index.headlines(symbol)),  # Feed umum, sudah ditandai ticker
+    ]
+    news_index.ensure_fresh()
+    news, status = aggregate_news(sources, total_budget=NEWS_TOTAL_BUDGET, source_timeout=NEWS_SOURCE_TIMEOUT)
+    # Berita yang sama dari beberapa sumber (link sama / judul mirip) jadi satu kartu
+    return collapse_near_duplicates(news, title_of=_news_title), status
+
+
+def get_price_history(ticker_symbol):
+    """Riwayat harga harian 5 tahun, di-cache sampai bar berikutnya (dipakai juga halaman lain)."""
+    return _cached_component(
+        'history', ticker_symbol, lambda: bar_store.get_history(ticker_symbol, "5y"),
+        _next_bar_expiry, lambda h: h is not None and not h.empty,
+    )
+
+
 def get_stock_data(symbol):
     """
     Mengambil data lengkap saham: History, Info Fundamental, News (Multi-Source), dan Analisa.
+    Tiap komponen di-cache dengan TTL sendiri (riwayat sampai bar berikutnya, fundamental
+    berjam-jam, berita beberapa menit) dan permintaan bersamaan digabung menjadi satu fetch.
     """
     try:
         ticker_symbol = f"{symbol}.JK" if not symbol.endswith(".JK") and not symbol.startswith("^") else symbol
         
-        # 1. Fetch Ticker Object
+        # 1. Ticker Object (tanpa request jaringan)
         ticker = yf.Ticker(ticker_symbol)
         
         # 2. Fetch History (5 Tahun terakhir untuk teknikal & seasonality)
-        history = ticker.history(period="5y")
+        history = get_price_history(ticker_symbol)
         if history.empty:
             st.toast(f"⚠️ Peringatan: Data riwayat harga {ticker_symbol} kosong atau gagal dimuat!", icon="⚠️")
         
         # 3. Fetch Info (Fundamental)
         info = {}
         try:
-            info = ticker.info
+            info = _cached_component(
+                'info', ticker_symbol, lambda: _load_info(ticker, ticker_symbol),
+                lambda now: now + ANALYSIS_INFO_TTL, lambda i: bool(i) and len(i) > 1,
+            )
             if not info or len(info) == 0:
                 st.toast(f"⚠️ Peringatan: Data info fundamental {ticker_symbol} tidak ditemukan!", icon="⚠️")
         except Exception:
@@ -431,60 +536,18 @@ def get_stock_data(symbol):
         # 5. Fetch Analyst Recommendations
         recommendations = None
         try:
-            recommendations = ticker.recommendations
+            recommendations = _cached_component(
+                'recommendations', ticker_symbol, lambda: ticker.recommendations,
+                lambda now: now + ANALYSIS_INFO_TTL, lambda r: r is not None,
+            )
         except Exception:
             pass
 
         # 4. Fetch News (Combined Sources - Maximum Coverage)
-        news = []
-        try:
-            # Source A: yFinance (Original API)
-            yf_news = ticker.news
-            if yf_news:
-                news.extend(yf_news)
-                
-            # Source B: Google News General (Multi-query)
-            g_news = get_google_news_rss(symbol)
-            if g_news:
-                news.extend(g_news)
-                
-            # Source C: KabarBursa
-            kb_news = get_kabarbursa_news(symbol)
-            if kb_news:
-                news.extend(kb_news)
-                
-            # Source D: Kontan
-            kt_news = get_kontan_news(symbol)
-            if kt_news:
-                news.extend(kt_news)
-                
-            # Source E: CNBC Indonesia
-            cnbc_news = get_cnbc_news(symbol)
-            if cnbc_news:
-                news.extend(cnbc_news)
-                
-            # Source F: Bisnis.com (NEW)
-            bisnis_news = get_bisnis_news(symbol)
-            if bisnis_news:
-                news.extend(bisnis_news)
-                
-            # Source G: Detik Finance (NEW)
-            detik_news = get_detik_finance_news(symbol)
-            if detik_news:
-                news.extend(detik_news)
-                
-            # Source H: IDX Channel (NEW)
-            idx_news = get_idx_channel_news(symbol)
-            if idx_news:
-                news.extend(idx_news)
-                
-            # Source I: Investing.com Indonesia (NEW)
-            inv_news = get_investing_indonesia_news(symbol)
-            if inv_news:
-                news.extend(inv_news)
-                
-        except Exception as e:
-            pass
+        news, news_status = _cached_component(
+            'news', ticker_symbol, lambda: _collect_news(ticker, symbol),
+            lambda now: now + ANALYSIS_NEWS_TTL, lambda n: bool(n[0]),  # Semua sumber gagal: jangan di-cache
+        )
             
         current_price = history['Close'].iloc[-1] if not history.empty else 0
         
@@ -496,6 +559,7 @@ def get_stock_data(symbol):
             "history": history,
             "info": info,
             "news": news,
+            "news_status": news_status,
             "recommendations": recommendations,
             "current_price": current_price,
             "ticker": ticker,
@@ -509,96 +573,12 @@ def get_stock_data(symbol):
         st.error(f"Error mengambil data: {e}")
         return None
 
-def get_technical_signals(history):
-    """
-    Calculate ADVANCED technical signals based on history.
-    Includes: RSI, MACD, EMA Trend, and Volume Analysis.
-    """
-    if len(history) < 50:
-        return {"signal": "NEUTRAL", "reason": ["Data historis kurang cukup untuk analisa akurat."]}
-    
-    # Data Preparation
-    close = history['Close']
-    
-    # 1. Moving Averages (Trend)
-    ema20 = close.ewm(span=20, adjust=False).mean().iloc[-1]
-    ma50 = close.rolling(window=50).mean().iloc[-1]
-    ma200 = close.rolling(window=200).mean().iloc[-1]
-    current = close.iloc[-1]
-    
-    # 2. RSI (Momentum)
-    delta = close.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs)).iloc[-1]
-    
-    # 3. MACD (Trend Reversal & Momentum)
-    exp12 = close.ewm(span=12, adjust=False).mean()
-    exp26 = close.ewm(span=26, adjust=False).mean()
-    macd = exp12 - exp26
-    signal_line = macd.ewm(span=9, adjust=False).mean()
-    
-    macd_val = macd.iloc[-1]
-    signal_val = signal_line.iloc[-1]
-    
-    # Scoring Logic (Weighted)
-    score = 0
-    reasons = []
-    
-    # A. Trend Filter (Long Term)
-    if current < ma200:
-        score -= 2
-        reasons.append("Bearish Jangka Panjang (Harga < MA200)")
-    else:
-        score += 1
-        reasons.append("Bullish Jangka Panjang (Harga > MA200)")
-
-    # B. Trend (Short Term)
-    if current > ema20:
-        score += 1
-        reasons.append("Bullish Jangka Pendek (Harga > EMA20)")
-    else:
-        score -= 1
-        reasons.append("Bearish Jangka Pendek (Harga < EMA20)")
-        
-    # C. MACD Code
-    if macd_val > signal_val:
-        score += 1
-        reasons.append("MACD Bullish Crossover (Momentum Positif)")
-    else:
-        score -= 1
-        reasons.append("MACD Bearish Crossover (Momentum Negatif)")
-        
-    # D. RSI (Overbought/Oversold Filter)
-    if rsi < 30:
-        score += 2
-        reasons.append(f"RSI Oversold ({rsi:.1f}) - Potensi Rebound Kuat")
-    elif rsi > 70:
-        score -= 2
-        reasons.append(f"RSI Overbought ({rsi:.1f}) - Rawan Koreksi")
-    elif 45 <= rsi <= 55:
-        reasons.append(f"RSI Netral ({rsi:.1f})")
-    
-    # Final Decision
-    # Max Score approx +5, Min approx -6
-    
-    if score >= 3:
-        return {"signal": "STRONG BUY", "color": "green", "reason": reasons}
-    elif score >= 1:
-        return {"signal": "BUY", "color": "lightgreen", "reason": reasons}
-    elif score <= -3:
-        return {"signal": "STRONG SELL", "color": "red", "reason": reasons}
-    elif score <= -1:
-        return {"signal": "SELL", "color": "orange", "reason": reasons}
-    else:
-        return {"signal": "NEUTRAL / WAIT", "color": "gray", "reason": reasons}
 
-def render_recommendations(rec_df, history):
+def render_recommendations(rec_df, history, symbol=None):
     st.markdown("### ⭐ Rekomendasi & Sinyal Multi-Timeframe")
     
     # Generate Multi-Timeframe Signals
-    timeframes = get_multi_timeframe_signals(history)
+    timeframes = get_multi_timeframe_signals(history, symbol)
     
     # Display as visually rich grid
     st.markdown("#### 🤖 Sinyal Teknikal (Bot) per Horizon Waktu")
@@ -660,6 +640,39 @@ def render_recommendations(rec_df, history):
     else:
         st.warning("Tidak ada data rekomendasi analis institusi untuk saham ini.")
 
+def render_backtest(history, symbol=None):
+    """Backtest sinyal multi-timeframe pada seluruh riwayat (fee broker & fraksi harga IDX)."""
+    st.markdown("#### 🧪 Backtest Sinyal Bot")
+    if history is None or len(history) < 50:
+        st.info("Data historis kurang untuk backtest.")
+        return
+
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        timeframe = st.selectbox("Horizon Sinyal", TIMEFRAME_LABELS, index=3, key="bt_tf")
+    with c2:
+        platform = st.selectbox("Broker (Fee)", list(PLATFORM_CONFIG.keys()), key="bt_platform")
+    with c3:
+        capital = st.number_input("Modal Awal (Rp)", min_value=1_000_000, value=DEFAULT_CAPITAL,
+                                  step=1_000_000, key="bt_capital")
+
+    signals = multi_timeframe_signal_series(history, symbol)
+    result = backtest_signals(history, signals[f"{timeframe} Sinyal"], platform=platform, capital=capital)
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Total P/L", f"Rp {format_rupiah(result['total_pl'])}", f"{result['return_pct']:+.2f}%")
+    m2.metric("Win Rate", f"{result['win_rate']:.1f}%", f"{result['num_trades']} trade")
+    m3.metric("Max Drawdown", f"{result['max_drawdown_pct']:.2f}%")
+    m4.metric("Buy & Hold", f"{result['buy_hold_pct']:+.2f}%")
+    st.caption("Beli saat sinyal BUY/STRONG BUY, jual saat SELL/WEAK SELL/STRONG SELL; eksekusi di harga "
+               "open bar berikutnya, dibulatkan ke fraksi harga, dalam lot utuh.")
+
+    st.line_chart(result['equity'])
+    if not result['trades'].empty:
+        st.dataframe(result['trades'].style.format({'Harga Beli': '{:,.0f}', 'Harga Jual': '{:,.0f}',
+                                                    'P/L (Rp)': '{:,.0f}', 'Return %': '{:+.2f}%'}),
+                     use_container_width=True, hide_index=True)
+
 def render_signal_card(label, signal, color, reason):
     """Helper to render a single signal card."""
     color_map = {
@@ -676,298 +689,6 @@ def render_signal_card(label, signal, color, reason):
     </div>
     """, unsafe_allow_html=True)
 
-def get_multi_timeframe_signals(history):
-    """
-    PROFESSIONAL-GRADE Multi-Timeframe Signal Generator.
-    Based on Institutional Trading Rules:
-    1. Confluence Required (Trend + Momentum + Volume must align)
-    2. ADX Trend Strength Filter (No trading in sideways)
-    3. Volatility Filter (ATR-based)
-    4. Strict RSI zones (<25 oversold, >75 overbought)
-    5. Volume Spike Confirmation
-    """
-    if history is None or history.empty:
-        return [
-            {"label": "1 Hari", "signal": "UNKNOWN", "color": "gray", "reason": "Data kosong"},
-            {"label": "3 Hari", "signal": "UNKNOWN", "color": "gray", "reason": "Data kosong"},
-            {"label": "1 Minggu", "signal": "UNKNOWN", "color": "gray", "reason": "Data kosong"},
-            {"label": "1 Bulan", "signal": "UNKNOWN", "color": "gray", "reason": "Data kosong"},
-            {"label": "2 Bulan", "signal": "UNKNOWN", "color": "gray", "reason": "Data kosong"},
-            {"label": "3 Bulan", "signal": "UNKNOWN", "color": "gray", "reason": "Data kosong"}
-        ]
-        
-    results = []
-    close = history['Close']
-    high = history['High']
-    low = history['Low']
-    volume = history['Volume']
-    current = close.iloc[-1]
-    n = len(close)
-    
-    # === HELPER FUNCTIONS ===
-    def calc_rsi(series, window=14):
-        delta = series.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-        rs = gain / loss
-        rsi_val = (100 - (100 / (1 + rs))).iloc[-1]
-        return rsi_val if not pd.isna(rsi_val) else 50
-    
-    def calc_atr(high, low, close, window=14):
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        return tr.rolling(window=window).mean().iloc[-1]
-    
-    def calc_adx(high, low, close, window=14):
-        # Simplified ADX
-        plus_dm = high.diff()
-        minus_dm = -low.diff()
-        
-        pos_dm = plus_dm.copy()
-        neg_dm = minus_dm.copy()
-        
-        pos_dm[(plus_dm < 0) | (plus_dm <= minus_dm)] = 0
-        neg_dm[(minus_dm < 0) | (minus_dm <= plus_dm)] = 0
-        
-        plus_dm = pos_dm
-        minus_dm = neg_dm
-        
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        
-        atr = tr.rolling(window=window).mean()
-        plus_di = 100 * (plus_dm.rolling(window=window).mean() / atr)
-        minus_di = 100 * (minus_dm.rolling(window=window).mean() / atr)
-        
-        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di + 0.0001)
-        adx = dx.rolling(window=window).mean().iloc[-1]
-        return adx if not pd.isna(adx) else 20
-
-    # === PRECOMPUTE COMMON INDICATORS ===
-    ema5 = close.ewm(span=5, adjust=False).mean().iloc[-1]
-    ema10 = close.ewm(span=10, adjust=False).mean().iloc[-1]
-    ema20 = close.ewm(span=20, adjust=False).mean().iloc[-1]
-    ma50 = close.rolling(window=50).mean().iloc[-1] if n >= 50 else ema20
-    ma100 = close.rolling(window=100).mean().iloc[-1] if n >= 100 else ma50
-    ma200 = close.rolling(window=200).mean().iloc[-1] if n >= 200 else ma100
-    
-    adx = calc_adx(high, low, close, 14)
-    atr = calc_atr(high, low, close, 14)
-    atr_pct = (atr / current) * 100  # ATR as % of price
-    
-    vol_avg = volume.rolling(window=20).mean().iloc[-1]
-    vol_today = volume.iloc[-1]
-    vol_spike = vol_today > vol_avg * 1.3
-    
-    # MACD
-    exp12 = close.ewm(span=12, adjust=False).mean()
-    exp26 = close.ewm(span=26, adjust=False).mean()
-    macd = exp12 - exp26
-    signal_line = macd.ewm(span=9, adjust=False).mean()
-    macd_val = macd.iloc[-1]
-    signal_val = signal_line.iloc[-1]
-    macd_bullish = macd_val > signal_val
-    
-    # === MACRO GATE (Must Pass for ANY Buy) ===
-    macro_bullish = current > ma200  # Long-term uptrend
-    macro_bearish = current < ma200
-    trend_strong = adx > 25  # No sideways trading
-    
-    # === TIMEFRAME SIGNALS ===
-    
-    # --- 1 DAY (Scalping) ---
-    rsi_7 = calc_rsi(close, 7)
-    score_1d = 0
-    reason_1d = []
-    
-    # Gate 1: Must be in trend
-    if not trend_strong:
-        reason_1d.append("ADX < 25 (Sideways)")
-    else:
-        if current > ema5:
-            score_1d += 1
-            reason_1d.append("Above EMA5")
-        else:
-            score_1d -= 1
-            reason_1d.append("Below EMA5")
-        
-        if rsi_7 < 25:
-            score_1d += 2
-            reason_1d.append("RSI < 25 (Oversold)")
-        elif rsi_7 > 75:
-            score_1d -= 2
-            reason_1d.append("RSI > 75 (Overbought)")
-        
-        if vol_spike:
-            score_1d += 1
-            reason_1d.append("Volume Spike")
-            
-    results.append(get_strict_signal(score_1d, "1 Hari", reason_1d, trend_strong))
-    
-    # --- 3 DAYS (Swing Short) ---
-    rsi_10 = calc_rsi(close, 10)
-    score_3d = 0
-    reason_3d = []
-    
-    if not trend_strong:
-        reason_3d.append("No Trend (ADX < 25)")
-    else:
-        if current > ema10: 
-            score_3d += 1
-            reason_3d.append("Above EMA10")
-        else: 
-            score_3d -= 1
-            reason_3d.append("Below EMA10")
-        
-        if rsi_10 < 30: 
-            score_3d += 1
-            reason_3d.append("RSI Oversold")
-        elif rsi_10 > 70: 
-            score_3d -= 1
-            reason_3d.append("RSI Overbought")
-            
-        if macd_bullish:
-            score_3d += 1
-            reason_3d.append("MACD Bullish")
-        else:
-            score_3d -= 1
-            reason_3d.append("MACD Bearish")
-    
-    results.append(get_strict_signal(score_3d, "3 Hari", reason_3d, trend_strong))
-    
-    # --- 1 WEEK ---
-    rsi_14 = calc_rsi(close, 14)
-    score_1w = 0
-    reason_1w = []
-    
-    if current > ema20: 
-        score_1w += 1
-        reason_1w.append("Above EMA20")
-    else: 
-        score_1w -= 1
-        reason_1w.append("Below EMA20")
-    
-    if rsi_14 < 25: 
-        score_1w += 2
-        reason_1w.append("RSI Deep Oversold")
-    elif rsi_14 > 75: 
-        score_1w -= 2
-        reason_1w.append("RSI Overbought")
-    
-    if macd_bullish and trend_strong:
-        score_1w += 1
-        reason_1w.append("MACD+ADX Confirm")
-    elif not macd_bullish:
-        score_1w -= 1
-        reason_1w.append("MACD Bearish")
-    
-    results.append(get_strict_signal(score_1w, "1 Minggu", reason_1w, trend_strong))
-    
-    # --- 1 MONTH ---
-    score_1m = 0
-    reason_1m = []
-    
-    # Must be in primary uptrend for Buy
-    if current > ma50:
-        score_1m += 1
-        reason_1m.append("Above MA50")
-    else:
-        score_1m -= 2  # Stricter penalty
-        reason_1m.append("Below MA50 (No Buy)")
-    
-    if macd_bullish:
-        score_1m += 1
-        reason_1m.append("MACD Bullish")
-    else:
-        score_1m -= 1
-        reason_1m.append("MACD Bearish")
-    
-    if vol_spike:
-        score_1m += 1
-        reason_1m.append("Vol Confirm")
-    
-    results.append(get_strict_signal(score_1m, "1 Bulan", reason_1m, macro_bullish))
-    
-    # --- 2 MONTHS ---
-    score_2m = 0
-    reason_2m = []
-    
-    if current > ma100:
-        score_2m += 1
-        reason_2m.append("Above MA100")
-    else:
-        score_2m -= 2
-        reason_2m.append("Below MA100")
-    
-    if ma50 > ma100:
-        score_2m += 1
-        reason_2m.append("MA50 > MA100")
-    else:
-        score_2m -= 1
-        reason_2m.append("MA50 < MA100")
-    
-    results.append(get_strict_signal(score_2m, "2 Bulan", reason_2m, macro_bullish))
-    
-    # --- 3 MONTHS (Investor Grade) ---
-    score_3m = 0
-    reason_3m = []
-    
-    # STRICT: Must be above MA200 to consider buy
-    if current > ma200:
-        score_3m += 2
-        reason_3m.append("Above MA200")
-    else:
-        score_3m -= 3  # Very strict
-        reason_3m.append("Below MA200 (No Buy Zone)")
-    
-    # Golden/Death Cross
-    if ma50 > ma200:
-        score_3m += 1
-        reason_3m.append("Golden Cross Active")
-    else:
-        score_3m -= 2
-        reason_3m.append("Death Cross Active")
-    
-    # RSI should not be overbought for long-term entry
-    if rsi_14 > 70:
-        score_3m -= 1
-        reason_3m.append("RSI High (Wait)")
-    
-    results.append(get_strict_signal(score_3m, "3 Bulan", reason_3m, macro_bullish))
-    
-    return results
-
-def get_strict_signal(score, label, reasons, gate_passed):
-    """
-    STRICT Signal Converter.
-    - Gate must pass for BUY signals
-    - Higher thresholds required
-    """
-    reason_str = " | ".join(reasons[:2]) if reasons else "-"  # Show max 2 reasons
-    
-    # If primary gate (trend/macro) failed, cap signal at NEUTRAL
-    if not gate_passed and score > 0:
-        return {"label": label, "signal": "WAIT", "color": "gray", "reason": "Gate Failed: " + reason_str}
-    
-    # STRICT Thresholds
-    if score >= 3:
-        return {"label": label, "signal": "STRONG BUY", "color": "green", "reason": reason_str}
-    elif score >= 2:
-        return {"label": label, "signal": "BUY", "color": "lightgreen", "reason": reason_str}
-    elif score <= -3:
-        return {"label": label, "signal": "STRONG SELL", "color": "red", "reason": reason_str}
-    elif score <= -2:
-        return {"label": label, "signal": "SELL", "color": "orange", "reason": reason_str}
-    elif score <= -1:
-        return {"label": label, "signal": "WEAK SELL", "color": "orange", "reason": reason_str}
-    elif score == 1:
-        return {"label": label, "signal": "WAIT (Confirm)", "color": "gray", "reason": reason_str}
-    else:
-        return {"label": label, "signal": "NO TRADE", "color": "gray", "reason": reason_str}
 
 def render_fundamental(info):
     st.markdown("### 🏢 Profil & Fundamental")
@@ -1096,13 +817,23 @@ def render_technical(history, symbol):
         st.write("📈 Rata-rata Return per Bulan (Seasonality)")
         st.bar_chart(avg_seasonality)
 
-def render_news(news, sentiment_data=None):
+def render_news(news, sentiment_data=None, source_status=None):
     """Render news with sentiment indicators"""
     st.markdown("### 📰 Berita Terkini")
     
     # Show news count
     if news and len(news) > 0:
-        st.caption(f"📊 Ditemukan **{len(news)} artikel** dari berbagai sumber")
+        total_articles = sum(item.get('source_count', 1) if isinstance(item, dict) else 1 for item in news)
+        if total_articles > len(news):
+            st.caption(f"📊 Ditemukan **{len(news)} berita unik** dari {total_articles} artikel berbagai sumber")
+        else:
+            st.caption(f"📊 Ditemukan **{len(news)} artikel** dari berbagai sumber")
+
+    # Sources that missed their deadline or failed
+    if source_status:
+        missed = [f"{name} ({s['status']})" for name, s in source_status.items() if s['status'] in ('timeout', 'error')]
+        if missed:
+            st.caption(f"⏱️ Sumber dilewati: {', '.join(missed)}")
     
     if not news or len(news) == 0:
         st.info("Belum ada berita terbaru yang ditemukan oleh sistem.")
@@ -1163,6 +894,9 @@ def render_news_card(item, show_sentiment=False):
     title = html_module.escape(str(item.get('title', 'No Title')))
     link = item.get('link', '#')
     publisher = html_module.escape(str(item.get('publisher', 'Unknown')))
+    source_count = item.get('source_count', 1)
+    if source_count > 1:
+        publisher += f" <span style='opacity: 0.8;'>+{source_count - 1} sumber lain</span>"
     
     # Security: Only allow http/https links (prevent javascript: XSS)
     if not isinstance(link, str) or not link.startswith(('http://', 'https://', '#')):
@@ -1245,7 +979,7 @@ def render_trade_plan_integrated(current_price):
         st.toast(f"🚨 Kesalahan kalkulasi Trade Planner: {e}", icon="🚨")
         st.error(f"Terjadi kesalahan kalkulasi: {e}")
 
-def render_smart_summary(analysis_data, history):
+def render_smart_summary(analysis_data, history, symbol=None):
     """
     Render consolidated AI Analysis summary.
     """
@@ -1257,9 +991,8 @@ def render_smart_summary(analysis_data, history):
     # Simple Technical Summary (Short Term)
     # Re-use tech signal logic but just get 1-label summary
     tech_score = 0
-    close = history['Close']
-    ma50 = close.rolling(window=50).mean().iloc[-1]
-    current = close.iloc[-1]
+    ma50 = get_indicators(history, symbol).last('sma', 50)
+    current = history['Close'].iloc[-1]
     if current > ma50: tech_score = 1
     else: tech_score = -1
     
@@ -1347,7 +1080,7 @@ def analysis_dashboard_page():
         
         # Show Smart Summary First
         if 'analysis' in data:
-            render_smart_summary(data['analysis'], data['history'])
+            render_smart_summary(data['analysis'], data['history'], curr_symbol)
         
         st.markdown("---")
         
@@ -1361,11 +1094,13 @@ def analysis_dashboard_page():
             render_technical(data['history'], curr_symbol)
         
         with tab_rec:
-            render_recommendations(data['recommendations'], data['history'])
+            render_recommendations(data['recommendations'], data['history'], curr_symbol)
+            st.markdown("---")
+            render_backtest(data['history'], curr_symbol)
             
         with tab_news:
             sentiment_data = data.get('analysis', {}).get('sentiment', None)
-            render_news(data['news'], sentiment_data)
+            render_news(data['news'], sentiment_data, data.get('news_status'))
             
         with tab_plan:
             render_trade_plan_integrated(data['current_price'])
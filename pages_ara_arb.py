@@ -2,7 +2,8 @@ from typing import Dict, List, Tuple
 import streamlit as st
 
 from config import PLATFORM_CONFIG
-from utils import format_rupiah, get_tick_size, get_ara_arb_percentage, round_price_to_tick
+from price_ladder import price_ladder
+from utils import format_rupiah
 
 
 def calculate_preset_ara_beruntun(harga_dasar: float, is_acceleration: bool = False) -> List[Dict]:
@@ -44,25 +45,12 @@ def calculate_preset_ara_beruntun(harga_dasar: float, is_acceleration: bool = Fa
                 'text_color': event.get('text_color', 'var(--text-color)')
             })
         else:
-            board_type = 'acceleration' if is_acceleration else 'regular'
-            
+            # FCA selalu 10% (tanpa memandang papan) = aturan ARA papan akselerasi
             if event["type"] == "fca":
-                pct = 0.10 # FCA is always 10% auto reject limit, regardless of board
-            else:
-                if is_acceleration and harga_sekarang <= 10:
-                    pct = 0 # Handled manually
-                else:
-                    pct = get_ara_arb_percentage(harga_sekarang, board_type)
-                    
-            if event["type"] != "fca" and is_acceleration and harga_sekarang <= 10:
-                harga_baru = harga_sekarang + 1
+                board_type = 'acceleration'
             else:
-                limit_price = harga_sekarang * (1 + pct)
-                tick = get_tick_size(limit_price)
-                harga_baru = round_price_to_tick(limit_price, tick, 'floor')
-                
-            if harga_baru <= harga_sekarang:
-                harga_baru = harga_sekarang + get_tick_size(harga_sekarang)
+                board_type = 'acceleration' if is_acceleration else 'regular'
+            harga_baru, _ = price_ladder.limits(harga_sekarang, board_type)
                 
             persentase_kumulatif = ((harga_baru - harga_dasar) / harga_dasar) * 100 if harga_dasar > 0 else 0
             
@@ -79,78 +67,27 @@ def calculate_preset_ara_beruntun(harga_dasar: float, is_acceleration: bool = Fa
             
     return sequence
 def calculate_ara_arb_sequence(harga_dasar: float, is_acceleration: bool = False, max_steps: int = 10) -> Tuple[List[Dict], List[Dict]]:
-    # Calculate ARA sequence
-    ara_sequence = []
-    harga_ara_sekarang = harga_dasar
-    for i in range(max_steps):
-        board_type = 'acceleration' if is_acceleration else 'regular'
-        
-        # Acceleration Board Logic for Low Prices
-        if is_acceleration and harga_ara_sekarang <= 10:
-             harga_ara_baru = harga_ara_sekarang + 1
-        else:
-            pct = get_ara_arb_percentage(harga_ara_sekarang, board_type)
-            limit_price = harga_ara_sekarang * (1 + pct)
-            tick = get_tick_size(limit_price)
-            harga_ara_baru = round_price_to_tick(limit_price, tick, 'floor')
-            
-        if harga_ara_baru <= harga_ara_sekarang:
-             harga_ara_baru = harga_ara_sekarang + get_tick_size(harga_ara_sekarang)
-
-        perubahan = harga_ara_baru - harga_ara_sekarang
-        persentase_perubahan = (perubahan / harga_ara_sekarang) * 100 if harga_ara_sekarang > 0 else 0
-        persentase_kumulatif = ((harga_ara_baru - harga_dasar) / harga_dasar) * 100 if harga_dasar > 0 else 0
-        
-        ara_sequence.append({
-            'step': i + 1,
-            'harga': harga_ara_baru, 
-            'perubahan': perubahan, 
-            'persentase_perubahan': persentase_perubahan, 
-            'persentase_kumulatif': persentase_kumulatif, 
-            'tipe': 'ara'
-        })
-        harga_ara_sekarang = harga_ara_baru
-
-    # Calculate ARB sequence
-    arb_sequence = []
-    harga_arb_sekarang = harga_dasar
-    for i in range(max_steps):
-        board_type = 'acceleration' if is_acceleration else 'regular'
-        
-        # Acceleration Board Logic for Low Prices
-        if is_acceleration and harga_arb_sekarang <= 10:
-             harga_arb_baru = max(1, harga_arb_sekarang - 1)
-        else:
-            # ARB for regular board: flat 15% (BEI regulation effective 8 April 2025)
-            # ARB for acceleration board: 10% (same as ARA)
-            if not is_acceleration:
-                pct = 0.15
-            else:
-                pct = get_ara_arb_percentage(harga_arb_sekarang, board_type)
-                
-            limit_price = harga_arb_sekarang * (1 - pct)
-            tick = get_tick_size(limit_price)
-            harga_arb_baru = round_price_to_tick(limit_price, tick, 'ceil')
-        
-        if harga_arb_baru < 1:
-            harga_arb_baru = 1
-
-        if harga_arb_baru >= harga_arb_sekarang:
-             break  # Price stalled — no further meaningful ARB steps
-
-        perubahan = harga_arb_baru - harga_arb_sekarang
-        persentase_perubahan = (perubahan / harga_arb_sekarang) * 100 if harga_arb_sekarang > 0 else 0
-        persentase_kumulatif = ((harga_arb_baru - harga_dasar) / harga_dasar) * 100 if harga_dasar > 0 else 0
-        
-        arb_sequence.append({
-            'step': i + 1,
-            'harga': harga_arb_baru, 
-            'perubahan': perubahan, 
-            'persentase_perubahan': persentase_perubahan, 
-            'persentase_kumulatif': persentase_kumulatif, 
-            'tipe': 'arb'
-        })
-        harga_arb_sekarang = harga_arb_baru
+    board_type = 'acceleration' if is_acceleration else 'regular'
+    # Harga per langkah diambil dari tabel fraksi (price_ladder), tanpa hitung ulang persen & tick
+    sequences = {}
+    for tipe in ('ara', 'arb'):
+        sequence = []
+        harga_sekarang = harga_dasar
+        for i, harga_baru in enumerate(price_ladder.sequence(harga_dasar, board_type, max_steps, tipe)):
+            perubahan = harga_baru - harga_sekarang
+            persentase_perubahan = (perubahan / harga_sekarang) * 100 if harga_sekarang > 0 else 0
+            persentase_kumulatif = ((harga_baru - harga_dasar) / harga_dasar) * 100 if harga_dasar > 0 else 0
+            sequence.append({
+                'step': i + 1,
+                'harga': harga_baru,
+                'perubahan': perubahan,
+                'persentase_perubahan': persentase_perubahan,
+                'persentase_kumulatif': persentase_kumulatif,
+                'tipe': tipe
+            })
+            harga_sekarang = harga_baru
+        sequences[tipe] = sequence
+    ara_sequence, arb_sequence = sequences['ara'], sequences['arb']
 
     return ara_sequence, arb_sequence
 
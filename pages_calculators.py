@@ -3,7 +3,8 @@ import pandas as pd
 import streamlit as st
 
 from config import PLATFORM_CONFIG, FRACSI_HARGA_DATA
-from utils import format_rupiah, format_percent, format_csv_indonesia, get_tick_size, get_ara_arb_percentage, round_price_to_tick
+from price_ladder import price_ladder
+from utils import format_rupiah, format_percent, format_csv_indonesia
 import math
 
 
@@ -118,18 +119,8 @@ def haka_vs_limit_calculator(title: str, fee_beli: float) -> None:
         modal = st.number_input("Total Modal (Buying Power)", min_value=100000, step=100000, value=1000000)
         harga_input = st.number_input("Harga Saham Saat Ini (Offer)", min_value=50, step=1, value=200)
 
-    # Calculate ARA logic locally to determine safe HAKA price
-    if is_acceleration and harga_input <= 10:
-        harga_ara = harga_input + 1
-    else:
-        pct = get_ara_arb_percentage(harga_input, board_type)
-        limit_price = harga_input * (1 + pct)
-        tick = get_tick_size(limit_price)
-        harga_ara = round_price_to_tick(limit_price, tick, 'floor')
-        
-        # Ensure ARA is at least 1 tick above if price didn't move
-        if harga_ara <= harga_input:
-             harga_ara = harga_input + get_tick_size(harga_input)
+    # Harga ARA (aman untuk HAKA) langsung dari tabel fraksi harga
+    harga_ara, _ = price_ladder.limits(harga_input, board_type)
 
     if st.button("Hitung Perbandingan", type="primary", use_container_width=True):
         # 1. Limit Order Calculation
@@ -1,57 +1,143 @@
+import numpy as np
 import pandas as pd
 import streamlit as st
 
-from utils import format_rupiah, format_csv_indonesia
+from compound_engine import (MC_DEFAULT_PATHS, MC_MAX_PATHS, bootstrap_sampler, compound_frame, compound_grid,
+                             distribution_sampler, monthly_log_returns, simulate_wealth, yearly_summary)
+from utils import format_rupiah, format_csv_indonesia, sanitize_stock_symbol
+
+try:
+    import plotly.graph_objects as go
+    PLOTLY_AVAILABLE = True
+except ImportError:
+    PLOTLY_AVAILABLE = False
+
+MC_PATH_OPTIONS = [10_000, 25_000, 50_000, MC_MAX_PATHS]
+MC_SOURCES = ['Distribusi Normal', 'Distribusi Student-t (ekor tebal)', 'Bootstrap Riwayat Saham']
 
 
 def calculate_compound_interest(firstm: float, rate: float, years: float, additional_investment: float = 0) -> pd.DataFrame:
-    data = []
-    # Security: Cap years to prevent DoS (max 100 years = 1200 iterations)
-    years = max(0.1, min(years, 100))
-    total_months = int(years * 12)
-    amount = firstm
-    for month in range(1, total_months + 1):
-        amount += additional_investment
-        amount *= (1 + rate / 100 / 12)
-        amount = round(amount, 2)
-        year = (month - 1) // 12 + 1
-        data.append({'Year': year, 'Month': month, 'Amount': amount})
-    return pd.DataFrame(data)
+    # Security: years dibatasi 0.1 - 100 (maks 1200 bulan) di compound_engine
+    # Pembulatan per bulan ke sen dipertahankan (round_steps=True)
+    return compound_frame(firstm, rate, years, additional_investment, round_steps=True)
 
 
-def compound_interest_page() -> None:
-    st.info('Bunga-berbunga atau compound interest adalah jenis bunga yang dihitung tidak hanya dari jumlah pokok awal, tetapi juga dari bunga yang sudah diperoleh.')
+def render_sensitivity(firstm: float, rate: float, years: float, additional_investment: float) -> None:
+    """Heatmap nilai akhir untuk rentang bunga x lama investasi (grid skenario compound_engine)."""
+    rates = np.round(np.arange(max(rate - 10, 0), rate + 10.01, 2.5), 2)
+    horizons = np.unique(np.clip(np.round(np.linspace(1, max(years, 1) * 2, 10)), 1, 100))
+    grid = compound_grid(firstm, rates, horizons, additional_investment)
+    table = pd.DataFrame(grid['balance'][:, :, 0, 0], index=[f"{r:.1f}%" for r in rates],
+                         columns=[f"{int(y)} Th" for y in horizons])
+    table.index.name = "Bunga / Tahun"
+    st.caption("Nilai akhir portfolio (tanpa pembulatan per bulan) untuk berbagai tingkat bunga dan lama investasi.")
+    styled = table.style.format(lambda x: format_rupiah(x))
+    try:
+        st.dataframe(styled.background_gradient(cmap='RdYlGn', axis=None), use_container_width=True)
+    except ImportError:
+        # Fallback if matplotlib is missing
+        st.dataframe(styled, use_container_width=True)
 
-    col1, _ = st.columns(2, gap="small")
+
+def _fan_chart(bands: pd.DataFrame) -> None:
+    """Fan chart persentil saldo per tahun (P5-P95, P25-P75, median) vs total setor."""
+    x = bands['Bulan'] / 12
+    if not PLOTLY_AVAILABLE:
+        st.line_chart(bands.set_index(x.rename('Tahun')).drop(columns='Bulan'))
+        return
+    fig = go.Figure()
+    for low, high, color in (('P5', 'P95', 'rgba(59, 130, 246, 0.15)'), ('P25', 'P75', 'rgba(59, 130, 246, 0.35)')):
+        fig.add_trace(go.Scatter(x=x, y=bands[high], mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=x, y=bands[low], mode='lines', line=dict(width=0), fill='tonexty',
+                                 fillcolor=color, name=f"{low}-{high}"))
+    fig.add_trace(go.Scatter(x=x, y=bands['P50'], mode='lines', line=dict(color='#3b82f6', width=3), name='Median'))
+    fig.add_trace(go.Scatter(x=x, y=bands['Total Setor'], mode='lines', line=dict(color='#9ca3af', dash='dash'),
+                             name='Total Setor'))
+    fig.update_layout(title='Proyeksi Kekayaan Monte Carlo', xaxis_title='Tahun', yaxis_title='Saldo (IDR)',
+                      height=450, template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def render_monte_carlo(firstm: float, years: float, additional_investment: float) -> None:
+    """Simulasi Monte Carlo: return bulanan acak (distribusi) atau bootstrap dari riwayat saham."""
+    col1, col2 = st.columns(2, gap="small")
     with col1:
-        st.markdown("""
-        <div style='margin-bottom: 16px;'>
-            <h3 style='color: var(--text-color); margin-bottom: 12px;'>Input Investasi</h3>
-        </div>
-        """, unsafe_allow_html=True)
-        firstm = st.number_input('💰 Masukkan nilai awal investasi', step=1000000, format="%d", value=1000000)
-        rate = st.number_input('📈 Masukkan tingkat bunga per tahun (%)', step=0.1, format="%.2f", value=10.0)
-        years = st.number_input('🗓️ Masukkan jumlah tahun (misal: 5.5 untuk 5 tahun 5 bulan)', step=0.1, format="%.1f", value=5.0)
-        additional_investment = st.number_input('➕ Masukkan tambahan investasi per bulan', step=1000000, format="%d", value=1000000)
+        source = st.radio('Sumber return bulanan', MC_SOURCES, key='mc_source')
+        n_paths = st.select_slider('Jumlah simulasi', options=MC_PATH_OPTIONS, value=MC_DEFAULT_PATHS,
+                                   format_func=lambda n: f"{n:,}".replace(',', '.'), key='mc_paths')
+    with col2:
+        if source == MC_SOURCES[2]:
+            symbol = st.text_input('Kode saham (riwayat 5 tahun)', value='BBCA', key='mc_symbol')
+        else:
+            mean = st.number_input('Ekspektasi return per tahun (%)', step=0.5, format="%.2f", value=10.0, key='mc_mean')
+            vol = st.number_input('Volatilitas per tahun (%)', min_value=0.0, max_value=200.0, step=1.0,
+                                  format="%.1f", value=20.0, key='mc_vol')
 
-    if st.button('Hitung', key='calculate_compound'):
-        with st.spinner('Menghitung bunga berbunga...'):
-            try:
-                if firstm == 0 and rate == 0:
-                    st.toast("⚠️ Input awal dan tingkat bunga 0!", icon="⚠️")
-                    st.error("Silakan masukkan nilai investasi awal dan tingkat bunga untuk menghitung compound interest")
+    params = (source, n_paths, firstm, years, additional_investment,
+              symbol if source == MC_SOURCES[2] else (mean, vol))
+    if st.button('Jalankan Simulasi', key='run_monte_carlo'):
+        st.session_state.pop('mc_result', None)
+        with st.spinner('Menjalankan simulasi Monte Carlo...'):
+            note = None
+            if source == MC_SOURCES[2]:
+                symbol = sanitize_stock_symbol(symbol).upper().replace('.JK', '')
+                if not symbol:
+                    st.error("Masukkan kode saham yang valid")
+                    return
+                from pages_analysis import get_price_history  # Cache riwayat yang sama dengan halaman analisis
+                returns = monthly_log_returns(get_price_history(f"{symbol}.JK"))
+                try:
+                    sampler = bootstrap_sampler(returns)
+                except ValueError:
+                    st.error(f"Riwayat {symbol} terlalu pendek untuk bootstrap (minimal 12 bulan)")
                     return
-                df = calculate_compound_interest(firstm, rate, years, additional_investment)
-                df_display = df.copy()
-                df_display['Amount'] = df_display['Amount'].apply(lambda x: format_rupiah(x))
-                st.markdown("""
-                <div style='margin-bottom: 16px;'>
-                    <h3 style='color: var(--text-color); margin-bottom: 5px; font-size: 16px;'>📊 Hasil perhitungan bunga berbunga</h3>
-                </div>
-                """, unsafe_allow_html=True)
-                total_investment = firstm + (additional_investment * int(years * 12))
-                final_amount = df_display['Amount'].iloc[-1]
-                st.markdown(f"""
+                note = (f"Bootstrap dari {len(returns)} return bulanan {symbol} "
+                        f"(rata-rata {np.expm1(returns.mean() * 12) * 100:.1f}%/th, "
+                        f"volatilitas {returns.std() * np.sqrt(12) * 100:.1f}%/th).")
+            else:
+                dist = 'student-t' if source == MC_SOURCES[1] else 'normal'
+                sampler = distribution_sampler(mean, vol, dist)
+            result = simulate_wealth(firstm, additional_investment, years, sampler, n_paths)
+        # Disimpan agar tetap tampil saat tombol lain (mis. Hitung) memicu rerun
+        st.session_state['mc_result'] = {'params': params, 'result': result, 'note': note}
+
+    run = st.session_state.get('mc_result')
+    if not run or run['params'] != params:
+        return
+    result = run['result']
+    if run['note']:
+        st.caption(run['note'])
+    final, deposits = result['final'], result['deposits']
+    median, p5, p95 = np.percentile(final, [50, 5, 95])
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric('Median Nilai Akhir', format_rupiah(median))
+    col2.metric('Skenario Buruk (P5)', format_rupiah(p5))
+    col3.metric('Skenario Baik (P95)', format_rupiah(p95))
+    col4.metric('Peluang Rugi', f"{(final < deposits).mean() * 100:.1f}%", help='Nilai akhir di bawah total setor')
+    if result['paths'] < n_paths:
+        st.caption(f"Jumlah simulasi dibatasi {result['paths']:,} jalur untuk horizon {years} tahun.")
+    st.caption(f"{result['paths']:,} jalur disimulasikan dalam {result['elapsed'] * 1000:.0f} ms. "
+               f"Total setor: {format_rupiah(deposits)}.")
+    _fan_chart(result['bands'])
+    with st.expander('Tabel Persentil per Tahun', expanded=False):
+        table = result['bands'].copy()
+        money = [c for c in table.columns if c != 'Bulan']
+        st.dataframe(table.style.format({c: format_rupiah for c in money}), use_container_width=True)
+
+
+def render_compound_result(firstm: float, rate: float, years: float, additional_investment: float) -> None:
+    """Hasil perhitungan deterministik: proyeksi, tabel bulanan, ringkasan tahunan dan sensitivitas."""
+    df = calculate_compound_interest(firstm, rate, years, additional_investment)
+    df_display = df.copy()
+    df_display['Amount'] = df_display['Amount'].apply(lambda x: format_rupiah(x))
+    st.markdown("""
+    <div style='margin-bottom: 16px;'>
+        <h3 style='color: var(--text-color); margin-bottom: 5px; font-size: 16px;'>📊 Hasil perhitungan bunga berbunga</h3>
+    </div>
+    """, unsafe_allow_html=True)
+    total_investment = firstm + (additional_investment * int(years * 12))
+    final_amount = df_display['Amount'].iloc[-1]
+    st.markdown(f"""
 <div class='premium-card' style='border-top: 5px solid #2563eb;'>
 <h4 style='color: var(--text-color); margin: 0 0 20px 0; font-size: 1.25rem; font-weight: 700; text-align: center;'>📊 Proyeksi Kekayaan</h4>
 <div style='text-align: center; margin-bottom: 24px;'>
@@ -79,18 +165,65 @@ def compound_interest_page() -> None:
 </div>
 </div>
 """, unsafe_allow_html=True)
-                with st.expander('Tampilkan Data', expanded=True):
-                    st.dataframe(df_display.set_index(df_display.index + 1), use_container_width=True, height=400)
-                    df_download = df.copy()
-                    df_download['Amount'] = df_download['Amount'].apply(lambda x: format_csv_indonesia(x, 0) if pd.notna(x) else "0")
-                    csv = df_download.to_csv(index=False, sep=';', encoding='utf-8-sig', quoting=1)
-                    st.download_button(label="📥 Download as CSV", data=csv, file_name="compound_interest.csv", mime="text/csv")
-                for year_num in range(1, int(years) + 1):
-                    yearly_data = df_display[df_display['Year'] == year_num]
-                    with st.expander(f'📅 Tahun {year_num}', expanded=False):
-                        st.dataframe(yearly_data[['Month', 'Amount']].set_index(yearly_data.index + 1), use_container_width=True)
+    with st.expander('Tampilkan Data', expanded=True):
+        st.dataframe(df_display.set_index(df_display.index + 1), use_container_width=True, height=400)
+        df_download = df.copy()
+        df_download['Amount'] = df_download['Amount'].apply(lambda x: format_csv_indonesia(x, 0) if pd.notna(x) else "0")
+        csv = df_download.to_csv(index=False, sep=';', encoding='utf-8-sig', quoting=1)
+        st.download_button(label="📥 Download as CSV", data=csv, file_name="compound_interest.csv", mime="text/csv")
+    with st.expander('📈 Ringkasan Tahunan', expanded=False):
+        summary = yearly_summary(df, firstm, additional_investment)
+        st.dataframe(summary.style.format({'Saldo Akhir': format_rupiah, 'Total Setor': format_rupiah,
+                                           'Hasil Bunga': format_rupiah}),
+                     use_container_width=True)
+    for year_num, yearly_data in df_display.groupby('Year', sort=True):
+        if year_num > int(years):
+            break
+        with st.expander(f'📅 Tahun {year_num}', expanded=False):
+            st.dataframe(yearly_data[['Month', 'Amount']].set_index(yearly_data.index + 1), use_container_width=True)
+    with st.expander('🌡️ Analisis Sensitivitas (Bunga x Tahun)', expanded=False):
+        render_sensitivity(firstm, rate, years, additional_investment)
+
+
+def compound_interest_page() -> None:
+    st.info('Bunga-berbunga atau compound interest adalah jenis bunga yang dihitung tidak hanya dari jumlah pokok awal, tetapi juga dari bunga yang sudah diperoleh.')
+
+    col1, _ = st.columns(2, gap="small")
+    with col1:
+        st.markdown("""
+        <div style='margin-bottom: 16px;'>
+            <h3 style='color: var(--text-color); margin-bottom: 12px;'>Input Investasi</h3>
+        </div>
+        """, unsafe_allow_html=True)
+        firstm = st.number_input('💰 Masukkan nilai awal investasi', step=1000000, format="%d", value=1000000)
+        rate = st.number_input('📈 Masukkan tingkat bunga per tahun (%)', step=0.1, format="%.2f", value=10.0)
+        years = st.number_input('🗓️ Masukkan jumlah tahun (misal: 5.5 untuk 5 tahun 5 bulan)', step=0.1, format="%.1f", value=5.0)
+        additional_investment = st.number_input('➕ Masukkan tambahan investasi per bulan', step=1000000, format="%d", value=1000000)
+
+    inputs = (firstm, rate, years, additional_investment)
+    if st.button('Hitung', key='calculate_compound'):
+        st.session_state.pop('compound_inputs', None)
+        if firstm == 0 and rate == 0:
+            st.toast("⚠️ Input awal dan tingkat bunga 0!", icon="⚠️")
+            st.error("Silakan masukkan nilai investasi awal dan tingkat bunga untuk menghitung compound interest")
+        else:
+            # Disimpan agar hasil tetap tampil saat Simulasi Monte Carlo memicu rerun
+            st.session_state['compound_inputs'] = inputs
+
+    if st.session_state.get('compound_inputs') == inputs:
+        with st.spinner('Menghitung bunga berbunga...'):
+            try:
+                render_compound_result(firstm, rate, years, additional_investment)
             except Exception:
                 st.toast("🚨 Terjadi kesalahan perhitungan Compound!", icon="🚨")
                 st.error("Silakan masukkan nilai investasi awal dan tingkat bunga untuk menghitung compound interest")
 
-
+    st.markdown("---")
+    st.markdown("#### 🎲 Simulasi Monte Carlo")
+    st.caption('Proyeksi dengan return pasar yang berfluktuasi: ribuan skenario acak dengan modal awal, '
+               'setoran bulanan dan jumlah tahun di atas. Pita persentil menunjukkan rentang hasil yang mungkin.')
+    try:
+        render_monte_carlo(firstm, years, additional_investment)
+    except Exception:
+        st.toast("🚨 Terjadi kesalahan simulasi Monte Carlo!", icon="🚨")
+        st.error("Simulasi gagal. Periksa input atau coba lagi.")
@@ -5,10 +5,27 @@ import plotly.express as px
 from config import MARKET_INDICES
 from utils import format_rupiah, format_percent, format_large_number
 from state_manager import get_param, set_param
+from data_cache import SWRCache
 
 import time
 
-@st.cache_data(ttl=600)
+MARKET_OVERVIEW_TTL = 600         # Refresh di latar belakang setelah 10 menit
+MARKET_OVERVIEW_MAX_STALE = 3600  # Lewat 1 jam, pengguna menunggu data baru
+market_overview_cache = SWRCache(ttl=MARKET_OVERVIEW_TTL, max_stale=MARKET_OVERVIEW_MAX_STALE, max_entries=32)
+
+
+def get_market_overview(symbols):
+    """Return ((data_list, failed), as_of) using stale-while-revalidate caching.
+
+    Data lewat TTL langsung ditampilkan sambil diperbarui di latar belakang;
+    ``as_of`` adalah waktu (epoch) data tersebut diambil. Hasil kosong (Yahoo
+    gagal) tidak disimpan, sehingga data lama tetap dipakai dan permintaan
+    berikutnya mencoba lagi.
+    """
+    key = tuple(symbols)
+    return market_overview_cache.get(key, lambda: fetch_market_overview(key), cacheable=lambda r: bool(r[0]))
+
+
 def fetch_market_overview(symbols):
     """Fetch data for a given list of symbols in small batches with retry."""
     if not symbols:
@@ -150,7 +167,7 @@ def market_overview_page():
         display_name = selected_index_name
     
     with st.spinner(f"Mengambil data {display_name}... (Mungkin butuh waktu pemrosesan)"):
-        result = fetch_market_overview(tuple(selected_symbols))
+        result, as_of = get_market_overview(tuple(selected_symbols))
 
     # Unpack tuple (data_list, failed)
     if result is None:
@@ -168,6 +185,10 @@ def market_overview_page():
     if failed > 0:
         st.toast(f"⚠️ {failed} ticker gagal dimuat (sisanya berhasil).", icon="⚠️")
 
+    age = time.time() - as_of
+    refresh_note = " · sedang diperbarui di latar belakang" if age >= MARKET_OVERVIEW_TTL else ""
+    st.caption(f"🕒 Data per {time.strftime('%H:%M:%S', time.localtime(as_of))}{refresh_note}")
+
     df = pd.DataFrame(data)
 
     
@@ -0,0 +1,80 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from config import MARKET_INDICES
+from news_dedup import collapse_near_duplicates
+from news_index import news_index
+from pages_analysis import analyze_sentiment
+from state_manager import get_param, set_param
+from utils import sanitize_url
+
+ALL_SYMBOLS_OPTION = "🌐 Semua Saham Terpantau"
+
+
+def build_universe_sentiment(symbols):
+    """Ringkas sentimen berita per saham dari indeks berita lokal (tanpa request jaringan).
+
+    Returns DataFrame (Saham, Berita, Skor, Sentimen, Berita Terbaru) diurutkan
+    dari skor tertinggi; saham tanpa berita tidak ikut ditampilkan.
+    """
+    rows = []
+    for symbol, headlines in news_index.snapshot(symbols).items():
+        headlines = collapse_near_duplicates(headlines)
+        if not headlines:
+            continue
+        sentiment = analyze_sentiment(headlines)
+        rows.append({
+            'Saham': symbol,
+            'Berita': len(headlines),
+            'Skor': sentiment['score'],
+            'Sentimen': sentiment['label'],
+            'Berita Terbaru': headlines[0].get('title', ''),
+        })
+    columns = ['Saham', 'Berita', 'Skor', 'Sentimen', 'Berita Terbaru']
+    if not rows:
+        return pd.DataFrame(columns=columns)
+    return pd.DataFrame(rows, columns=columns).sort_values(['Skor', 'Berita'], ascending=False).reset_index(drop=True)
+
+
+def universe_sentiment_page():
+    st.markdown("""
+    <div style='margin-bottom: 24px;'>
+        <h2 style='color: var(--text-color); margin-bottom: 8px;'>📰 Sentimen Pasar</h2>
+        <p style='color: var(--text-color); opacity: 0.8; font-size: 1.1em;'>Sentimen berita seluruh saham terpantau dari satu kali pengambilan feed umum.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    _options = [ALL_SYMBOLS_OPTION] + list(MARKET_INDICES.keys())
+    _saved = get_param("ns_idx", ALL_SYMBOLS_OPTION)
+    selected = st.selectbox("📌 Pilih Indeks / Sektor:", _options,
+                            index=_options.index(_saved) if _saved in _options else 0)
+    set_param("ns_idx", selected)
+
+    if news_index.last_refresh is None:
+        with st.spinner("Mengumpulkan berita pasar..."):
+            news_index.ensure_fresh(wait=True)
+    else:
+        news_index.ensure_fresh()  # Diperbarui di latar belakang bila sudah kedaluwarsa
+
+    symbols = None if selected == ALL_SYMBOLS_OPTION else MARKET_INDICES[selected]
+    table = build_universe_sentiment(symbols)
+
+    if news_index.last_refresh:
+        st.caption(f"🕒 Indeks berita per {time.strftime('%H:%M:%S', time.localtime(news_index.last_refresh))}")
+
+    if table.empty:
+        st.info("Belum ada berita yang menyebut saham pada pilihan ini.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Saham Diberitakan", len(table))
+    col2.metric("Sentimen Positif", int((table['Skor'] > 0).sum()))
+    col3.metric("Sentimen Negatif", int((table['Skor'] < 0).sum()))
+
+    st.dataframe(table, use_container_width=True, hide_index=True)
+
+    pick = st.selectbox("🔎 Lihat berita saham:", table['Saham'].tolist())
+    for item in news_index.headlines(pick)[:10]:
+        st.markdown(f"- [{item.get('title', '')}]({sanitize_url(item.get('link', '#'))}) — *{item.get('publisher', '')}*")
@@ -0,0 +1,148 @@
+import time
+
+import streamlit as st
+
+from config import MARKET_INDICES
+from pages_market_overview import get_market_overview
+from scanner import NEAR_LIMIT_TICKS, limits_from_overview, scan_auto_reject, scan_symbols
+from state_manager import get_param, set_param
+
+ALL_SYMBOLS_OPTION = "🌐 Semua Saham Terpantau"
+SOURCE_OVERVIEW = "Harga Terkini (Market Overview)"
+SOURCE_BARS = "Close Harian (Bar Store)"
+
+
+def _index_symbols(selected):
+    if selected == ALL_SYMBOLS_OPTION:
+        return sorted({s for symbols in MARKET_INDICES.values() for s in symbols})
+    return list(MARKET_INDICES[selected])
+
+
+def render_technical_scan(selected):
+    """Scan teknikal (RSI, MA cross, MACD, ADX) untuk seluruh saham di indeks terpilih."""
+    if st.button("🔍 Jalankan Scan Teknikal", key="scan_tech_btn"):
+        symbols = _index_symbols(selected)
+        with st.spinner(f"Memindai {len(symbols)} saham..."):
+            start = time.perf_counter()
+            table, failed = scan_symbols(symbols)
+            st.session_state['scan_tech_result'] = {
+                'index': selected, 'table': table, 'failed': failed,
+                'elapsed': time.perf_counter() - start, 'at': time.time(),
+            }
+
+    result = st.session_state.get('scan_tech_result')
+    if not result or result['index'] != selected:
+        st.caption("Tekan tombol untuk memindai seluruh saham pada indeks ini.")
+        return
+
+    table = result['table']
+    st.caption(f"🕒 Scan per {time.strftime('%H:%M:%S', time.localtime(result['at']))} · "
+               f"{len(table)} saham dalam {result['elapsed']:.1f} detik")
+    if result['failed']:
+        st.caption(f"⚠️ {len(result['failed'])} saham tanpa data: {', '.join(s for s, _ in result['failed'][:10])}")
+    if table.empty:
+        st.info("Tidak ada data untuk dipindai.")
+        return
+
+    signals = st.multiselect("Filter Sinyal", sorted(table['Sinyal'].unique()), key="scan_tech_filter")
+    if signals:
+        table = table[table['Sinyal'].isin(signals)]
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Sinyal Beli", int(table['Sinyal'].str.contains('BUY').sum()))
+    col2.metric("Golden Cross", int((table['Cross MA'] == 'Golden Cross').sum()))
+    col3.metric("Tren Kuat (ADX > 25)", int((table['ADX14'] > 25).sum()))
+
+    st.dataframe(
+        table.style.format({'Harga': '{:,.0f}', 'Perubahan %': '{:+.2f}%', 'RSI14': '{:.1f}',
+                            'MA50': '{:,.0f}', 'MA200': '{:,.0f}', 'ADX14': '{:.1f}'}, na_rep='-'),
+        use_container_width=True, hide_index=True,
+    )
+
+
+def render_auto_reject_scan(selected):
+    """Saham yang harganya tinggal N tick dari ARA/ARB hari ini (batas dari close kemarin)."""
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        source = st.radio("Sumber Harga", [SOURCE_OVERVIEW, SOURCE_BARS], key="scan_ar_source")
+    with col2:
+        board = st.radio("Jenis Papan", ["Papan Utama/Pengembangan", "Papan Akselerasi"], key="scan_ar_board")
+        board = 'acceleration' if board == "Papan Akselerasi" else 'regular'
+    with col3:
+        near_ticks = st.number_input("Jarak Maks (tick)", min_value=1, max_value=50, value=NEAR_LIMIT_TICKS,
+                                     step=1, key="scan_ar_ticks")
+
+    if st.button("🚦 Cari Saham Dekat ARA/ARB", key="scan_ar_btn"):
+        symbols = _index_symbols(selected)
+        with st.spinner(f"Menghitung batas ARA/ARB {len(symbols)} saham..."):
+            start = time.perf_counter()
+            if source == SOURCE_OVERVIEW:
+                (rows, _), as_of = get_market_overview(symbols)
+                table = limits_from_overview(rows, board, int(near_ticks))
+                failed = [(s, 'No data') for s in sorted(set(symbols) - set(table['Saham']))]
+            else:
+                table, failed = scan_auto_reject(symbols, board, int(near_ticks))
+                as_of = time.time()
+            st.session_state['scan_ar_result'] = {
+                'index': selected, 'table': table, 'failed': failed, 'near_ticks': int(near_ticks),
+                'elapsed': time.perf_counter() - start, 'at': as_of,
+            }
+
+    result = st.session_state.get('scan_ar_result')
+    if not result or result['index'] != selected:
+        st.caption("Batas ARA/ARB dihitung dari harga penutupan sebelumnya dengan aturan fraksi harga BEI.")
+        return
+
+    table, near = result['table'], result['near_ticks']
+    st.caption(f"🕒 Data per {time.strftime('%H:%M:%S', time.localtime(result['at']))} · "
+               f"{len(table)} saham dalam {result['elapsed']:.1f} detik")
+    if result['failed']:
+        st.caption(f"⚠️ {len(result['failed'])} saham tanpa data: {', '.join(s for s, _ in result['failed'][:10])}")
+    if table.empty:
+        st.info("Tidak ada data untuk dipindai.")
+        return
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Sudah ARA", int((table['Status'] == 'ARA').sum()))
+    c2.metric(f"≤ {near} tick ke ARA", int((table['Tick ke ARA'] <= near).sum()))
+    c3.metric("Sudah ARB", int((table['Status'] == 'ARB').sum()))
+    c4.metric(f"≤ {near} tick ke ARB", int((table['Tick ke ARB'] <= near).sum()))
+
+    fmt = {'Prev Close': '{:,.0f}', 'Harga': '{:,.0f}', 'Perubahan %': '{:+.2f}%', 'ARA': '{:,.0f}',
+           'ARB': '{:,.0f}', 'Jarak ARA %': '{:.2f}%', 'Jarak ARB %': '{:.2f}%'}
+    tab_ara, tab_arb = st.tabs(["🟢 Terdekat ke ARA", "🔴 Terdekat ke ARB"])
+    with tab_ara:
+        ranked = table[table['Tick ke ARA'] <= near].sort_values(['Tick ke ARA', 'Jarak ARA %'])
+        if ranked.empty:
+            st.info(f"Tidak ada saham dalam {near} tick dari ARA.")
+        else:
+            st.dataframe(ranked.drop(columns=['Tick ke ARB', 'Jarak ARB %']).style.format(fmt),
+                         use_container_width=True, hide_index=True)
+    with tab_arb:
+        ranked = table[table['Tick ke ARB'] <= near].sort_values(['Tick ke ARB', 'Jarak ARB %'])
+        if ranked.empty:
+            st.info(f"Tidak ada saham dalam {near} tick dari ARB.")
+        else:
+            st.dataframe(ranked.drop(columns=['Tick ke ARA', 'Jarak ARA %']).style.format(fmt),
+                         use_container_width=True, hide_index=True)
+
+
+def scanner_page():
+    st.markdown("""
+    <div style='margin-bottom: 24px;'>
+        <h2 style='color: var(--text-color); margin-bottom: 8px;'>📡 Scanner Saham</h2>
+        <p style='color: var(--text-color); opacity: 0.8; font-size: 1.1em;'>Pindai seluruh saham dalam satu indeks sekaligus dan urutkan berdasarkan sinyal.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    _options = [ALL_SYMBOLS_OPTION] + list(MARKET_INDICES.keys())
+    _saved = get_param("scan_idx", _options[1])
+    selected = st.selectbox("📌 Pilih Indeks / Sektor:", _options,
+                            index=_options.index(_saved) if _saved in _options else 1)
+    set_param("scan_idx", selected)
+
+    tab_tech, tab_limit = st.tabs(["📈 Scan Teknikal", "🚦 Dekat ARA/ARB"])
+    with tab_tech:
+        render_technical_scan(selected)
+    with tab_limit:
+        render_auto_reject_scan(selected)
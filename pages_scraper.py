@@ -1,3 +1,5 @@
+import time
+
 import pandas as pd
 import streamlit as st
 
@@ -7,6 +9,8 @@ from utils import (
     MAX_SYMBOLS_PER_REQUEST,
     sanitize_stock_symbol,
     fetch_stock_data,
+    raw_info_as_of,
+    SYMBOL_CACHE_TTL,
     apply_format_values,
     format_rupiah,
     format_ratio,
@@ -29,6 +33,11 @@ def stock_scraper_page() -> None:
             st.session_state['scraper_modal'] = 1000000
         modal_rupiah = st.number_input("Masukkan modal dalam Rupiah", step=1000000, format="%d", min_value=0, key='scraper_modal')
 
+    fast_mode = st.checkbox(
+        '⚡ Mode cepat (harga dulu, fundamental menyusul)', key='scraper_fast_mode',
+        help='Harga semua saham diambil dalam satu permintaan. Data fundamental dimuat di latar belakang; klik Ambil Data lagi untuk melengkapinya.',
+    )
+
     if st.button('Ambil Data', key='fetch_data'):
         with st.spinner('Menganalisis saham...'):
             try:
@@ -43,7 +52,7 @@ def stock_scraper_page() -> None:
                     else sanitize_stock_symbol(symbol.upper())
                     for symbol in raw_symbols
                 ]
-                stocks_data = fetch_stock_data(symbols_list)
+                stocks_data = fetch_stock_data(symbols_list, price_only=fast_mode)
                 if not stocks_data:
                     logger = get_logger()
                     logger.error(f"Scraper: All symbols returned empty. Attempted: {symbols_list}")
@@ -143,6 +152,10 @@ def stock_scraper_page() -> None:
                 else:
                     df_display.index = df_display.index + 1
                     st.success(f"Berhasil mengambil data: {len(df_display)} saham.")
+                    as_of = raw_info_as_of(symbols_list)
+                    if as_of:
+                        refresh_note = " · sedang diperbarui di latar belakang" if time.time() - as_of >= SYMBOL_CACHE_TTL else ""
+                        st.caption(f"🕒 Data per {time.strftime('%H:%M:%S', time.localtime(as_of))}{refresh_note}")
                 
                 # Simplified Dataframe Rendering
                 df_view = apply_format_values(df_display, format_dict)
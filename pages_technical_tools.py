@@ -1,16 +1,16 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
 import plotly.graph_objects as go
 from utils import format_rupiah, format_number
 from state_manager import get_param, set_param
+from bar_store import bar_store, slice_period
+from indicators import get_indicators
 
 @st.cache_data(ttl=300, show_spinner=False)
 def get_ohlc_data(symbol):
     try:
-        ticker = yf.Ticker(f"{symbol}.JK")
         # Get data for last 2 days to ensure we have yesterday's full close
-        hist = ticker.history(period="5d")
+        hist = bar_store.get_history(f"{symbol}.JK", "5d")
         if len(hist) < 2:
             return None
         
@@ -213,8 +213,7 @@ def technical_tools_page():
                  with st.spinner(f"Mencari Swing High/Low {symbol_fib}..."):
                      try:
                          # Fetch 1 Month Data
-                         t = yf.Ticker(f"{symbol_fib}.JK")
-                         h = t.history(period="1mo")
+                         h = bar_store.get_history(f"{symbol_fib}.JK", "1mo")
                          if not h.empty:
                              # Find Max High and Min Low in period
                              period_high = float(h['High'].max())
@@ -261,23 +260,21 @@ def technical_tools_page():
                     st.markdown("### 📉 Realtime Chart Analysis (Multi-Indicator)")
                     with st.spinner("Menganalisa Teknikal..."):
                         try:
-                            # Fetch data for chart (6 months for MA200)
-                            chart_ticker = yf.Ticker(f"{symbol_fib}.JK")
-                            df_chart = chart_ticker.history(period="6mo")
+                            # Indikator dihitung dari riwayat penuh (MA200 butuh >6 bulan) lewat
+                            # engine bersama, lalu chart cukup menampilkan 6 bulan terakhir
+                            ticker_fib = f"{symbol_fib}.JK"
+                            history_fib = bar_store.get_history(ticker_fib, "5y")
                             
-                            if not df_chart.empty:
+                            if not history_fib.empty:
                                 # --- TECHNICAL CALCULATION ---
+                                ind = get_indicators(history_fib, symbol_fib)  # Kunci sama dengan halaman Analisa
+                                df_chart = slice_period(ind.frame(('rsi', 14), ('sma', 50), ('sma', 200)), "6mo")
+                                df_chart = df_chart.rename(columns={'RSI14': 'RSI', 'SMA50': 'MA50', 'SMA200': 'MA200'})
+                                
                                 # 1. RSI (14)
-                                delta = df_chart['Close'].diff()
-                                gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-                                loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-                                rs = gain / loss.replace(0, np.nan)
-                                df_chart['RSI'] = 100 - (100 / (1 + rs))
                                 current_rsi = df_chart['RSI'].iloc[-1]
                                 
                                 # 2. Moving Averages
-                                df_chart['MA50'] = df_chart['Close'].rolling(window=50, min_periods=1).mean()
-                                df_chart['MA200'] = df_chart['Close'].rolling(window=200, min_periods=1).mean()
                                 current_close = df_chart['Close'].iloc[-1]
                                 ma50_val = df_chart['MA50'].iloc[-1]
                                 ma200_val = df_chart['MA200'].iloc[-1]
@@ -1,27 +1,37 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
 from utils import format_rupiah, format_percent, sanitize_stock_symbol
 from state_manager import get_param, set_param
-from rate_limiter import yfinance_limiter
-from logger import log_security_event, log_user_action
+from logger import log_user_action
+from snapshot_cache import snapshot_cache
+from singleflight import yahoo_flight
+from bar_store import bar_store
+
+def _fetch_intraday(ticker_symbol):
+    """Ambil bar 1 hari terakhir; frame kosong jika kuota rate limit habis.
+
+    Kuota yfinance_limiter dipotong oleh bar store hanya saat benar-benar meminta ke Yahoo.
+    """
+    # Bar store hanya mengambil bar baru dari Yahoo; maks. 60 detik agar tetap real-time
+    return bar_store.get_history(ticker_symbol, "1d", max_age=60)
 
 @st.cache_data(ttl=60, show_spinner=False)
 def get_realtime_price(symbol):
     try:
-        if not yfinance_limiter.acquire():
-            log_security_event('rate_limit', f'Rate limit hit for realtime: {symbol}', 'WARNING')
-            return None
         # Tambahkan .JK jika belum ada dan bukan kode komposit/indeks tertentu
         ticker_symbol = f"{symbol}.JK" if not symbol.endswith(".JK") and not symbol.startswith("^") else symbol
-        
-        # Menggunakan yfinance dengan periode '1d' untuk mendapatkan data real-time/terbaru
-        ticker = yf.Ticker(ticker_symbol)
-        history = ticker.history(period="1d")
-        
-        if not history.empty:
+
+        # Harga dari snapshot cache (maks. 60 detik) tidak memakai kuota rate limit
+        snapshot = snapshot_cache.get(ticker_symbol, groups=('price',), max_age=60)
+        if snapshot and snapshot.get('regularMarketPrice'):
+            return snapshot['regularMarketPrice']
+
+        # Sesi lain yang meminta simbol yang sama menunggu fetch yang sedang berjalan
+        history = yahoo_flight.do(('history', ticker_symbol, '1d'), _fetch_intraday, ticker_symbol)
+        if history is not None and not history.empty:
             # Mengambil harga penutupan terakhir (bisa jadi harga saat ini jika pasar buka)
             current_price = history['Close'].iloc[-1]
+            snapshot_cache.update_group(ticker_symbol, 'price', {'regularMarketPrice': float(current_price)})
             log_user_action('price_fetch', f'{symbol} = {current_price}')
             return current_price
         return None
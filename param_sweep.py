@@ -0,0 +1,341 @@
+"""Signal Threshold Parameter Sweep.
+
+Runs ``multi_timeframe_signal_series`` + ``backtest_signals`` for every
+combination (grid) or a random sample of ``SIGNAL_PARAMS`` overrides over many
+symbols, on a process pool.
+
+Price arrays are packed once into a single ``multiprocessing.shared_memory``
+block (rows = all symbols' bars, columns = OHLCV) and every worker maps it
+read-only; a task only carries a symbol name and a list of parameter sets,
+so no DataFrame is pickled per task. A task builds one ``IndicatorSet`` for
+its symbol, so indicator windows shared by its parameter sets (e.g. the same
+EMA span) are computed once.
+
+Results go to a SQLite table (one row per run, symbol, timeframe and
+parameter set) for offline tuning::
+
+    python param_sweep.py --index "LQ45" --mode random --samples 200
+
+Compliance: OWASP API4 (Unrestricted Resource Consumption), CWE-400
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest import DEFAULT_CAPITAL, DEFAULT_PLATFORM, backtest_signals
+from indicators import IndicatorSet
+from signals import SIGNAL_PARAMS, TIMEFRAME_LABELS, multi_timeframe_signal_series
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+DEFAULT_DB_NAME = 'param_sweeps.sqlite3'
+DEFAULT_TIMEFRAME = '1 Bulan'
+SWEEP_PERIOD = '5y'
+PARAMS_PER_TASK = 25              # Parameter sets evaluated per task (one symbol)
+MIN_BARS = 60                     # Shorter histories are skipped
+FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+# Default search space around the current thresholds
+SWEEP_SPACE: Dict[str, List[Any]] = {
+    'rsi_oversold': [20, 25, 30],
+    'rsi_overbought': [70, 75, 80],
+    'adx_trend': [20, 25, 30],
+    'ema_fast': [5, 8],
+    'ema_mid': [10, 13],
+    'ema_slow': [20, 26],
+}
+
+METRICS = ('total_pl', 'return_pct', 'win_rate', 'max_drawdown_pct', 'num_trades', 'buy_hold_pct')
+ParamSet = Dict[str, Any]
+
+
+# ── Parameter generation ─────────────────────────────────────
+def _check_space(space: Mapping[str, Any]) -> None:
+    unknown = set(space) - set(SIGNAL_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown signal parameter(s): {', '.join(sorted(unknown))}")
+
+
+def grid_params(space: Mapping[str, Sequence[Any]] = SWEEP_SPACE) -> List[ParamSet]:
+    """Every combination of the listed values."""
+    _check_space(space)
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+
+def random_params(space: Mapping[str, Any] = SWEEP_SPACE, n: int = 50, seed: Optional[int] = None) -> List[ParamSet]:
+    """``n`` random parameter sets (without repeats when the space allows it).
+
+    A list value is sampled from its items; a ``(low, high)`` tuple is a
+    uniform range (integers if both ends are ints).
+    """
+    _check_space(space)
+    rng = random.Random(seed)
+
+    def draw(spec):
+        if isinstance(spec, tuple):
+            low, high = spec
+            return rng.randint(low, high) if isinstance(low, int) and isinstance(high, int) else rng.uniform(low, high)
+        return rng.choice(list(spec))
+
+    seen, out = set(), []
+    for _ in range(n * 20):
+        params = {key: draw(spec) for key, spec in space.items()}
+        key = tuple(sorted(params.items()))
+        if key not in seen:
+            seen.add(key)
+            out.append(params)
+            if len(out) >= n:
+                break
+    return out
+
+
+# ── Shared price block ───────────────────────────────────────
+class SharedPrices:
+    """All symbols' OHLCV bars in one shared-memory float64 block (parent side).
+
+    ``meta`` is the small picklable description workers attach with.
+    """
+
+    def __init__(self, histories: Mapping[str, pd.DataFrame]):
+        frames = {s: h for s, h in histories.items() if h is not None and len(h) >= MIN_BARS}
+        total = sum(len(h) for h in frames.values())
+        self._values = shared_memory.SharedMemory(create=True, size=max(total * len(FIELDS) * 8, 8))
+        self._dates = shared_memory.SharedMemory(create=True, size=max(total * 8, 8))
+        values = np.ndarray((total, len(FIELDS)), dtype=np.float64, buffer=self._values.buf)
+        dates = np.ndarray((total,), dtype=np.int64, buffer=self._dates.buf)
+
+        offsets, tz, row = {}, None, 0
+        for symbol, history in frames.items():
+            n = len(history)
+            values[row:row + n] = history[list(FIELDS)].to_numpy(dtype=np.float64)
+            index = pd.DatetimeIndex(history.index)
+            tz = tz or (str(index.tz) if index.tz is not None else None)
+            dates[row:row + n] = (index.tz_convert('UTC').tz_localize(None) if index.tz is not None else index).asi8
+            offsets[symbol] = (row, row + n)
+            row += n
+        del values, dates  # Views must not outlive close()
+
+        self.symbols = list(offsets)
+        self.meta = {'values': self._values.name, 'dates': self._dates.name,
+                     'rows': total, 'offsets': offsets, 'tz': tz}
+
+    def close(self) -> None:
+        for block in (self._values, self._dates):
+            block.close()
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Worker-side state, set once per process by _attach()
+_worker: Dict[str, Any] = {}
+
+
+def _attach(meta: Dict[str, Any]) -> None:
+    """Pool initializer: map the shared blocks read-only."""
+    blocks = [shared_memory.SharedMemory(name=meta['values']), shared_memory.SharedMemory(name=meta['dates'])]
+    values = np.ndarray((meta['rows'], len(FIELDS)), dtype=np.float64, buffer=blocks[0].buf)
+    dates = np.ndarray((meta['rows'],), dtype=np.int64, buffer=blocks[1].buf)
+    values.flags.writeable = False
+    dates.flags.writeable = False
+    _worker.update(blocks=blocks, values=values, dates=dates, meta=meta)
+
+
+def _detach() -> None:
+    blocks = _worker.pop('blocks', [])
+    _worker.clear()
+    for block in blocks:
+        block.close()
+
+
+def _history(symbol: str) -> pd.DataFrame:
+    """Zero-copy DataFrame view of one symbol's bars."""
+    start, stop = _worker['meta']['offsets'][symbol]
+    index = pd.DatetimeIndex(_worker['dates'][start:stop])
+    if _worker['meta']['tz']:
+        index = index.tz_localize('UTC').tz_convert(_worker['meta']['tz'])
+    return pd.DataFrame(_worker['values'][start:stop], index=index, columns=list(FIELDS), copy=False)
+
+
+def _evaluate(symbol: str, param_sets: List[ParamSet], timeframe: str,
+              platform: str, capital: float) -> List[Dict[str, Any]]:
+    history = _history(symbol)
+    # One private IndicatorSet for all parameter sets; kept out of the global
+    # cache so no view of the shared block outlives the sweep
+    indicators = IndicatorSet(history)
+    column = f"{timeframe} Sinyal"
+    rows = []
+    for params in param_sets:
+        signals = multi_timeframe_signal_series(history, params=params, indicators=indicators)[column]
+        result = backtest_signals(history, signals, platform=platform, capital=capital)
+        rows.append({'symbol': symbol, 'params': params, **{m: result[m] for m in METRICS}})
+    return rows
+
+
+# ── Results table ────────────────────────────────────────────
+class SweepResults:
+    """SQLite table ``sweep_results``: one row per (run, symbol, timeframe, parameter set).
+
+    Every ``SIGNAL_PARAMS`` key has its own column (the effective value,
+    defaults included), so results can be filtered and grouped in plain SQL.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            cache_dir = os.environ.get('SAHAM_CACHE_DIR', DEFAULT_CACHE_DIR)
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, DEFAULT_DB_NAME)
+        self.path = path
+        param_cols = ', '.join(f"{k} REAL" for k in SIGNAL_PARAMS)
+        metric_cols = ', '.join(f"{m} REAL" for m in METRICS)
+        with self._connect() as conn:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS sweep_results ("
+                         f"run_id TEXT, created_at REAL, symbol TEXT, timeframe TEXT, platform TEXT, "
+                         f"params TEXT, {param_cols}, {metric_cols})")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sweep_run ON sweep_results (run_id, timeframe)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0)
+
+    def insert(self, run_id: str, timeframe: str, platform: str, rows: Iterable[Dict[str, Any]]) -> int:
+        keys = list(SIGNAL_PARAMS)
+        columns = ['run_id', 'created_at', 'symbol', 'timeframe', 'platform', 'params', *keys, *METRICS]
+        now = time.time()
+        records = [
+            (run_id, now, r['symbol'], timeframe, platform, json.dumps(r['params'], sort_keys=True),
+             *({**SIGNAL_PARAMS, **r['params']}[k] for k in keys), *(r[m] for m in METRICS))
+            for r in rows
+        ]
+        with self._connect() as conn:
+            conn.executemany(f"INSERT INTO sweep_results ({', '.join(columns)}) "
+                             f"VALUES ({', '.join('?' * len(columns))})", records)
+        return len(records)
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> pd.DataFrame:
+        """Run a read query against the results database."""
+        with self._connect() as conn:
+            return pd.read_sql_query(sql, conn, params=list(params))
+
+    def runs(self) -> pd.DataFrame:
+        return self.query("SELECT run_id, timeframe, MIN(created_at) AS created_at, COUNT(DISTINCT symbol) AS symbols, "
+                          "COUNT(DISTINCT params) AS param_sets FROM sweep_results "
+                          "GROUP BY run_id, timeframe ORDER BY created_at DESC")
+
+    def summary(self, run_id: str, timeframe: Optional[str] = None) -> pd.DataFrame:
+        """Per parameter set, averaged over symbols, best mean return first."""
+        sql = ("SELECT params, COUNT(*) AS symbols, AVG(return_pct) AS mean_return_pct, "
+               "AVG(win_rate) AS mean_win_rate, AVG(max_drawdown_pct) AS mean_drawdown_pct, "
+               "AVG(num_trades) AS mean_trades, AVG(return_pct - buy_hold_pct) AS mean_excess_pct "
+               "FROM sweep_results WHERE run_id = ?")
+        args: List[Any] = [run_id]
+        if timeframe:
+            sql += " AND timeframe = ?"
+            args.append(timeframe)
+        sql += " GROUP BY params ORDER BY mean_return_pct DESC"
+        return self.query(sql, args)
+
+
+# ── Runner ───────────────────────────────────────────────────
+def run_sweep(
+    histories: Mapping[str, pd.DataFrame],
+    param_sets: Sequence[ParamSet],
+    timeframe: str = DEFAULT_TIMEFRAME,
+    platform: str = DEFAULT_PLATFORM,
+    capital: float = DEFAULT_CAPITAL,
+    processes: Optional[int] = None,
+    results: Optional[SweepResults] = None,
+    run_id: Optional[str] = None,
+) -> Tuple[str, pd.DataFrame]:
+    """Backtest every parameter set on every symbol; returns (run_id, results frame).
+
+    ``processes`` <= 1 runs in this process (same code path, no pool).
+    Rows are also written to ``results`` when given.
+    """
+    if timeframe not in TIMEFRAME_LABELS:
+        raise ValueError(f"Unknown timeframe: {timeframe!r}")
+    run_id = run_id or uuid.uuid4().hex[:12]
+    param_sets = [dict(p) for p in param_sets]
+    processes = processes if processes is not None else (os.cpu_count() or 1)
+    rows: List[Dict[str, Any]] = []
+
+    with SharedPrices(histories) as prices:
+        tasks = [(symbol, param_sets[i:i + PARAMS_PER_TASK])
+                 for symbol in prices.symbols for i in range(0, len(param_sets), PARAMS_PER_TASK)]
+        if processes <= 1 or len(tasks) <= 1:
+            _attach(prices.meta)
+            try:
+                for symbol, chunk in tasks:
+                    rows.extend(_evaluate(symbol, chunk, timeframe, platform, capital))
+            finally:
+                _detach()
+        else:
+            with ProcessPoolExecutor(max_workers=min(processes, len(tasks)),
+                                     initializer=_attach, initargs=(prices.meta,)) as pool:
+                futures = [pool.submit(_evaluate, symbol, chunk, timeframe, platform, capital)
+                           for symbol, chunk in tasks]
+                for future in as_completed(futures):
+                    rows.extend(future.result())
+
+    if results is not None:
+        results.insert(run_id, timeframe, platform, rows)
+    frame = pd.DataFrame([{'symbol': r['symbol'], 'params': json.dumps(r['params'], sort_keys=True),
+                           **{m: r[m] for m in METRICS}} for r in rows],
+                         columns=['symbol', 'params', *METRICS])
+    return run_id, frame.sort_values(['symbol', 'params']).reset_index(drop=True)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    from bar_store import bar_store
+    from config import MARKET_INDICES
+    from fetch_engine import fetch_concurrently
+
+    parser = argparse.ArgumentParser(description="Sweep signal thresholds over an index and store backtest results.")
+    parser.add_argument('--index', default=next(iter(MARKET_INDICES)), choices=list(MARKET_INDICES))
+    parser.add_argument('--timeframe', default=DEFAULT_TIMEFRAME, choices=TIMEFRAME_LABELS)
+    parser.add_argument('--mode', default='grid', choices=['grid', 'random'])
+    parser.add_argument('--samples', type=int, default=50, help="Parameter sets for --mode random")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--platform', default=DEFAULT_PLATFORM)
+    parser.add_argument('--db', default=None, help="SQLite path (default: cache/param_sweeps.sqlite3)")
+    args = parser.parse_args(argv)
+
+    def load_one(symbol: str):
+        history = bar_store.get_history(f"{symbol}.JK", SWEEP_PERIOD)
+        if history is None or history.empty:
+            return None, 'No data'
+        return {'history': history}, None
+
+    loaded, failed = fetch_concurrently(MARKET_INDICES[args.index], load_one, label="sweep_history")
+    histories = {symbol: row['history'] for symbol, row in loaded.items()}
+    param_sets = grid_params() if args.mode == 'grid' else random_params(n=args.samples, seed=args.seed)
+
+    results = SweepResults(args.db)
+    start = time.perf_counter()
+    run_id, _ = run_sweep(histories, param_sets, args.timeframe, args.platform,
+                          processes=args.processes, results=results)
+    print(f"Run {run_id}: {len(histories)} symbols x {len(param_sets)} parameter sets "
+          f"in {time.perf_counter() - start:.1f}s ({len(failed)} symbols without data) -> {results.path}")
+    print(results.summary(run_id, args.timeframe).head(10).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""Precomputed IDX Price Ladder.
+
+Every valid IDX price from Rp 1 up to ``LADDER_TOP`` (one rung per tick:
+1..199 by 1, 200..498 by 2, 500..1995 by 5, 2000..4990 by 10, then by 25)
+with the rung index of its next-session ARA and ARB price for the regular
+and acceleration boards, as compact int32 arrays. A rung's index is found
+arithmetically from its tick band, so a limit lookup is O(1) and a
+multi-day ARA/ARB sequence is index chasing with no float math.
+
+The tables are built once at import from ``utils.ara_arb_limits`` (the same
+rules as the calculators, a few milliseconds), so they always agree with
+the scalar functions. Prices off the ladder (between ticks, or above the
+top) fall back to ``utils.ara_arb_limits``.
+
+Compliance: OWASP API4 (Unrestricted Resource Consumption), CWE-400
+"""
+from bisect import bisect_right
+from typing import Dict, List
+
+import numpy as np
+
+from utils import TICK_BOUNDS, TICK_SIZES, ara_arb_limits
+
+LADDER_TOP = 1_000_000            # Highest rung (Rp); 20 ARA days from Rp 50,000 stay well below
+BOARDS = ('regular', 'acceleration')
+OFF_LADDER = -1
+
+# First price of each tick band
+_BAND_LOWS = np.concatenate([[1], TICK_BOUNDS]).astype(np.int64)
+
+
+class PriceLadder:
+    """All valid prices up to ``top`` and their next ARA/ARB rung per board."""
+
+    def __init__(self, top: int = LADDER_TOP):
+        bands = [np.arange(low, high, tick, dtype=np.int64)
+                 for low, high, tick in zip(_BAND_LOWS, list(_BAND_LOWS[1:]) + [top + 1], TICK_SIZES)]
+        self.prices = np.concatenate(bands)
+        self.top = int(self.prices[-1])
+        self._band_start = np.cumsum([0] + [len(b) for b in bands[:-1]]).astype(np.int64)
+        self._bounds, self._lows = TICK_BOUNDS.tolist(), _BAND_LOWS.tolist()
+        self._ticks, self._starts = TICK_SIZES.tolist(), self._band_start.tolist()
+        self.next_ara: Dict[str, np.ndarray] = {}
+        self.next_arb: Dict[str, np.ndarray] = {}
+        for board in BOARDS:
+            ara, arb = ara_arb_limits(self.prices, board)
+            self.next_ara[board] = self.rungs(ara).astype(np.int32)
+            self.next_arb[board] = self.rungs(arb).astype(np.int32)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def rungs(self, prices) -> np.ndarray:
+        """Rung index of each price, ``OFF_LADDER`` (-1) if it is not a valid price <= top."""
+        p = np.asarray(prices, dtype=float)
+        band = np.searchsorted(TICK_BOUNDS, p, side='right')
+        steps = (p - _BAND_LOWS[band]) / TICK_SIZES[band]
+        valid = (p >= 1) & (p <= self.top) & (steps == np.floor(steps))
+        return np.where(valid, self._band_start[band] + np.where(valid, steps, 0).astype(np.int64), OFF_LADDER)
+
+    def rung(self, price: float) -> int:
+        """Scalar ``rungs`` in plain Python (no array overhead for one price)."""
+        band = bisect_right(self._bounds, price)
+        steps, rest = divmod(price - self._lows[band], self._ticks[band])
+        if price < 1 or price > self.top or rest != 0:
+            return OFF_LADDER
+        return self._starts[band] + int(steps)
+
+    def limits(self, prices, board: str = 'regular'):
+        """Next-session (ARA, ARB) like ``utils.ara_arb_limits``; table lookups for on-ladder prices."""
+        if np.ndim(prices) == 0:
+            idx = self.rung(prices)
+            ara_idx = int(self.next_ara[board][idx]) if idx >= 0 else OFF_LADDER
+            arb_idx = int(self.next_arb[board][idx]) if idx >= 0 else OFF_LADDER
+            if ara_idx >= 0 and arb_idx >= 0:
+                return int(self.prices[ara_idx]), int(self.prices[arb_idx])
+            return ara_arb_limits(prices, board)
+        idx = self.rungs(prices)
+        on = idx >= 0
+        ara_idx = np.where(on, self.next_ara[board][np.where(on, idx, 0)], OFF_LADDER)
+        arb_idx = np.where(on, self.next_arb[board][np.where(on, idx, 0)], OFF_LADDER)
+        hit = (ara_idx >= 0) & (arb_idx >= 0)
+        if hit.all():
+            ara, arb = self.prices[ara_idx], self.prices[arb_idx]
+        else:
+            ara, arb = (np.asarray(x) for x in ara_arb_limits(np.asarray(prices, dtype=float), board))
+            ara = np.where(hit, self.prices[np.maximum(ara_idx, 0)], ara)
+            arb = np.where(hit, self.prices[np.maximum(arb_idx, 0)], arb)
+        return ara.astype(np.int64), arb.astype(np.int64)
+
+    def sequence(self, price: float, board: str = 'regular', steps: int = 1, side: str = 'ara') -> List[int]:
+        """Prices after 1..``steps`` consecutive ARA (or ARB) sessions.
+
+        An ARB sequence stops early once the price can no longer fall.
+        """
+        table = (self.next_ara if side == 'ara' else self.next_arb)[board]
+        prices = self.prices
+        path: List[int] = []
+        current, idx = price, self.rung(price)
+        for _ in range(steps):
+            nxt = int(table[idx]) if idx >= 0 else OFF_LADDER
+            if nxt >= 0:
+                new = int(prices[nxt])
+            else:
+                new = ara_arb_limits(current, board)[0 if side == 'ara' else 1]
+                nxt = self.rung(new)
+            if side == 'arb' and new >= current:
+                break
+            path.append(new)
+            current, idx = new, nxt
+        return path
+
+    def chase(self, prices, board: str = 'regular', steps: int = 1, side: str = 'ara') -> np.ndarray:
+        """Vectorized ``sequence`` for many on-ladder prices: (len(prices), steps) int64 array.
+
+        Columns past a stalled ARB (or past the top rung) repeat the last price.
+        """
+        table = (self.next_ara if side == 'ara' else self.next_arb)[board]
+        idx = self.rungs(prices)
+        if (idx < 0).any():
+            raise ValueError("chase() needs valid IDX prices within the ladder")
+        out = np.empty((len(idx), steps), dtype=np.int64)
+        for step in range(steps):
+            nxt = table[idx]
+            idx = np.where(nxt >= 0, nxt, idx)
+            out[:, step] = self.prices[idx]
+        return out
+
+
+price_ladder = PriceLadder()
+
@@ -0,0 +1,281 @@
+"""Vectorized Multi-Symbol Technical Scanner.
+
+Loads a whole ``MARKET_INDICES`` entry into aligned 2-D NumPy arrays
+(dates x symbols) and computes RSI, moving-average crosses, MACD state and
+ADX for every column at once: rolling windows come from cumulative sums
+along the date axis and EMAs advance one row (all symbols) per step. The
+formulas and scoring follow ``get_technical_signals`` so a symbol ranks the
+same way it is judged in Analisa Lengkap.
+
+The auto-reject scan takes every symbol's previous close and current price
+(from the bar store panel or the market overview rows), builds today's
+ARA/ARB limits in one vectorized pass with the BEI tick rules and measures
+the distance to each limit in ticks on the ``price_ladder``.
+
+Compliance: OWASP API4 (Unrestricted Resource Consumption), CWE-400
+"""
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bar_store import bar_store
+from fetch_engine import DEFAULT_MAX_WORKERS, fetch_concurrently
+from price_ladder import price_ladder
+
+SCAN_PERIOD = '1y'        # MA200 needs ~10 months of bars
+CROSS_LOOKBACK = 5        # Bars in which a fresh MA/MACD cross is reported
+MIN_BARS = 50             # Fewer bars than this -> no signal (as in get_technical_signals)
+PANEL_FIELDS = ('Close', 'High', 'Low', 'Volume')
+LIMIT_PERIOD = '1mo'      # Enough bars for the last two closes
+NEAR_LIMIT_TICKS = 3      # Within this many ticks of ARA/ARB counts as "near"
+
+
+# ── Panel loading ────────────────────────────────────────────
+def load_panel(symbols: Sequence[str], period: str = SCAN_PERIOD, max_workers: int = DEFAULT_MAX_WORKERS,
+               ffill: bool = True) -> Tuple[Dict[str, pd.DataFrame], List[Tuple[str, str]]]:
+    """Load daily bars for ``symbols`` (without '.JK') into aligned dates x symbols frames.
+
+    Returns ({'Close', 'High', 'Low', 'Volume'} -> DataFrame, failures). Gaps
+    after a symbol's first bar (e.g. suspension days) carry the last bar
+    forward, or stay NaN with ``ffill=False``. Every Yahoo request behind
+    ``bar_store.get_history`` takes a ``yfinance_limiter`` token, so a cold
+    universe scan stays within the shared budget (symbols without a token
+    fall back to their stored bars); disk hits cost none.
+    """
+    def load_one(symbol: str):
+        history = bar_store.get_history(f"{symbol}.JK", period)
+        if history is None or history.empty:
+            return None, 'No data'
+        return {'history': history}, None
+
+    rows, failed = fetch_concurrently(symbols, load_one, max_workers=max_workers, label="scan_history")
+    panel = {}
+    for field in PANEL_FIELDS:
+        frame = pd.DataFrame({symbol: row['history'][field] for symbol, row in rows.items()})
+        frame = frame.sort_index()
+        panel[field] = frame.ffill() if ffill else frame
+    return panel, failed
+
+
+# ── Vectorized primitives (axis 0 = dates) ───────────────────
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over ``window`` rows; NaN until the window is full or while it holds a NaN."""
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if values.shape[0] < window:
+        return out
+    nan = np.isnan(values)
+    csum = np.cumsum(np.where(nan, 0.0, values), axis=0)
+    ncount = np.cumsum(nan, axis=0)
+    csum = np.vstack([np.zeros((1,) + values.shape[1:]), csum])
+    ncount = np.vstack([np.zeros((1,) + values.shape[1:]), ncount])
+    sums = csum[window:] - csum[:-window]
+    nans = ncount[window:] - ncount[:-window]
+    out[window - 1:] = np.where(nans == 0, sums / window, np.nan)
+    return out
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """EMA per column like ``ewm(span, adjust=False)``, starting at each column's first value."""
+    values = np.asarray(values, dtype=float)
+    alpha = 2.0 / (span + 1)
+    out = np.empty(values.shape)
+    current = values[0].copy()
+    out[0] = current
+    for t in range(1, values.shape[0]):
+        x = values[t]
+        current = np.where(np.isnan(current), x, np.where(np.isnan(x), current, current + alpha * (x - current)))
+        out[t] = current
+    return out
+
+
+def _shift(values: np.ndarray) -> np.ndarray:
+    shifted = np.full(values.shape, np.nan)
+    shifted[1:] = values[:-1]
+    return shifted
+
+
+def rsi(close: np.ndarray, window: int = 14) -> np.ndarray:
+    delta = close - _shift(close)
+    gain = rolling_mean(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0)), window)
+    loss = rolling_mean(np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0)), window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - 100 / (1 + gain / loss)
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = _shift(close)
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> np.ndarray:
+    """Simplified ADX (rolling means), as in the indicator engine."""
+    up, down = high - _shift(high), _shift(low) - low
+    plus_dm = np.where((up < 0) | (up <= down), 0.0, up)
+    minus_dm = np.where((down < 0) | (down <= up), 0.0, down)
+    plus_dm[0], minus_dm[0] = np.nan, np.nan
+    atr = rolling_mean(true_range(high, low, close), window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plus_di = 100 * rolling_mean(plus_dm, window) / atr
+        minus_di = 100 * rolling_mean(minus_dm, window) / atr
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di + 0.0001)
+    return rolling_mean(dx, window)
+
+
+def _recent_cross(fast: np.ndarray, slow: np.ndarray, lookback: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(crossed up, crossed down) within the last ``lookback`` bars, per column."""
+    diff = fast - slow
+    now, prev = diff[-lookback:], _shift(diff)[-lookback:]
+    up = ((prev <= 0) & (now > 0)).any(axis=0)
+    down = ((prev >= 0) & (now < 0)).any(axis=0)
+    return up, down
+
+
+# ── Scan ─────────────────────────────────────────────────────
+def _signal_label(score: float) -> str:
+    if score >= 3:
+        return "STRONG BUY"
+    if score >= 1:
+        return "BUY"
+    if score <= -3:
+        return "STRONG SELL"
+    if score <= -1:
+        return "SELL"
+    return "NEUTRAL / WAIT"
+
+
+def scan_panel(panel: Dict[str, pd.DataFrame], lookback: int = CROSS_LOOKBACK) -> pd.DataFrame:
+    """Score every symbol of an aligned panel and return a table ranked best first."""
+    columns = ['Saham', 'Harga', 'Perubahan %', 'RSI14', 'MA50', 'MA200', 'Tren', 'Cross MA',
+               'MACD', 'ADX14', 'Skor', 'Sinyal']
+    close_df = panel['Close']
+    if close_df.empty:
+        return pd.DataFrame(columns=columns)
+    symbols = list(close_df.columns)
+    close = close_df.to_numpy(dtype=float)
+    high = panel['High'][symbols].to_numpy(dtype=float)
+    low = panel['Low'][symbols].to_numpy(dtype=float)
+
+    ma50, ma200 = rolling_mean(close, 50), rolling_mean(close, 200)
+    ema20 = ema(close, 20)
+    macd_line = ema(close, 12) - ema(close, 26)
+    macd_signal = ema(macd_line, 9)
+    rsi14 = rsi(close, 14)[-1]
+    adx14 = adx(high, low, close, 14)[-1]
+
+    last, prev = close[-1], close[-2] if len(close) > 1 else close[-1]
+    bars = (~np.isnan(close)).sum(axis=0)
+    golden, death = _recent_cross(ma50, ma200, lookback)
+    macd_up, macd_down = _recent_cross(macd_line, macd_signal, lookback)
+    macd_bullish = macd_line[-1] > macd_signal[-1]
+
+    # Same weights as get_technical_signals
+    score = (np.where(last < ma200[-1], -2, 1)
+             + np.where(last > ema20[-1], 1, -1)
+             + np.where(macd_bullish, 1, -1)
+             + np.where(rsi14 < 30, 2, np.where(rsi14 > 70, -2, 0)))
+    score = np.where(bars >= MIN_BARS, score, 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = (last / prev - 1) * 100
+    trend = np.where(np.isnan(ma200[-1]), 'Data < 200 bar',
+                     np.where((last > ma50[-1]) & (last > ma200[-1]), 'Uptrend',
+                              np.where((last < ma50[-1]) & (last < ma200[-1]), 'Downtrend', 'Sideways')))
+    cross = np.where(golden, 'Golden Cross', np.where(death, 'Death Cross', '-'))
+    macd_state = np.where(macd_up, 'Bullish Cross', np.where(macd_down, 'Bearish Cross',
+                                                             np.where(macd_bullish, 'Bullish', 'Bearish')))
+
+    table = pd.DataFrame({
+        'Saham': symbols,
+        'Harga': last,
+        'Perubahan %': change,
+        'RSI14': rsi14,
+        'MA50': ma50[-1],
+        'MA200': ma200[-1],
+        'Tren': trend,
+        'Cross MA': cross,
+        'MACD': macd_state,
+        'ADX14': adx14,
+        'Skor': score.astype(int),
+        'Sinyal': [_signal_label(s) if b >= MIN_BARS else 'DATA KURANG' for s, b in zip(score, bars)],
+    }, columns=columns)
+    return table.sort_values(['Skor', 'ADX14'], ascending=[False, False], na_position='last').reset_index(drop=True)
+
+
+def scan_symbols(symbols: Sequence[str], period: str = SCAN_PERIOD) -> Tuple[pd.DataFrame, List[Tuple[str, str]]]:
+    """Load and scan ``symbols``; returns (ranked table, failures)."""
+    panel, failed = load_panel(symbols, period)
+    return scan_panel(panel), failed
+
+
+# ── Auto-reject proximity ────────────────────────────────────
+def _limit_status(price: np.ndarray, ara: np.ndarray, arb: np.ndarray, to_ara: np.ndarray,
+                  to_arb: np.ndarray, near_ticks: int) -> np.ndarray:
+    return np.select(
+        [price >= ara, price <= arb, to_ara <= near_ticks, to_arb <= near_ticks],
+        ['ARA', 'ARB', 'Dekat ARA', 'Dekat ARB'], '-')
+
+
+def scan_limits(symbols: Sequence[str], prev_close, price, board: str = 'regular',
+                near_ticks: int = NEAR_LIMIT_TICKS) -> pd.DataFrame:
+    """Today's ARA/ARB for every symbol from its previous close, and the distance of ``price`` to each.
+
+    Distances are counted in ticks on the price ladder (a price between
+    ticks counts from the tick on the far side of the limit). Symbols without
+    a valid previous close or price are dropped.
+    """
+    columns = ['Saham', 'Prev Close', 'Harga', 'Perubahan %', 'ARA', 'ARB', 'Tick ke ARA', 'Tick ke ARB',
+               'Jarak ARA %', 'Jarak ARB %', 'Status']
+    symbols = np.asarray(symbols, dtype=object)
+    prev = np.asarray(prev_close, dtype=float)
+    last = np.asarray(price, dtype=float)
+    valid = np.isfinite(prev) & np.isfinite(last) & (prev > 0) & (last > 0)
+    symbols, prev, last = symbols[valid], prev[valid], last[valid]
+    if not len(symbols):
+        return pd.DataFrame(columns=columns)
+
+    ara, arb = price_ladder.limits(prev, board)
+    rungs = price_ladder.prices
+    to_ara = np.searchsorted(rungs, ara) - (np.searchsorted(rungs, last, side='right') - 1)
+    to_arb = np.searchsorted(rungs, last, side='left') - np.searchsorted(rungs, arb)
+    to_ara, to_arb = np.maximum(to_ara, 0), np.maximum(to_arb, 0)
+
+    return pd.DataFrame({
+        'Saham': symbols,
+        'Prev Close': prev,
+        'Harga': last,
+        'Perubahan %': (last / prev - 1) * 100,
+        'ARA': ara,
+        'ARB': arb,
+        'Tick ke ARA': to_ara,
+        'Tick ke ARB': to_arb,
+        'Jarak ARA %': (ara / last - 1) * 100,
+        'Jarak ARB %': (1 - arb / last) * 100,
+        'Status': _limit_status(last, ara, arb, to_ara, to_arb, near_ticks),
+    }, columns=columns)
+
+
+def limits_from_panel(panel: Dict[str, pd.DataFrame], board: str = 'regular',
+                      near_ticks: int = NEAR_LIMIT_TICKS) -> pd.DataFrame:
+    """``scan_limits`` with the last two closes of a bar-store panel."""
+    close = panel['Close']
+    if len(close) < 2:
+        return scan_limits([], [], [], board, near_ticks)
+    return scan_limits(list(close.columns), close.iloc[-2].to_numpy(), close.iloc[-1].to_numpy(), board, near_ticks)
+
+
+def limits_from_overview(rows: Sequence[Dict], board: str = 'regular',
+                         near_ticks: int = NEAR_LIMIT_TICKS) -> pd.DataFrame:
+    """``scan_limits`` with market overview rows (previous close = Price - Change)."""
+    frame = pd.DataFrame(list(rows), columns=['Symbol', 'Price', 'Change'])
+    price = pd.to_numeric(frame['Price'], errors='coerce').to_numpy(dtype=float)
+    change = pd.to_numeric(frame['Change'], errors='coerce').to_numpy(dtype=float)
+    return scan_limits(frame['Symbol'].tolist(), price - change, price, board, near_ticks)
+
+
+def scan_auto_reject(symbols: Sequence[str], board: str = 'regular', near_ticks: int = NEAR_LIMIT_TICKS,
+                     period: str = LIMIT_PERIOD) -> Tuple[pd.DataFrame, List[Tuple[str, str]]]:
+    """Load the last closes from the bar store and scan; returns (table, failures)."""
+    panel, failed = load_panel(symbols, period)
+    return limits_from_panel(panel, board, near_ticks), failed
@@ -0,0 +1,425 @@
+"""Technical Signal Rules.
+
+The scoring rules behind the analysis page's signal cards: the single
+``get_technical_signals`` verdict and the six-horizon
+``get_multi_timeframe_signals``, plus ``multi_timeframe_signal_series``,
+which evaluates the same rules for every bar at once for the backtester and
+the parameter sweep. Thresholds live in ``SIGNAL_PARAMS``.
+
+Kept free of Streamlit and page state so ``param_sweep`` workers import only
+the rules and the indicator engine.
+"""
+import numpy as np
+import pandas as pd
+
+from indicators import get_indicators
+from streaming_indicators import indicator_states
+
+
+def get_technical_signals(history, symbol=None):
+    """
+    Calculate ADVANCED technical signals based on history.
+    Includes: RSI, MACD, EMA Trend, and Volume Analysis.
+    Indicators come from the shared indicator engine (memoized per symbol & last bar).
+    """
+    if len(history) < 50:
+        return {"signal": "NEUTRAL", "reason": ["Data historis kurang cukup untuk analisa akurat."]}
+    
+    ind = get_indicators(history, symbol)
+    current = history['Close'].iloc[-1]
+    
+    # 1. Moving Averages (Trend)
+    ema20 = ind.last('ema', 20)
+    ma50 = ind.last('sma', 50)
+    ma200 = ind.last('sma', 200)
+    
+    # 2. RSI (Momentum)
+    rsi = ind.last('rsi', 14)
+    
+    # 3. MACD (Trend Reversal & Momentum)
+    macd_val = ind.last('macd')
+    signal_val = ind.last('macd_signal')
+    
+    # Scoring Logic (Weighted)
+    score = 0
+    reasons = []
+    
+    # A. Trend Filter (Long Term)
+    if current < ma200:
+        score -= 2
+        reasons.append("Bearish Jangka Panjang (Harga < MA200)")
+    else:
+        score += 1
+        reasons.append("Bullish Jangka Panjang (Harga > MA200)")
+
+    # B. Trend (Short Term)
+    if current > ema20:
+        score += 1
+        reasons.append("Bullish Jangka Pendek (Harga > EMA20)")
+    else:
+        score -= 1
+        reasons.append("Bearish Jangka Pendek (Harga < EMA20)")
+        
+    # C. MACD Code
+    if macd_val > signal_val:
+        score += 1
+        reasons.append("MACD Bullish Crossover (Momentum Positif)")
+    else:
+        score -= 1
+        reasons.append("MACD Bearish Crossover (Momentum Negatif)")
+        
+    # D. RSI (Overbought/Oversold Filter)
+    if rsi < 30:
+        score += 2
+        reasons.append(f"RSI Oversold ({rsi:.1f}) - Potensi Rebound Kuat")
+    elif rsi > 70:
+        score -= 2
+        reasons.append(f"RSI Overbought ({rsi:.1f}) - Rawan Koreksi")
+    elif 45 <= rsi <= 55:
+        reasons.append(f"RSI Netral ({rsi:.1f})")
+    
+    # Final Decision
+    # Max Score approx +5, Min approx -6
+    
+    if score >= 3:
+        return {"signal": "STRONG BUY", "color": "green", "reason": reasons}
+    elif score >= 1:
+        return {"signal": "BUY", "color": "lightgreen", "reason": reasons}
+    elif score <= -3:
+        return {"signal": "STRONG SELL", "color": "red", "reason": reasons}
+    elif score <= -1:
+        return {"signal": "SELL", "color": "orange", "reason": reasons}
+    else:
+        return {"signal": "NEUTRAL / WAIT", "color": "gray", "reason": reasons}
+
+
+# Ambang & periode aturan sinyal multi-timeframe (bisa di-tuning lewat param_sweep.py)
+SIGNAL_PARAMS = {
+    'ema_fast': 5,                 # 1 Hari
+    'ema_mid': 10,                 # 3 Hari
+    'ema_slow': 20,                # 1 Minggu
+    'rsi_oversold': 25,            # Zona RSI ketat (1 Hari & 1 Minggu)
+    'rsi_overbought': 75,
+    'rsi_swing_oversold': 30,      # 3 Hari & filter 3 Bulan
+    'rsi_swing_overbought': 70,
+    'adx_trend': 25,               # ADX di bawah ini dianggap sideways
+    'volume_spike': 1.3,           # Volume hari ini vs rata-rata 20 hari
+}
+
+
+def get_multi_timeframe_signals(history, symbol=None, params=None):
+    """
+    PROFESSIONAL-GRADE Multi-Timeframe Signal Generator.
+    Based on Institutional Trading Rules:
+    1. Confluence Required (Trend + Momentum + Volume must align)
+    2. ADX Trend Strength Filter (No trading in sideways)
+    3. Volatility Filter (ATR-based)
+    4. Strict RSI zones (<25 oversold, >75 overbought)
+    5. Volume Spike Confirmation
+    With a symbol, indicator values come from the persisted streaming states (only new
+    bars are processed, the forming bar is peeked); without one, from the batch engine.
+    Thresholds & EMA spans come from SIGNAL_PARAMS, overridable per call via ``params``.
+    """
+    if history is None or history.empty:
+        return [
+            {"label": "1 Hari", "signal": "UNKNOWN", "color": "gray", "reason": "Data kosong"},
+            {"label": "3 Hari", "signal": "UNKNOWN", "color": "gray", "reason": "Data kosong"},
+            {"label": "1 Minggu", "signal": "UNKNOWN", "color": "gray", "reason": "Data kosong"},
+            {"label": "1 Bulan", "signal": "UNKNOWN", "color": "gray", "reason": "Data kosong"},
+            {"label": "2 Bulan", "signal": "UNKNOWN", "color": "gray", "reason": "Data kosong"},
+            {"label": "3 Bulan", "signal": "UNKNOWN", "color": "gray", "reason": "Data kosong"}
+        ]
+        
+    results = []
+    close = history['Close']
+    volume = history['Volume']
+    current = close.iloc[-1]
+    n = len(close)
+    ind = indicator_states.view(symbol, history) if symbol else get_indicators(history)
+    p = {**SIGNAL_PARAMS, **(params or {})}
+
+    # === PRECOMPUTE COMMON INDICATORS ===
+    ema5 = ind.last('ema', p['ema_fast'])
+    ema10 = ind.last('ema', p['ema_mid'])
+    ema20 = ind.last('ema', p['ema_slow'])
+    ma50 = ind.last('sma', 50) if n >= 50 else ema20
+    ma100 = ind.last('sma', 100) if n >= 100 else ma50
+    ma200 = ind.last('sma', 200) if n >= 200 else ma100
+    
+    adx = ind.last('adx', 14, default=20)
+    atr = ind.last('atr', 14)
+    atr_pct = (atr / current) * 100  # ATR as % of price
+    
+    vol_avg = ind.last('volume_sma', 20)
+    vol_today = volume.iloc[-1]
+    vol_spike = vol_today > vol_avg * p['volume_spike']
+    
+    # MACD
+    macd_val = ind.last('macd')
+    signal_val = ind.last('macd_signal')
+    macd_bullish = macd_val > signal_val
+    
+    # === MACRO GATE (Must Pass for ANY Buy) ===
+    macro_bullish = current > ma200  # Long-term uptrend
+    macro_bearish = current < ma200
+    trend_strong = adx > p['adx_trend']  # No sideways trading
+    
+    # === TIMEFRAME SIGNALS ===
+    
+    # --- 1 DAY (Scalping) ---
+    rsi_7 = ind.last('rsi', 7, default=50)
+    score_1d = 0
+    reason_1d = []
+    
+    # Gate 1: Must be in trend
+    if not trend_strong:
+        reason_1d.append(f"ADX < {p['adx_trend']} (Sideways)")
+    else:
+        if current > ema5:
+            score_1d += 1
+            reason_1d.append(f"Above EMA{p['ema_fast']}")
+        else:
+            score_1d -= 1
+            reason_1d.append(f"Below EMA{p['ema_fast']}")
+        
+        if rsi_7 < p['rsi_oversold']:
+            score_1d += 2
+            reason_1d.append(f"RSI < {p['rsi_oversold']} (Oversold)")
+        elif rsi_7 > p['rsi_overbought']:
+            score_1d -= 2
+            reason_1d.append(f"RSI > {p['rsi_overbought']} (Overbought)")
+        
+        if vol_spike:
+            score_1d += 1
+            reason_1d.append("Volume Spike")
+            
+    results.append(get_strict_signal(score_1d, "1 Hari", reason_1d, trend_strong))
+    
+    # --- 3 DAYS (Swing Short) ---
+    rsi_10 = ind.last('rsi', 10, default=50)
+    score_3d = 0
+    reason_3d = []
+    
+    if not trend_strong:
+        reason_3d.append(f"No Trend (ADX < {p['adx_trend']})")
+    else:
+        if current > ema10: 
+            score_3d += 1
+            reason_3d.append(f"Above EMA{p['ema_mid']}")
+        else: 
+            score_3d -= 1
+            reason_3d.append(f"Below EMA{p['ema_mid']}")
+        
+        if rsi_10 < p['rsi_swing_oversold']: 
+            score_3d += 1
+            reason_3d.append("RSI Oversold")
+        elif rsi_10 > p['rsi_swing_overbought']: 
+            score_3d -= 1
+            reason_3d.append("RSI Overbought")
+            
+        if macd_bullish:
+            score_3d += 1
+            reason_3d.append("MACD Bullish")
+        else:
+            score_3d -= 1
+            reason_3d.append("MACD Bearish")
+    
+    results.append(get_strict_signal(score_3d, "3 Hari", reason_3d, trend_strong))
+    
+    # --- 1 WEEK ---
+    rsi_14 = ind.last('rsi', 14, default=50)
+    score_1w = 0
+    reason_1w = []
+    
+    if current > ema20: 
+        score_1w += 1
+        reason_1w.append(f"Above EMA{p['ema_slow']}")
+    else: 
+        score_1w -= 1
+        reason_1w.append(f"Below EMA{p['ema_slow']}")
+    
+    if rsi_14 < p['rsi_oversold']: 
+        score_1w += 2
+        reason_1w.append("RSI Deep Oversold")
+    elif rsi_14 > p['rsi_overbought']: 
+        score_1w -= 2
+        reason_1w.append("RSI Overbought")
+    
+    if macd_bullish and trend_strong:
+        score_1w += 1
+        reason_1w.append("MACD+ADX Confirm")
+    elif not macd_bullish:
+        score_1w -= 1
+        reason_1w.append("MACD Bearish")
+    
+    results.append(get_strict_signal(score_1w, "1 Minggu", reason_1w, trend_strong))
+    
+    # --- 1 MONTH ---
+    score_1m = 0
+    reason_1m = []
+    
+    # Must be in primary uptrend for Buy
+    if current > ma50:
+        score_1m += 1
+        reason_1m.append("Above MA50")
+    else:
+        score_1m -= 2  # Stricter penalty
+        reason_1m.append("Below MA50 (No Buy)")
+    
+    if macd_bullish:
+        score_1m += 1
+        reason_1m.append("MACD Bullish")
+    else:
+        score_1m -= 1
+        reason_1m.append("MACD Bearish")
+    
+    if vol_spike:
+        score_1m += 1
+        reason_1m.append("Vol Confirm")
+    
+    results.append(get_strict_signal(score_1m, "1 Bulan", reason_1m, macro_bullish))
+    
+    # --- 2 MONTHS ---
+    score_2m = 0
+    reason_2m = []
+    
+    if current > ma100:
+        score_2m += 1
+        reason_2m.append("Above MA100")
+    else:
+        score_2m -= 2
+        reason_2m.append("Below MA100")
+    
+    if ma50 > ma100:
+        score_2m += 1
+        reason_2m.append("MA50 > MA100")
+    else:
+        score_2m -= 1
+        reason_2m.append("MA50 < MA100")
+    
+    results.append(get_strict_signal(score_2m, "2 Bulan", reason_2m, macro_bullish))
+    
+    # --- 3 MONTHS (Investor Grade) ---
+    score_3m = 0
+    reason_3m = []
+    
+    # STRICT: Must be above MA200 to consider buy
+    if current > ma200:
+        score_3m += 2
+        reason_3m.append("Above MA200")
+    else:
+        score_3m -= 3  # Very strict
+        reason_3m.append("Below MA200 (No Buy Zone)")
+    
+    # Golden/Death Cross
+    if ma50 > ma200:
+        score_3m += 1
+        reason_3m.append("Golden Cross Active")
+    else:
+        score_3m -= 2
+        reason_3m.append("Death Cross Active")
+    
+    # RSI should not be overbought for long-term entry
+    if rsi_14 > p['rsi_swing_overbought']:
+        score_3m -= 1
+        reason_3m.append("RSI High (Wait)")
+    
+    results.append(get_strict_signal(score_3m, "3 Bulan", reason_3m, macro_bullish))
+    
+    return results
+
+TIMEFRAME_LABELS = ["1 Hari", "3 Hari", "1 Minggu", "1 Bulan", "2 Bulan", "3 Bulan"]
+
+
+def strict_signal_series(score, gate_passed):
+    """Vectorized get_strict_signal: score & gate arrays -> signal label per bar."""
+    score = np.asarray(score)
+    gate_passed = np.asarray(gate_passed, dtype=bool)
+    return np.select(
+        [~gate_passed & (score > 0), score >= 3, score >= 2, score <= -3, score <= -2, score <= -1, score == 1],
+        ["WAIT", "STRONG BUY", "BUY", "STRONG SELL", "SELL", "WEAK SELL", "WAIT (Confirm)"],
+        default="NO TRADE",
+    )
+
+
+def multi_timeframe_signal_series(history, symbol=None, params=None, indicators=None):
+    """
+    Skor & sinyal get_multi_timeframe_signals untuk SETIAP bar, bukan hanya bar terakhir.
+    Seluruh aturan dihitung sekaligus (vektor) dari indicator engine; baris ke-i sama
+    dengan hasil get_multi_timeframe_signals(history.iloc[:i + 1], params=params).
+    `indicators` (IndicatorSet milik history) dipakai ulang bila diberikan, mis. saat parameter sweep.
+
+    Returns DataFrame (index = tanggal) dengan kolom '<label> Skor' dan '<label> Sinyal'.
+    """
+    if history is None or history.empty:
+        return pd.DataFrame(index=getattr(history, 'index', None))
+
+    ind = indicators if indicators is not None else get_indicators(history, symbol)
+    p = {**SIGNAL_PARAMS, **(params or {})}
+    current = history['Close'].to_numpy(dtype=float)
+    volume = history['Volume'].to_numpy(dtype=float)
+    bars = np.arange(1, len(current) + 1)  # "n" pada bar tersebut
+
+    ema5 = ind.series('ema', p['ema_fast']).to_numpy()
+    ema10 = ind.series('ema', p['ema_mid']).to_numpy()
+    ema20 = ind.series('ema', p['ema_slow']).to_numpy()
+    ma50 = np.where(bars >= 50, ind.series('sma', 50).to_numpy(), ema20)
+    ma100 = np.where(bars >= 100, ind.series('sma', 100).to_numpy(), ma50)
+    ma200 = np.where(bars >= 200, ind.series('sma', 200).to_numpy(), ma100)
+    adx = ind.series('adx', 14).fillna(20).to_numpy()
+    vol_spike = volume > ind.series('volume_sma', 20).to_numpy() * p['volume_spike']
+    macd_bullish = ind.series('macd').to_numpy() > ind.series('macd_signal').to_numpy()
+    rsi_7 = ind.series('rsi', 7).fillna(50).to_numpy()
+    rsi_10 = ind.series('rsi', 10).fillna(50).to_numpy()
+    rsi_14 = ind.series('rsi', 14).fillna(50).to_numpy()
+
+    macro_bullish = current > ma200
+    trend_strong = adx > p['adx_trend']
+    pm = lambda cond, up=1, down=-1: np.where(cond, up, down)
+
+    scores = [
+        np.where(trend_strong, pm(current > ema5) + np.select([rsi_7 < p['rsi_oversold'], rsi_7 > p['rsi_overbought']], [2, -2], 0)
+                 + vol_spike.astype(int), 0),
+        np.where(trend_strong, pm(current > ema10) + np.select([rsi_10 < p['rsi_swing_oversold'], rsi_10 > p['rsi_swing_overbought']], [1, -1], 0)
+                 + pm(macd_bullish), 0),
+        pm(current > ema20) + np.select([rsi_14 < p['rsi_oversold'], rsi_14 > p['rsi_overbought']], [2, -2], 0)
+        + np.select([macd_bullish & trend_strong, ~macd_bullish], [1, -1], 0),
+        pm(current > ma50, 1, -2) + pm(macd_bullish) + vol_spike.astype(int),
+        pm(current > ma100, 1, -2) + pm(ma50 > ma100),
+        pm(current > ma200, 2, -3) + pm(ma50 > ma200, 1, -2) - (rsi_14 > p['rsi_swing_overbought']).astype(int),
+    ]
+    gates = [trend_strong, trend_strong, trend_strong, macro_bullish, macro_bullish, macro_bullish]
+
+    columns = {}
+    for label, score, gate in zip(TIMEFRAME_LABELS, scores, gates):
+        columns[f"{label} Skor"] = score
+        columns[f"{label} Sinyal"] = strict_signal_series(score, gate)
+    return pd.DataFrame(columns, index=history.index)
+
+def get_strict_signal(score, label, reasons, gate_passed):
+    """
+    STRICT Signal Converter.
+    - Gate must pass for BUY signals
+    - Higher thresholds required
+    """
+    reason_str = " | ".join(reasons[:2]) if reasons else "-"  # Show max 2 reasons
+    
+    # If primary gate (trend/macro) failed, cap signal at NEUTRAL
+    if not gate_passed and score > 0:
+        return {"label": label, "signal": "WAIT", "color": "gray", "reason": "Gate Failed: " + reason_str}
+    
+    # STRICT Thresholds
+    if score >= 3:
+        return {"label": label, "signal": "STRONG BUY", "color": "green", "reason": reason_str}
+    elif score >= 2:
+        return {"label": label, "signal": "BUY", "color": "lightgreen", "reason": reason_str}
+    elif score <= -3:
+        return {"label": label, "signal": "STRONG SELL", "color": "red", "reason": reason_str}
+    elif score <= -2:
+        return {"label": label, "signal": "SELL", "color": "orange", "reason": reason_str}
+    elif score <= -1:
+        return {"label": label, "signal": "WEAK SELL", "color": "orange", "reason": reason_str}
+    elif score == 1:
+        return {"label": label, "signal": "WAIT (Confirm)", "color": "gray", "reason": reason_str}
+    else:
+        return {"label": label, "signal": "NO TRADE", "color": "gray", "reason": reason_str}
@@ -0,0 +1,91 @@
+"""Single-Flight Request Coalescing.
+
+When several sessions ask for the same upstream resource at the same time
+(for example ten users opening BBRI at market open), only the first caller
+runs the fetch; the others wait on it and share its result or exception.
+Nothing is kept once the call finishes — pair it with a cache for reuse.
+
+Compliance: OWASP API4 (Unrestricted Resource Consumption), CWE-770
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    """One in-flight call shared by every caller with the same key."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` unless a call for ``key`` is already in flight.
+
+        Args:
+            key: Identity of the upstream request, e.g. ('history', 'BBRI.JK', '5y').
+            fn: Function performing the request.
+
+        Returns:
+            The shared result. If the leading call raised, every waiter re-raises it.
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        """Return counters: total calls, upstream executions, coalesced calls, keys in flight."""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls),
+            }
+
+    def reset_stats(self) -> None:
+        """Reset the counters (in-flight calls are unaffected)."""
+        with self._lock:
+            self.calls = self.executions = self.coalesced = 0
+
+
+# Global coalescer for every Yahoo Finance request in this process
+yahoo_flight = SingleFlight()
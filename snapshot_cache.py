@@ -0,0 +1,309 @@
+"""Persistent Snapshot Cache for Yahoo Finance ``info`` Payloads.
+
+Stores ``ticker.info`` payloads in a local SQLite database (WAL mode), split
+into field groups that expire independently: prices go stale in minutes,
+fundamentals and company profile stay valid for hours. Because the cache
+lives on disk, Streamlit restarts, redeploys and extra replicas on the same
+host start warm instead of hitting Yahoo again.
+
+Each operation opens a short-lived connection with a busy timeout, so several
+processes can share one database file. Size on disk is capped: expired
+snapshots are dropped first, then the least recently accessed ones.
+
+Compliance: OWASP API4 (Unrestricted Resource Consumption), CWE-400
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+from logger import get_logger
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+DEFAULT_DB_NAME = 'yahoo_snapshots.sqlite3'
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # 50MB on disk
+ACCESS_TOUCH_INTERVAL = 60  # seconds between last_access updates for one row
+
+# ── Field Groups ─────────────────────────────────────────────
+PRICE_FIELDS = frozenset({
+    'regularMarketPrice', 'currentPrice', 'regularMarketPreviousClose', 'previousClose',
+    'regularMarketOpen', 'open', 'dayHigh', 'dayLow', 'regularMarketDayHigh',
+    'regularMarketDayLow', 'ask', 'bid', 'volume', 'regularMarketVolume',
+    'averageVolume', 'fiftyTwoWeekHigh', 'fiftyTwoWeekLow', 'marketCap',
+    'regularMarketChange', 'regularMarketChangePercent',
+})
+FUNDAMENTAL_FIELDS = frozenset({
+    'trailingPE', 'forwardPE', 'priceToBook', 'bookValue', 'debtToEquity',
+    'returnOnEquity', 'returnOnAssets', 'trailingEps', 'forwardEps',
+    'dividendRate', 'dividendYield', 'payoutRatio', 'sharesOutstanding',
+    'floatShares', 'institutionOwnership', 'heldPercentInstitutions',
+    'heldPercentInsiders', 'netIncomeToCommon', 'operatingCashflow',
+    'freeCashflow', 'freeCashFlow', 'totalAssets', 'totalStockholderEquity',
+    'totalDebt', 'totalRevenue', 'profitMargins', 'revenueGrowth', 'earningsGrowth',
+})
+GROUP_TTLS = {
+    'price': 300,             # 5 minutes
+    'fundamentals': 6 * 3600,  # 6 hours
+    'profile': 24 * 3600,     # 24 hours (sector, industry, description, ...)
+}
+ALL_GROUPS = tuple(GROUP_TTLS)
+QUOTE_GROUPS = ('price', 'fundamentals')
+
+
+def field_group(key: str) -> str:
+    """Return the field group an ``info`` key belongs to."""
+    if key in PRICE_FIELDS:
+        return 'price'
+    if key in FUNDAMENTAL_FIELDS:
+        return 'fundamentals'
+    return 'profile'
+
+
+def split_info(info: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Split an ``info`` payload into one dict per field group."""
+    groups: Dict[str, Dict[str, Any]] = {group: {} for group in ALL_GROUPS}
+    for key, value in info.items():
+        groups[field_group(key)][key] = value
+    return groups
+
+
+class SnapshotCache:
+    """SQLite-backed cache of Yahoo ``info`` snapshots shared across processes.
+
+    Args:
+        path: Database file path; defaults to ``$SAHAM_CACHE_DIR`` or ./cache.
+        max_bytes: Size cap on disk before eviction kicks in.
+        ttls: Per-group TTL overrides in seconds.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttls: Optional[Dict[str, float]] = None):
+        self._path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(GROUP_TTLS, **(ttls or {}))
+        self._lock = threading.Lock()
+        self._initialized = False
+        self.disabled = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            cache_dir = os.environ.get('SAHAM_CACHE_DIR', DEFAULT_CACHE_DIR)
+            self._path = os.path.join(cache_dir, DEFAULT_DB_NAME)
+        return self._path
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open a connection, creating the schema on first use.
+
+        Returns None (and disables the cache) if the file is not writable,
+        e.g. on read-only hosting — callers then fall back to Yahoo.
+        """
+        if self.disabled:
+            return None
+        try:
+            if not self._initialized:
+                with self._lock:
+                    if not self._initialized:
+                        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+                        conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+                        conn.execute('PRAGMA journal_mode=WAL')
+                        conn.execute(
+                            'CREATE TABLE IF NOT EXISTS snapshots ('
+                            ' symbol TEXT NOT NULL,'
+                            ' field_group TEXT NOT NULL,'
+                            ' payload TEXT NOT NULL,'
+                            ' fetched_at REAL NOT NULL,'
+                            ' last_access REAL NOT NULL,'
+                            ' size INTEGER NOT NULL,'
+                            ' PRIMARY KEY (symbol, field_group))'
+                        )
+                        conn.execute('CREATE INDEX IF NOT EXISTS idx_snapshots_access ON snapshots(last_access)')
+                        conn.close()
+                        self._initialized = True
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute('PRAGMA busy_timeout=5000')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            return conn
+        except (sqlite3.Error, OSError) as e:
+            get_logger().warning(f"Snapshot cache disabled ({self.path}): {e}")
+            self.disabled = True
+            return None
+
+    def get_many(self, symbols: Iterable[str], groups: Sequence[str] = ALL_GROUPS,
+                 max_age: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Return merged ``info`` dicts for symbols whose requested groups are all fresh.
+
+        Args:
+            symbols: Yahoo symbols (e.g. 'BBCA.JK').
+            groups: Field groups the caller needs.
+            max_age: Optional tighter freshness bound in seconds for every group.
+
+        Returns:
+            Dict of symbol -> merged payload, only for full hits.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        conn = self._connect()
+        if conn is None:
+            self._count(0, len(symbols))
+            return {}
+        now = time.time()
+        found: Dict[str, Dict[str, Any]] = {}
+        try:
+            rows: Dict[str, Dict[str, Any]] = {}
+            for start in range(0, len(symbols), 500):
+                chunk = symbols[start:start + 500]
+                marks = ','.join('?' * len(chunk))
+                cursor = conn.execute(
+                    f'SELECT symbol, field_group, payload, fetched_at FROM snapshots '
+                    f'WHERE symbol IN ({marks})', chunk,
+                )
+                for symbol, group, payload, fetched_at in cursor:
+                    ttl = self.ttls.get(group, 0)
+                    if max_age is not None:
+                        ttl = min(ttl, max_age)
+                    if group in groups and now - fetched_at < ttl:
+                        rows.setdefault(symbol, {})[group] = payload
+            for symbol, payloads in rows.items():
+                if all(group in payloads for group in groups):
+                    merged: Dict[str, Any] = {}
+                    for group in groups:
+                        merged.update(json.loads(payloads[group]))
+                    found[symbol] = merged
+            if found:
+                hit_symbols = list(found)
+                marks = ','.join('?' * len(hit_symbols))
+                conn.execute(
+                    f'UPDATE snapshots SET last_access = ? WHERE symbol IN ({marks}) AND last_access < ?',
+                    [now, *hit_symbols, now - ACCESS_TOUCH_INTERVAL],
+                )
+        except (sqlite3.Error, ValueError) as e:
+            get_logger().warning(f"Snapshot cache read failed: {e}")
+            found = {}
+        finally:
+            conn.close()
+        self._count(len(found), len(symbols) - len(found))
+        return found
+
+    def get(self, symbol: str, groups: Sequence[str] = ALL_GROUPS,
+            max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Return the merged payload for one symbol, or None on a miss."""
+        return self.get_many([symbol], groups, max_age).get(symbol)
+
+    def put(self, symbol: str, info: Dict[str, Any]) -> None:
+        """Store a full ``info`` payload, replacing every field group."""
+        self._write(symbol, split_info(info), merge=False)
+
+    def update_group(self, symbol: str, group: str, fields: Dict[str, Any]) -> None:
+        """Merge ``fields`` into one group's payload and mark it fresh."""
+        self._write(symbol, {group: fields}, merge=True)
+
+    def _write(self, symbol: str, groups: Dict[str, Dict[str, Any]], merge: bool) -> None:
+        conn = self._connect()
+        if conn is None:
+            return
+        now = time.time()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            for group, fields in groups.items():
+                if merge:
+                    row = conn.execute(
+                        'SELECT payload FROM snapshots WHERE symbol = ? AND field_group = ?',
+                        (symbol, group),
+                    ).fetchone()
+                    if row:
+                        fields = dict(json.loads(row[0]), **fields)
+                payload = json.dumps(fields, default=str)
+                conn.execute(
+                    'INSERT OR REPLACE INTO snapshots '
+                    '(symbol, field_group, payload, fetched_at, last_access, size) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (symbol, group, payload, now, now, len(payload)),
+                )
+            conn.execute('COMMIT')
+            self._enforce_size_cap(conn, now)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            get_logger().warning(f"Snapshot cache write failed for {symbol}: {e}")
+            try:
+                conn.execute('ROLLBACK')
+            except sqlite3.Error:
+                pass
+        finally:
+            conn.close()
+
+    def _size_on_disk(self, conn: sqlite3.Connection) -> int:
+        page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+        page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+        return page_count * page_size
+
+    def _enforce_size_cap(self, conn: sqlite3.Connection, now: float) -> None:
+        """Evict expired, then least recently accessed snapshots until under the cap."""
+        if self._size_on_disk(conn) <= self.max_bytes:
+            return
+        oldest_ttl = max(self.ttls.values())
+        removed = conn.execute('DELETE FROM snapshots WHERE fetched_at < ?', (now - oldest_ttl,)).rowcount
+        # Payload bytes approximate table bytes; trim to 80% to avoid evicting on every write.
+        target = int(self.max_bytes * 0.8)
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM snapshots').fetchone()[0]
+        if total > target:
+            excess = total - target
+            cutoff = None
+            running = 0
+            for last_access, size in conn.execute('SELECT last_access, size FROM snapshots ORDER BY last_access'):
+                running += size
+                cutoff = last_access
+                if running >= excess:
+                    break
+            if cutoff is not None:
+                removed += conn.execute('DELETE FROM snapshots WHERE last_access <= ?', (cutoff,)).rowcount
+        conn.execute('PRAGMA incremental_vacuum')
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        with self._lock:
+            self.evictions += removed
+
+    def _count(self, hits: int, misses: int) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters for this process plus on-disk totals."""
+        result = {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                  'entries': 0, 'size_bytes': 0, 'disabled': self.disabled}
+        conn = self._connect()
+        if conn is None:
+            result['disabled'] = True
+            return result
+        try:
+            result['entries'] = conn.execute('SELECT COUNT(*) FROM snapshots').fetchone()[0]
+            result['size_bytes'] = self._size_on_disk(conn)
+        except sqlite3.Error:
+            pass
+        finally:
+            conn.close()
+        return result
+
+    def clear(self) -> None:
+        """Delete every snapshot and reset the counters."""
+        conn = self._connect()
+        if conn is not None:
+            try:
+                conn.execute('DELETE FROM snapshots')
+                conn.execute('PRAGMA incremental_vacuum')
+            except sqlite3.Error:
+                pass
+            finally:
+                conn.close()
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+
+# Global snapshot cache shared by every page in this process
+snapshot_cache = SnapshotCache()
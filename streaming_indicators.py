@@ -0,0 +1,565 @@
+"""Incremental O(1)-per-Bar Streaming Indicators.
+
+Each streaming indicator keeps just enough state (last EMA value, running
+window sums, previous close) to absorb a new bar in constant time instead of
+re-running ``rolling``/``ewm`` over five years of history. The formulas match
+the batch indicator engine (``indicators.py``) bar for bar, including its
+warm-up periods and NaN handling.
+
+``update(bar)`` commits a completed bar; ``peek(bar)`` returns the values as
+if ``bar`` were appended without changing state, which is how the still
+forming intraday bar is evaluated on every refresh.
+
+``indicator_states.view(symbol, history)`` exposes those latest values
+through ``IndicatorSet.last``, so the analysis page's multi-timeframe
+signals read them instead of re-running the rolling windows on every
+refresh; windows outside ``DEFAULT_SPECS`` fall back to the batch engine.
+
+States serialize to JSON and are stored next to the cached history
+(``<bar store>/<symbol>.indicators.json``), so a refresh across hundreds of
+symbols only processes the bars that arrived since the last run.
+
+Compliance: OWASP API4 (Unrestricted Resource Consumption), CWE-400
+"""
+import json
+import math
+import os
+import re
+import threading
+from collections import deque
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import pandas as pd
+
+from logger import get_logger
+
+STATE_VERSION = 1
+CLOSE_RTOL = 1e-4   # Relative drift on the last committed close that forces a reseed
+
+# Default indicator set: the windows the signal generators read
+DEFAULT_SPECS: List[Tuple[str, Optional[int]]] = [
+    ('ema', 5), ('ema', 10), ('ema', 20),
+    ('sma', 50), ('sma', 100), ('sma', 200),
+    ('rsi', 7), ('rsi', 10), ('rsi', 14),
+    ('macd', None), ('atr', 14), ('adx', 14), ('volume_sma', 20),
+]
+
+Bar = Mapping[str, float]
+
+
+def _is_nan(x: Optional[float]) -> bool:
+    return x is None or (isinstance(x, float) and math.isnan(x))
+
+
+class RollingMean:
+    """Fixed-window mean with a running sum; None until the window is full or while it holds a NaN."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque(maxlen=window)
+        self.total = 0.0
+        self.nan_count = 0
+
+    def _mean(self, total: float, count: int, nan_count: int) -> Optional[float]:
+        if count < self.window or nan_count:
+            return None
+        return total / self.window
+
+    def push(self, x: float) -> Optional[float]:
+        if len(self.values) == self.window:
+            old = self.values[0]
+            if _is_nan(old):
+                self.nan_count -= 1
+            else:
+                self.total -= old
+        self.values.append(x)
+        if _is_nan(x):
+            self.nan_count += 1
+        else:
+            self.total += x
+        return self.mean
+
+    def peek(self, x: float) -> Optional[float]:
+        total, nan_count, count = self.total, self.nan_count, len(self.values) + 1
+        if len(self.values) == self.window:
+            old = self.values[0]
+            count -= 1
+            if _is_nan(old):
+                nan_count -= 1
+            else:
+                total -= old
+        if _is_nan(x):
+            nan_count += 1
+        else:
+            total += x
+        return self._mean(total, count, nan_count)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self._mean(self.total, len(self.values), self.nan_count)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'window': self.window, 'values': list(self.values)}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'RollingMean':
+        rm = cls(data['window'])
+        for x in data['values']:
+            rm.push(float('nan') if x is None else x)
+        return rm
+
+
+def _ema_step(value: Optional[float], x: float, alpha: float) -> float:
+    return x if value is None else value + alpha * (x - value)
+
+
+class StreamingEMA:
+    """EMA of the close, as ``ewm(span=window, adjust=False)``."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.alpha = 2.0 / (window + 1)
+        self.value: Optional[float] = None
+
+    def update(self, bar: Bar) -> Optional[float]:
+        self.value = _ema_step(self.value, bar['Close'], self.alpha)
+        return self.value
+
+    def peek(self, bar: Bar) -> Optional[float]:
+        return _ema_step(self.value, bar['Close'], self.alpha)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'window': self.window, 'value': self.value}
+
+    @classmethod
+    def from_dict(cls, data):
+        ind = cls(data['window'])
+        ind.value = data['value']
+        return ind
+
+
+class _RollingField:
+    """Simple moving average of one bar field."""
+    field = 'Close'
+
+    def __init__(self, window: int):
+        self.window = window
+        self.mean = RollingMean(window)
+        self.value: Optional[float] = None
+
+    def update(self, bar: Bar) -> Optional[float]:
+        self.value = self.mean.push(bar[self.field])
+        return self.value
+
+    def peek(self, bar: Bar) -> Optional[float]:
+        return self.mean.peek(bar[self.field])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'window': self.window, 'mean': self.mean.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        ind = cls(data['window'])
+        ind.mean = RollingMean.from_dict(data['mean'])
+        ind.value = ind.mean.mean
+        return ind
+
+
+class StreamingSMA(_RollingField):
+    field = 'Close'
+
+
+class StreamingVolumeSMA(_RollingField):
+    field = 'Volume'
+
+
+def _rsi_value(gain: Optional[float], loss: Optional[float]) -> Optional[float]:
+    if gain is None or loss is None:
+        return None
+    if loss == 0:
+        return 100.0 if gain > 0 else None
+    return 100 - 100 / (1 + gain / loss)
+
+
+class StreamingRSI:
+    """RSI with simple rolling means of gains and losses (same as the batch engine)."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.gains = RollingMean(window)
+        self.losses = RollingMean(window)
+        self.prev_close: Optional[float] = None
+        self.value: Optional[float] = None
+
+    def update(self, bar: Bar) -> Optional[float]:
+        close = bar['Close']
+        if self.prev_close is not None:
+            delta = close - self.prev_close
+            self.value = _rsi_value(self.gains.push(max(delta, 0.0)), self.losses.push(max(-delta, 0.0)))
+        self.prev_close = close
+        return self.value
+
+    def peek(self, bar: Bar) -> Optional[float]:
+        if self.prev_close is None:
+            return None
+        delta = bar['Close'] - self.prev_close
+        return _rsi_value(self.gains.peek(max(delta, 0.0)), self.losses.peek(max(-delta, 0.0)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'window': self.window, 'gains': self.gains.to_dict(), 'losses': self.losses.to_dict(),
+                'prev_close': self.prev_close, 'value': self.value}
+
+    @classmethod
+    def from_dict(cls, data):
+        ind = cls(data['window'])
+        ind.gains = RollingMean.from_dict(data['gains'])
+        ind.losses = RollingMean.from_dict(data['losses'])
+        ind.prev_close, ind.value = data['prev_close'], data['value']
+        return ind
+
+
+class StreamingMACD:
+    """MACD line (EMA12 - EMA26) and its EMA9 signal line."""
+
+    def __init__(self, window: Optional[int] = None):
+        self.window = None
+        self.fast: Optional[float] = None
+        self.slow: Optional[float] = None
+        self.signal: Optional[float] = None
+        self.value: Optional[float] = None
+
+    def _step(self, close: float):
+        fast = _ema_step(self.fast, close, 2.0 / 13)
+        slow = _ema_step(self.slow, close, 2.0 / 27)
+        macd = fast - slow
+        return fast, slow, macd, _ema_step(self.signal, macd, 2.0 / 10)
+
+    def update(self, bar: Bar) -> Optional[float]:
+        self.fast, self.slow, self.value, self.signal = self._step(bar['Close'])
+        return self.value
+
+    def peek(self, bar: Bar) -> Optional[float]:
+        return self._step(bar['Close'])[2]
+
+    def peek_signal(self, bar: Bar) -> Optional[float]:
+        return self._step(bar['Close'])[3]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'window': None, 'fast': self.fast, 'slow': self.slow, 'signal': self.signal, 'value': self.value}
+
+    @classmethod
+    def from_dict(cls, data):
+        ind = cls()
+        ind.fast, ind.slow, ind.signal, ind.value = data['fast'], data['slow'], data['signal'], data['value']
+        return ind
+
+
+def _true_range(bar: Bar, prev_close: Optional[float]) -> float:
+    if prev_close is None:
+        return bar['High'] - bar['Low']
+    return max(bar['High'] - bar['Low'], abs(bar['High'] - prev_close), abs(bar['Low'] - prev_close))
+
+
+class StreamingATR:
+    """ATR as a simple rolling mean of the true range."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.tr = RollingMean(window)
+        self.prev_close: Optional[float] = None
+        self.value: Optional[float] = None
+
+    def update(self, bar: Bar) -> Optional[float]:
+        self.value = self.tr.push(_true_range(bar, self.prev_close))
+        self.prev_close = bar['Close']
+        return self.value
+
+    def peek(self, bar: Bar) -> Optional[float]:
+        return self.tr.peek(_true_range(bar, self.prev_close))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'window': self.window, 'tr': self.tr.to_dict(), 'prev_close': self.prev_close, 'value': self.value}
+
+    @classmethod
+    def from_dict(cls, data):
+        ind = cls(data['window'])
+        ind.tr = RollingMean.from_dict(data['tr'])
+        ind.prev_close, ind.value = data['prev_close'], data['value']
+        return ind
+
+
+class StreamingADX:
+    """Simplified ADX (rolling means of +DM, -DM, TR and DX), as in the batch engine."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.tr = RollingMean(window)
+        self.plus_dm = RollingMean(window)
+        self.minus_dm = RollingMean(window)
+        self.dx = RollingMean(window)
+        self.prev: Optional[Tuple[float, float, float]] = None  # (high, low, close)
+        self.value: Optional[float] = None
+
+    def _inputs(self, bar: Bar):
+        prev_close = self.prev[2] if self.prev else None
+        tr = _true_range(bar, prev_close)
+        if self.prev is None:
+            return tr, None
+        up, down = bar['High'] - self.prev[0], self.prev[1] - bar['Low']
+        plus = 0.0 if (up < 0 or up <= down) else up
+        minus = 0.0 if (down < 0 or down <= up) else down
+        return tr, (plus, minus)
+
+    @staticmethod
+    def _dx(atr: Optional[float], plus: Optional[float], minus: Optional[float]) -> Optional[float]:
+        if atr is None or plus is None or minus is None:
+            return None
+        if atr == 0:
+            return float('nan')  # 0/0 in the batch engine
+        plus_di, minus_di = 100 * plus / atr, 100 * minus / atr
+        return 100 * abs(plus_di - minus_di) / (plus_di + minus_di + 0.0001)
+
+    def update(self, bar: Bar) -> Optional[float]:
+        tr, dm = self._inputs(bar)
+        atr = self.tr.push(tr)
+        if dm is not None:
+            dx = self._dx(atr, self.plus_dm.push(dm[0]), self.minus_dm.push(dm[1]))
+            if dx is not None:
+                self.value = self.dx.push(dx)
+        self.prev = (bar['High'], bar['Low'], bar['Close'])
+        return self.value
+
+    def peek(self, bar: Bar) -> Optional[float]:
+        tr, dm = self._inputs(bar)
+        if dm is None:
+            return None
+        dx = self._dx(self.tr.peek(tr), self.plus_dm.peek(dm[0]), self.minus_dm.peek(dm[1]))
+        return None if dx is None else self.dx.peek(dx)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'window': self.window, 'tr': self.tr.to_dict(), 'plus_dm': self.plus_dm.to_dict(),
+                'minus_dm': self.minus_dm.to_dict(), 'dx': self.dx.to_dict(),
+                'prev': list(self.prev) if self.prev else None, 'value': self.value}
+
+    @classmethod
+    def from_dict(cls, data):
+        ind = cls(data['window'])
+        for name in ('tr', 'plus_dm', 'minus_dm', 'dx'):
+            setattr(ind, name, RollingMean.from_dict(data[name]))
+        ind.prev = tuple(data['prev']) if data['prev'] else None
+        ind.value = data['value']
+        return ind
+
+
+STREAMING_INDICATORS = {
+    'ema': StreamingEMA,
+    'sma': StreamingSMA,
+    'rsi': StreamingRSI,
+    'macd': StreamingMACD,
+    'atr': StreamingATR,
+    'adx': StreamingADX,
+    'volume_sma': StreamingVolumeSMA,
+}
+
+
+def _column(name: str, window: Optional[int]) -> str:
+    return f"{name.upper()}{window if window is not None else ''}"
+
+
+def _bars(history: pd.DataFrame):
+    for ts, high, low, close, volume in zip(history.index, history['High'], history['Low'],
+                                            history['Close'], history['Volume']):
+        yield ts, {'High': float(high), 'Low': float(low), 'Close': float(close), 'Volume': float(volume)}
+
+
+class StreamingIndicators:
+    """A named set of streaming indicators advanced together, bar by bar.
+
+    Values are keyed like the batch engine's columns: 'EMA20', 'RSI14',
+    'MACD', 'MACD_SIGNAL', 'ADX14', ...
+    """
+
+    def __init__(self, specs: Optional[List[Tuple[str, Optional[int]]]] = None):
+        self.specs = list(DEFAULT_SPECS if specs is None else specs)
+        self.indicators = {_column(n, w): STREAMING_INDICATORS[n](w) for n, w in self.specs}
+        self.last_timestamp: Optional[pd.Timestamp] = None
+        self.last_close: Optional[float] = None
+        self.bars = 0
+
+    def update(self, timestamp, bar: Bar) -> None:
+        """Commit one completed bar (O(1) per indicator)."""
+        for ind in self.indicators.values():
+            ind.update(bar)
+        self.last_timestamp = pd.Timestamp(timestamp)
+        self.last_close = bar['Close']
+        self.bars += 1
+
+    def values(self) -> Dict[str, Optional[float]]:
+        """Indicator values after the last committed bar."""
+        out = {col: ind.value for col, ind in self.indicators.items()}
+        out.update({f"{col}_SIGNAL": ind.signal for col, ind in self.indicators.items()
+                    if isinstance(ind, StreamingMACD)})
+        return out
+
+    def peek(self, bar: Bar) -> Dict[str, Optional[float]]:
+        """Indicator values if ``bar`` were appended, without committing it."""
+        out = {col: ind.peek(bar) for col, ind in self.indicators.items()}
+        out.update({f"{col}_SIGNAL": ind.peek_signal(bar) for col, ind in self.indicators.items()
+                    if isinstance(ind, StreamingMACD)})
+        return out
+
+    @classmethod
+    def from_history(cls, history: pd.DataFrame,
+                     specs: Optional[List[Tuple[str, Optional[int]]]] = None) -> 'StreamingIndicators':
+        """Seed a state by replaying ``history`` (the one-off O(n) step)."""
+        state = cls(specs)
+        state.extend(history)
+        return state
+
+    def extend(self, history: pd.DataFrame) -> int:
+        """Commit every bar of ``history`` newer than the last committed bar; returns bars applied."""
+        if self.last_timestamp is not None and not history.empty:
+            history = history[history.index > self.last_timestamp]
+        applied = 0
+        for ts, bar in _bars(history):
+            self.update(ts, bar)
+            applied += 1
+        return applied
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': STATE_VERSION,
+            'specs': [[n, w] for n, w in self.specs],
+            'last_timestamp': self.last_timestamp.isoformat() if self.last_timestamp is not None else None,
+            'last_close': self.last_close,
+            'bars': self.bars,
+            'indicators': {col: ind.to_dict() for col, ind in self.indicators.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'StreamingIndicators':
+        if data.get('version') != STATE_VERSION:
+            raise ValueError(f"Unsupported indicator state version: {data.get('version')!r}")
+        state = cls([(n, w) for n, w in data['specs']])
+        for (name, window), col in zip(state.specs, state.indicators):
+            state.indicators[col] = STREAMING_INDICATORS[name].from_dict(data['indicators'][col])
+        if data['last_timestamp']:
+            state.last_timestamp = pd.Timestamp(data['last_timestamp'])
+        state.last_close, state.bars = data['last_close'], data['bars']
+        return state
+
+
+class LatestIndicators:
+    """Read-only ``IndicatorSet.last`` over streaming values at the last bar of ``history``."""
+
+    def __init__(self, values: Mapping[str, Optional[float]], history: pd.DataFrame,
+                 symbol: Optional[str] = None):
+        self.values = values
+        self.history = history
+        self.symbol = symbol
+        self._batch = None
+
+    def last(self, name: str, window: Optional[int] = None, default: Any = float('nan')) -> Any:
+        """Latest value like ``IndicatorSet.last``; ``default`` while the indicator is warming up."""
+        column = _column(name, window)
+        if column not in self.values:
+            if self._batch is None:
+                from indicators import get_indicators
+                self._batch = get_indicators(self.history, self.symbol)
+            return self._batch.last(name, window, default)
+        value = self.values[column]
+        return default if _is_nan(value) else value
+
+
+class IndicatorStateStore:
+    """Persist streaming indicator states next to the bar store's history files.
+
+    Args:
+        root: Directory for ``<symbol>.indicators.json``; defaults to the bar store directory.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self._root = root
+        self._lock = threading.Lock()
+        self._states: Dict[str, StreamingIndicators] = {}
+        self.disabled = False
+        self.reseeds = 0
+
+    @property
+    def root(self) -> str:
+        if self._root is None:
+            from bar_store import bar_store
+            self._root = bar_store.root
+        return self._root
+
+    def _path(self, symbol: str) -> str:
+        safe = re.sub(r'[^A-Za-z0-9._^-]', '_', symbol)
+        return os.path.join(self.root, f"{safe}.indicators.json")
+
+    def _load(self, symbol: str) -> Optional[StreamingIndicators]:
+        try:
+            with open(self._path(symbol), 'r', encoding='utf-8') as f:
+                return StreamingIndicators.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            get_logger().warning(f"Indicator state unreadable for {symbol}: {type(e).__name__}: {e}")
+            return None
+
+    def _save(self, symbol: str, state: StreamingIndicators) -> None:
+        if self.disabled:
+            return
+        path = self._path(symbol)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state.to_dict(), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            get_logger().warning(f"Indicator state store disabled ({self.root}): {e}")
+            self.disabled = True
+
+    @staticmethod
+    def _matches(state: StreamingIndicators, history: pd.DataFrame) -> bool:
+        """True if the committed state still agrees with ``history`` (no rebuild/re-adjustment)."""
+        ts = state.last_timestamp
+        if ts is None or ts not in history.index:
+            return False
+        close = float(history.loc[ts, 'Close'])
+        return abs(close - state.last_close) <= CLOSE_RTOL * abs(close)
+
+    def latest(self, symbol: str, history: pd.DataFrame) -> Dict[str, Optional[float]]:
+        """Indicator values at the last bar of ``history``.
+
+        All bars but the last are committed (only the ones not seen before);
+        the last bar, which may still be forming, is peeked.
+        """
+        if history is None or history.empty:
+            return {}
+        completed = history.iloc[:-1]
+        with self._lock:
+            state = self._states.get(symbol) or self._load(symbol)
+            if state is not None and not completed.empty and not self._matches(state, completed):
+                state = None
+                self.reseeds += 1
+            if state is None:
+                state = StreamingIndicators.from_history(completed)
+                applied = len(completed)
+            else:
+                applied = state.extend(completed)
+            self._states[symbol] = state
+            if applied:
+                self._save(symbol, state)
+            ts, bar = next(_bars(history.iloc[-1:]))
+            if state.last_timestamp is not None and ts <= state.last_timestamp:
+                return state.values()
+            return state.peek(bar)
+
+    def view(self, symbol: str, history: pd.DataFrame) -> LatestIndicators:
+        """``latest`` wrapped for code written against ``IndicatorSet.last``."""
+        return LatestIndicators(self.latest(symbol, history), history, symbol)
+
+
+# Global state store shared by every page in this process
+indicator_states = IndicatorStateStore()
@@ -34,6 +34,10 @@ from pages_calculators import calculate_profit_loss
 from pages_ara_arb import calculate_ara_arb_sequence
 from utils import get_tick_size, get_ara_arb_percentage, round_price_to_tick
 
+import numpy as np
+import pandas as pd
+
+
 class TestFinancialLogic(unittest.TestCase):
 
     def test_calculate_profit_loss(self):
@@ -121,5 +125,284 @@ class TestFinancialLogic(unittest.TestCase):
             self.assertLess(arb_seq[0]['harga'], 1000)
             self.assertEqual(arb_seq[0]['tipe'], 'arb')
 
+
+class TestSignalBacktest(unittest.TestCase):
+    """Per-bar multi-timeframe signals and the vectorized backtester."""
+
+    def make_history(self, n=300, seed=11):
+        rng = np.random.default_rng(seed)
+        close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.025, n)))
+        return pd.DataFrame({
+            'Open': close * (1 + rng.normal(0, 0.005, n)), 'High': close * 1.02, 'Low': close * 0.98,
+            'Close': close, 'Volume': rng.integers(1000, 9000, n).astype(float),
+        }, index=pd.date_range('2022-01-03', periods=n, freq='B'))
+
+    def test_signal_series_matches_last_bar_function(self):
+        from signals import get_multi_timeframe_signals, multi_timeframe_signal_series
+        history = self.make_history()
+        series = multi_timeframe_signal_series(history)
+        for i in list(range(0, 300, 7)) + [299]:
+            for tf in get_multi_timeframe_signals(history.iloc[:i + 1]):
+                self.assertEqual(series[f"{tf['label']} Sinyal"].iloc[i], tf['signal'], (i, tf['label']))
+
+    def test_trade_uses_next_open_tick_rounding_and_fees(self):
+        from backtest import backtest_signals
+        index = pd.date_range('2024-01-01', periods=6, freq='B')
+        history = pd.DataFrame({'Open': [1000, 1010, 1021, 1100, 1200, 1152],
+                                'Close': [1005, 1015, 1090, 1190, 1160, 1150]}, index=index)
+        signals = pd.Series(['NO TRADE', 'BUY', 'NO TRADE', 'NO TRADE', 'SELL', 'NO TRADE'], index=index)
+        result = backtest_signals(history, signals, platform='IPOT', capital=1_000_000)
+        trade = result['trades'].iloc[0]
+        self.assertEqual(trade['Tanggal Beli'], index[2])      # Next bar after the BUY close
+        self.assertEqual(trade['Harga Beli'], 1025)            # 1021 rounded up to tick 5
+        self.assertEqual(trade['Harga Jual'], 1150)            # 1152 rounded down to tick 5
+        self.assertEqual(trade['Lot'], 9)
+        cost = 900 * 1025 * 1.0019
+        proceeds = 900 * 1150 * (1 - 0.0029)
+        self.assertAlmostEqual(trade['P/L (Rp)'], proceeds - cost)
+        self.assertAlmostEqual(result['total_pl'], proceeds - cost)
+        self.assertEqual(result['win_rate'], 100.0)
+        self.assertAlmostEqual(result['equity'].iloc[2], 1_000_000 - cost + 900 * 1090)
+        self.assertLess(result['max_drawdown_pct'], 0)
+
+    def test_open_position_marked_to_market(self):
+        from backtest import backtest_signals
+        index = pd.date_range('2024-01-01', periods=4, freq='B')
+        history = pd.DataFrame({'Open': [100, 100, 110, 120], 'Close': [100, 105, 115, 130]}, index=index)
+        result = backtest_signals(history, pd.Series(['BUY'] * 4, index=index), platform='Custom', capital=10_000)
+        self.assertEqual(result['trades'].iloc[0]['Status'], 'Terbuka')
+        self.assertEqual(result['win_rate'], 0.0)  # Only closed trades count
+        self.assertAlmostEqual(result['total_pl'], 100 * (130 - 100))
+
+    def test_five_year_history(self):
+        from backtest import backtest_signals
+        from signals import multi_timeframe_signal_series
+        history = self.make_history(n=1250)
+        signals = multi_timeframe_signal_series(history)
+        result = backtest_signals(history, signals['1 Bulan Sinyal'])
+        self.assertEqual(len(signals), 1250)
+        self.assertEqual(len(result['equity']), 1250)
+
+
+class TestVectorizedPriceRules(unittest.TestCase):
+    """Array tick/ARA/ARB primitives agree exactly with the scalar rules."""
+
+    def prices(self):
+        edges = np.array([10, 200, 500, 2000, 5000], dtype=float)
+        return np.concatenate([
+            np.arange(1, 60001, dtype=float),
+            np.arange(0.5, 12000, 0.37),
+            edges, np.nextafter(edges, 0), np.nextafter(edges, np.inf),
+        ])
+
+    def test_tick_and_percentage_match_scalar(self):
+        from utils import tick_sizes, ara_arb_percentages
+        prices = self.prices()
+        self.assertEqual(list(tick_sizes(prices)), [get_tick_size(p) for p in prices])
+        for board in ('regular', 'acceleration'):
+            self.assertEqual(list(ara_arb_percentages(prices, board)),
+                             [get_ara_arb_percentage(p, board) for p in prices])
+        # Scalars and lists in, same types out
+        self.assertEqual(tick_sizes(200), 2)
+        self.assertIsInstance(tick_sizes(200), int)
+        self.assertEqual(list(tick_sizes([199, 5000])), [1, 25])
+
+    def test_rounding_matches_scalar(self):
+        from utils import round_prices_to_ticks, tick_sizes
+        prices = self.prices() * 1.2345
+        ticks = tick_sizes(prices)
+        for mode in ('floor', 'ceil', 'nearest'):
+            self.assertEqual(list(round_prices_to_ticks(prices, ticks, mode)),
+                             [round_price_to_tick(p, t, mode) for p, t in zip(prices, ticks)])
+        self.assertEqual(round_prices_to_ticks(203, 2, 'ceil'), 204)
+
+    def test_limits_match_sequence_first_step(self):
+        from utils import ara_arb_limits
+        prices = np.arange(1, 20001)
+        for accel in (False, True):
+            ara, arb = ara_arb_limits(prices, 'acceleration' if accel else 'regular')
+            for p, a, b in zip(prices[::7], ara[::7], arb[::7]):
+                ara_seq, arb_seq = calculate_ara_arb_sequence(int(p), is_acceleration=accel, max_steps=1)
+                self.assertEqual(a, ara_seq[0]['harga'])
+                self.assertEqual(b, arb_seq[0]['harga'] if arb_seq else p)
+        self.assertEqual(ara_arb_limits(1000), (1250, 850))
+
+
+class TestPriceLadder(unittest.TestCase):
+    """Precomputed ARA/ARB ladder agrees with the step-by-step rules."""
+
+    def test_rungs_cover_every_valid_price(self):
+        from price_ladder import price_ladder, OFF_LADDER
+        prices = price_ladder.prices
+        self.assertEqual(list(prices[:3]), [1, 2, 3])
+        self.assertEqual(list(prices[198:202]), [199, 200, 202, 204])
+        self.assertTrue((np.diff(prices) == [get_tick_size(p) for p in prices[:-1]]).all())
+        self.assertTrue((price_ladder.rungs(prices) == np.arange(len(prices))).all())
+        for price in (0, 201, 503, 1000.5, price_ladder.top + 25):
+            self.assertEqual(price_ladder.rung(price), OFF_LADDER)
+        self.assertEqual(price_ladder.rung(5000), int(price_ladder.rungs(5000)))
+
+    def test_sequences_match_scalar_steps(self):
+        from price_ladder import price_ladder
+        from utils import ara_arb_limits
+        self.assertEqual(price_ladder.sequence(1000, steps=3), [1250, 1560, 1950])
+        self.assertEqual(price_ladder.sequence(1000, steps=3, side='arb'), [850, 725, 620])
+        for board in ('regular', 'acceleration'):
+            for base in (1, 7, 50, 203, 998, 4990, 5000, 77777, 999_990):
+                for side, pos in (('ara', 0), ('arb', 1)):
+                    expected, current = [], base
+                    for _ in range(20):
+                        nxt = ara_arb_limits(current, board)[pos]
+                        if side == 'arb' and nxt >= current:
+                            break
+                        expected.append(nxt)
+                        current = nxt
+                    self.assertEqual(price_ladder.sequence(base, board, 20, side), expected, (base, board, side))
+
+    def test_limits_and_chase_vectorized(self):
+        from price_ladder import price_ladder
+        from utils import ara_arb_limits
+        prices = np.array([50, 203, 1000, 5000, 10.5, 2_000_000])  # Includes off-ladder prices
+        for board in ('regular', 'acceleration'):
+            ara, arb = price_ladder.limits(prices, board)
+            exp_ara, exp_arb = ara_arb_limits(prices, board)
+            self.assertEqual(list(ara), list(exp_ara))
+            self.assertEqual(list(arb), list(exp_arb))
+        self.assertEqual(price_ladder.limits(1000), (1250, 850))
+        paths = price_ladder.chase([1000, 150], steps=3)
+        self.assertEqual(list(paths[0]), price_ladder.sequence(1000, steps=3))
+        self.assertEqual(list(paths[1]), price_ladder.sequence(150, steps=3))
+        with self.assertRaises(ValueError):
+            price_ladder.chase([203])
+
+
+class TestCompoundEngine(unittest.TestCase):
+    """Vectorized compound interest keeps the calculator's month-by-month results."""
+
+    @staticmethod
+    def reference(firstm, rate, years, monthly):
+        amount, out = firstm, []
+        for _ in range(int(max(0.1, min(years, 100)) * 12)):
+            amount = round((amount + monthly) * (1 + rate / 100 / 12), 2)
+            out.append(amount)
+        return out
+
+    def test_round_cents_matches_python_round(self):
+        from compound_engine import round_cents
+        rng = np.random.default_rng(7)
+        values = np.concatenate([rng.uniform(-1e9, 1e9, 20000), rng.integers(0, 10 ** 7, 5000) / 200 + 0.005,
+                                 [2.675, 1.005, 0.125, -0.125, 0.005, 1e14 + 0.125]])
+        self.assertEqual(list(round_cents(values)), [round(float(v), 2) for v in values])
+
+    def test_rounded_path_and_grid_match_reference(self):
+        from compound_engine import compound_frame, compound_grid
+        from pages_compound import calculate_compound_interest
+        for firstm, rate, years, monthly in [(1_000_000, 10, 5.5, 1_000_000), (0, 7.25, 30, 333_333),
+                                              (1_234_567.89, -3, 2, 0), (5e8, 35, 100, 1e6)]:
+            expected = self.reference(firstm, rate, years, monthly)
+            self.assertEqual(list(calculate_compound_interest(firstm, rate, years, monthly)['Amount']), expected)
+            self.assertEqual(list(compound_frame(firstm, rate, years, monthly)['Amount']), expected)
+            grid = compound_grid(firstm, [rate, rate + 1], [1, years], monthly, round_steps=True)
+            self.assertEqual(grid['balance'][0, 1, 0, 0], expected[-1])
+            self.assertEqual(grid['balance'][0, 0, 0, 0], expected[11])
+
+    def test_closed_form_grid(self):
+        from compound_engine import compound_grid, compound_path
+        path = compound_path(1_000_000, 12, 10, 500_000)
+        self.assertTrue(np.allclose(path, self.reference(1_000_000, 12, 10, 500_000), rtol=1e-6))
+        self.assertAlmostEqual(compound_path(1000, 0, 1, 100)[-1], 1000 + 12 * 100)  # Zero rate
+        grid = compound_grid(1_000_000, np.linspace(0, 30, 50), np.arange(1, 101), [0, 1_000_000])
+        self.assertEqual(grid['balance'].shape, (50, 100, 2, 1))
+        self.assertAlmostEqual(grid['balance'][10, 9, 1, 0], compound_path(1_000_000, grid['rates'][10], 10, 1_000_000)[-1],
+                               delta=1e-3)
+        self.assertEqual(grid['deposits'][0, 9, 1, 0], 1_000_000 + 120 * 1_000_000)
+        with self.assertRaises(ValueError):
+            compound_grid(1, np.arange(1000), np.arange(1, 101), np.arange(100))
+
+
+class TestMonteCarlo(unittest.TestCase):
+    def test_constant_returns_match_closed_form(self):
+        from compound_engine import compound_path, distribution_sampler, simulate_wealth
+        g = 1 + 12 / 100 / 12
+        result = simulate_wealth(1_000_000, 500_000, 10.5, lambda rng, shape: np.full(shape, np.log(g)), 1000, seed=1)
+        path = compound_path(1_000_000, 12, 10.5, 500_000)
+        bands = result['bands']
+        self.assertEqual(list(bands['Bulan']), list(range(12, 121, 12)) + [126])
+        for q in ('P5', 'P50', 'P95'):
+            self.assertTrue(np.allclose(bands[q], path[bands['Bulan'] - 1], rtol=1e-5))
+        self.assertEqual(result['deposits'], 1_000_000 + 126 * 500_000)
+        # Zero volatility: drift compounds to exactly the expected annual return
+        flat = simulate_wealth(1_000_000, 0, 3, distribution_sampler(10, 0), 100, seed=1)
+        self.assertTrue(np.allclose(flat['bands']['P50'], 1_000_000 * 1.1 ** np.arange(1, 4), rtol=1e-5))
+        short = simulate_wealth(1000, 0, 0.5, distribution_sampler(10, 20), 100, seed=1)
+        self.assertEqual(list(short['bands']['Bulan']), [1, 2, 3, 4, 5, 6])
+
+    def test_distributions_and_percentiles(self):
+        from compound_engine import distribution_sampler, simulate_wealth
+        for dist in ('normal', 'student-t'):
+            sample = distribution_sampler(10, 20, dist, seed=3)(np.random.default_rng(0), (200_000,))
+            self.assertAlmostEqual(np.exp(sample).mean() ** 12, 1.10, delta=0.01)
+            self.assertAlmostEqual(sample.std() * np.sqrt(12), 0.20, delta=0.01)
+            result = simulate_wealth(1_000_000, 1_000_000, 20, distribution_sampler(10, 20, dist, seed=3), 20_000, seed=5)
+            bands = result['bands'][['P5', 'P25', 'P50', 'P75', 'P95']].to_numpy()
+            self.assertTrue((np.diff(bands, axis=1) >= 0).all())
+            self.assertTrue(np.isfinite(result['final']).all())
+        with self.assertRaises(ValueError):
+            distribution_sampler(10, 20, 'cauchy')
+        # Same seed -> same paths
+        a = simulate_wealth(1e6, 1e6, 10, distribution_sampler(8, 15), 5000, seed=11)['final']
+        b = simulate_wealth(1e6, 1e6, 10, distribution_sampler(8, 15), 5000, seed=11)['final']
+        self.assertTrue(np.array_equal(a, b))
+
+    def test_bootstrap_from_history(self):
+        from compound_engine import bootstrap_sampler, monthly_log_returns, simulate_wealth
+        dates = pd.bdate_range('2020-01-01', '2024-12-31', tz='Asia/Jakarta')
+        close = 1000 * np.exp(np.cumsum(np.random.default_rng(2).normal(0.0004, 0.02, len(dates))))
+        returns = monthly_log_returns(pd.DataFrame({'Close': close}, index=dates))
+        self.assertEqual(len(returns), 59)
+        first_month_end = close[(dates.year == 2020) & (dates.month == 1)][-1]
+        self.assertAlmostEqual(returns.sum(), np.log(close[-1] / first_month_end))
+        result = simulate_wealth(1_000_000, 0, 5, bootstrap_sampler(returns), 10_000, seed=1)
+        # Every path compounds months drawn from the history: bounded by the extreme month
+        self.assertLessEqual(result['final'].max(), 1_000_000 * np.exp(60 * returns.max()) * 1.001)
+        self.assertGreaterEqual(result['final'].min(), 1_000_000 * np.exp(60 * returns.min()) * 0.999)
+        with self.assertRaises(ValueError):
+            bootstrap_sampler(returns[:11])
+        self.assertEqual(len(monthly_log_returns(pd.DataFrame())), 0)
+
+    def test_path_cap(self):
+        from compound_engine import MC_MAX_CELLS, MC_MAX_PATHS, distribution_sampler, simulate_wealth
+        result = simulate_wealth(1e6, 1e6, 10, distribution_sampler(10, 20), 10_000, seed=1)
+        self.assertEqual(result['paths'], 10_000)
+        self.assertEqual(simulate_wealth(1e6, 0, 1, distribution_sampler(10, 20), 10 ** 9)['paths'], MC_MAX_PATHS)
+        capped = simulate_wealth(1e6, 1e6, 100, distribution_sampler(10, 20), MC_MAX_PATHS, seed=1)
+        self.assertEqual(capped['paths'], MC_MAX_CELLS // 1200)
+        self.assertEqual(len(capped['final']), capped['paths'])
+
+    def test_page_keeps_results_across_reruns(self):
+        from unittest.mock import patch
+        import pages_compound
+        st = MagicMock()
+        st.session_state = {}
+        st.columns.side_effect = lambda n, **kwargs: [MagicMock() for _ in range(n)]
+
+        def rerun(inputs, clicked=None):
+            st.number_input.side_effect = list(inputs)
+            st.button.side_effect = lambda label, key: key == clicked
+            pages_compound.compound_interest_page()
+
+        with patch.object(pages_compound, 'st', st), \
+                patch.object(pages_compound, 'render_compound_result') as result, \
+                patch.object(pages_compound, 'render_monte_carlo') as monte_carlo:
+            rerun((1_000_000, 10.0, 5.0, 0), clicked='calculate_compound')
+            rerun((1_000_000, 10.0, 5.0, 0), clicked='run_monte_carlo')  # Hasil Hitung tetap tampil
+            self.assertEqual(result.call_count, 2)
+            rerun((2_000_000, 10.0, 5.0, 0))  # Input berubah: hasil lama disembunyikan
+            self.assertEqual(result.call_count, 2)
+            rerun((0, 0.0, 5.0, 0), clicked='calculate_compound')
+            self.assertEqual(result.call_count, 2)
+            self.assertEqual(monte_carlo.call_count, 4)  # Input nol tidak melewati Monte Carlo
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -5,8 +5,10 @@ Compliance: NIST SP 800-92 (Logging), OWASP API4 (Rate Limiting), ISO 25010 (Rob
 import unittest
 import sys
 import os
+import threading
 import time
 import math
+import tempfile
 from unittest.mock import MagicMock, patch
 
 # Mock streamlit before importing application modules
@@ -34,6 +36,19 @@ except ImportError:
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 
+def isolate_snapshot_cache(test_case):
+    """Point utils at an empty on-disk snapshot cache for the duration of a test."""
+    import utils
+    from snapshot_cache import SnapshotCache
+    tmp = tempfile.TemporaryDirectory()
+    test_case.addCleanup(tmp.cleanup)
+    cache = SnapshotCache(path=os.path.join(tmp.name, 'snapshots.sqlite3'))
+    patcher = patch.object(utils, 'snapshot_cache', cache)
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+    return cache
+
+
 class TestStructuredLogger(unittest.TestCase):
     """NIST SP 800-92: Structured Logging Tests"""
 
@@ -151,6 +166,1360 @@ class TestRateLimiter(unittest.TestCase):
         self.assertIsNone(test_func())
 
 
+class TestFetchEngine(unittest.TestCase):
+    """OWASP API4: Concurrent fetches must stay inside the shared rate budget."""
+
+    def setUp(self):
+        isolate_snapshot_cache(self)
+
+    def test_batch_runs_workers_concurrently(self):
+        from fetch_engine import fetch_concurrently
+
+        all_in_flight = threading.Barrier(8, timeout=5)
+
+        def slow_fetch(symbol):
+            all_in_flight.wait()  # Only passes if all 8 jobs run at the same time
+            return {'Symbol': symbol}, None
+
+        symbols = [f"S{i}" for i in range(8)]
+        data, failed = fetch_concurrently(symbols, slow_fetch, max_workers=8)
+        self.assertEqual(len(data), 8)
+        self.assertEqual(failed, [])
+
+    def test_results_keep_input_order(self):
+        from fetch_engine import fetch_concurrently
+
+        def jittered_fetch(symbol):
+            time.sleep(0.01 * (5 - int(symbol[1:])))
+            return {'Symbol': symbol}, None
+
+        symbols = ["S0", "S1", "S2", "S3", "S4", "S1"]
+        data, _ = fetch_concurrently(symbols, jittered_fetch, max_workers=4)
+        self.assertEqual(list(data.keys()), ["S0", "S1", "S2", "S3", "S4"])
+
+    def test_shared_limiter_caps_requests(self):
+        from fetch_engine import fetch_concurrently
+        from rate_limiter import RateLimiter
+        limiter = RateLimiter(max_calls=3, period=60.0)
+        calls = []
+
+        def fetch(symbol):
+            calls.append(symbol)
+            return {'Symbol': symbol}, None
+
+        data, failed = fetch_concurrently([f"S{i}" for i in range(6)], fetch, max_workers=4, limiter=limiter)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(len(data), 3)
+        self.assertEqual(sorted(reason for _, reason in failed), ['Rate limited'] * 3)
+
+    def test_job_exception_becomes_failure(self):
+        from fetch_engine import fetch_concurrently
+
+        def broken_fetch(symbol):
+            if symbol == "BAD":
+                raise RuntimeError("boom")
+            return {'Symbol': symbol}, None
+
+        data, failed = fetch_concurrently(["OK", "BAD"], broken_fetch, max_workers=2)
+        self.assertIn("OK", data)
+        self.assertEqual(failed, [("BAD", "boom")])
+
+    def test_worker_count_is_clamped(self):
+        from fetch_engine import clamp_workers, MAX_WORKERS_LIMIT
+        self.assertEqual(clamp_workers(0), 1)
+        self.assertEqual(clamp_workers(10_000), MAX_WORKERS_LIMIT)
+
+    def test_background_job_swallows_exceptions(self):
+        from fetch_engine import run_in_background
+
+        def boom():
+            raise RuntimeError("boom")
+
+        self.assertEqual(run_in_background(lambda x: x * 2, 21).result(timeout=5), 42)
+        self.assertIsNone(run_in_background(boom).result(timeout=5))
+
+    def test_fetch_stock_data_uses_pool_shape(self):
+        """fetch_stock_data keeps its dict shape when driven by the pool."""
+        import utils
+        from rate_limiter import RateLimiter
+
+        class FakeTicker:
+            def __init__(self, symbol):
+                self.info = {'regularMarketPrice': 1000, 'priceToBook': 1.5, 'trailingEps': 99.6}
+
+        utils.raw_info_cache.clear()
+        with patch.object(utils.yf, 'Ticker', FakeTicker), \
+                patch.object(utils, 'yfinance_limiter', RateLimiter(max_calls=100, period=60.0)):
+            data = utils.fetch_stock_data(["BBCA", "TLKM.JK"], max_workers=2)
+        self.assertEqual(list(data.keys()), ["BBCA.JK", "TLKM.JK"])
+        self.assertEqual(data["BBCA.JK"]["Symbol"], "BBCA")
+        self.assertEqual(data["BBCA.JK"]["Current Price"], 1000)
+        self.assertEqual(data["BBCA.JK"]["Diluted EPS (ttm) (EPS)"], 100)
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Concurrent callers for the same key share one upstream request."""
+
+    def test_concurrent_callers_share_one_execution(self):
+        import threading
+        from singleflight import SingleFlight
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        executions = []
+
+        def slow_fetch():
+            executions.append(1)
+            started.set()
+            release.wait(5)
+            return {'price': 4000}
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do('BBRI.JK', slow_fetch)))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(flight.do('BBRI.JK', slow_fetch)))
+                     for _ in range(4)]
+        for t in followers:
+            t.start()
+        while flight.stats()['coalesced'] < 4:
+            time.sleep(0.005)
+        release.set()
+        for t in [leader] + followers:
+            t.join(5)
+
+        self.assertEqual(len(executions), 1)
+        self.assertEqual(results, [{'price': 4000}] * 5)
+        self.assertEqual(flight.stats(), {'calls': 5, 'executions': 1, 'coalesced': 4, 'in_flight': 0})
+
+    def test_waiters_receive_leader_exception(self):
+        import threading
+        from singleflight import SingleFlight
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        errors = []
+
+        def failing_fetch():
+            started.set()
+            release.wait(5)
+            raise ConnectionError("yahoo down")
+
+        def call():
+            try:
+                flight.do('k', failing_fetch)
+            except ConnectionError as e:
+                errors.append(str(e))
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=call)
+        follower.start()
+        while flight.stats()['coalesced'] < 1:
+            time.sleep(0.005)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+        self.assertEqual(errors, ["yahoo down", "yahoo down"])
+
+    def test_sequential_calls_are_not_coalesced(self):
+        from singleflight import SingleFlight
+        flight = SingleFlight()
+        self.assertEqual(flight.do('k', lambda: 1), 1)
+        self.assertEqual(flight.do('k', lambda: 2), 2)
+        self.assertEqual(flight.stats()['executions'], 2)
+
+
+class TestSymbolCache(unittest.TestCase):
+    """Per-symbol caching: only symbols not seen recently hit Yahoo."""
+
+    def setUp(self):
+        isolate_snapshot_cache(self)
+
+    def test_ttl_cache_expires_entries(self):
+        from data_cache import TTLCache
+        cache = TTLCache(ttl=0.05)
+        cache.set("BBCA.JK", 1)
+        self.assertEqual(cache.get("BBCA.JK"), 1)
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("BBCA.JK"))
+
+    def test_ttl_cache_evicts_least_recently_used(self):
+        from data_cache import TTLCache
+        cache = TTLCache(ttl=60, max_entries=2)
+        cache.set("A", 1)
+        cache.set("B", 2)
+        cache.get("A")
+        cache.set("C", 3)
+        hits, missing = cache.get_many(["A", "B", "C"])
+        self.assertEqual(hits, {"A": 1, "C": 3})
+        self.assertEqual(missing, ["B"])
+
+    def test_watchlist_edit_fetches_only_new_symbol(self):
+        import utils
+        from rate_limiter import RateLimiter
+        requested = []
+
+        class FakeTicker:
+            def __init__(self, symbol):
+                requested.append(symbol)
+                self.info = {'regularMarketPrice': 500, 'trailingPE': 8.0}
+
+        utils.raw_info_cache.clear()
+        with patch.object(utils.yf, 'Ticker', FakeTicker), \
+                patch.object(utils, 'yfinance_limiter', RateLimiter(max_calls=100, period=60.0)):
+            utils.fetch_stock_data(["BBCA", "BBRI"])
+            data = utils.fetch_stock_data(["TLKM", "BBRI", "BBCA"])
+        self.assertEqual(requested.count("BBCA.JK"), 1)
+        self.assertEqual(requested.count("BBRI.JK"), 1)
+        self.assertEqual(requested.count("TLKM.JK"), 1)
+        self.assertEqual(list(data.keys()), ["TLKM.JK", "BBRI.JK", "BBCA.JK"])
+
+    def test_scraper_and_screener_share_one_info_fetch(self):
+        import utils
+        from rate_limiter import RateLimiter
+        requested = []
+
+        class FakeTicker:
+            def __init__(self, symbol):
+                requested.append(symbol)
+                self.info = {'regularMarketPrice': 500, 'trailingPE': 8.0, 'marketCap': 1e12}
+
+        utils.raw_info_cache.clear()
+        with patch.object(utils.yf, 'Ticker', FakeTicker), \
+                patch.object(utils, 'yfinance_limiter', RateLimiter(max_calls=100, period=60.0)):
+            quotes = utils.fetch_stock_data(["BBCA", "BBRI"])
+            screener = utils.fetch_enhanced_stock_data(["BBRI", "BBCA"])
+        self.assertEqual(sorted(requested), ["BBCA.JK", "BBRI.JK"])
+        self.assertEqual(quotes["BBCA.JK"]["Trailing P/E (PER)"], 8.0)
+        self.assertEqual(screener["BBCA.JK"]["Market Cap"], 1e12)
+        self.assertEqual(list(screener.keys()), ["BBRI.JK", "BBCA.JK"])
+
+    def test_price_only_mode_uses_one_bulk_download(self):
+        import pandas as pd
+        import utils
+        from rate_limiter import RateLimiter
+        columns = pd.MultiIndex.from_product([["BBCA.JK", "TLKM.JK"], ["Close", "Volume"]])
+        frame = pd.DataFrame([[9000, 1, 3000, 1], [9100, 1, float('nan'), 1]], columns=columns)
+        requested = []
+
+        class FakeTicker:
+            def __init__(self, symbol):
+                requested.append(symbol)
+                self.info = {'regularMarketPrice': 9100, 'trailingPE': 20.0}
+
+        utils.raw_info_cache.clear()
+        download = MagicMock(return_value=frame)
+        with patch.object(utils.yf, 'download', download), \
+                patch.object(utils.yf, 'Ticker', FakeTicker), \
+                patch.object(utils, 'yfinance_limiter', RateLimiter(max_calls=100, period=60.0)), \
+                patch.object(utils, 'run_in_background', side_effect=lambda fn, *args: fn(*args)):
+            data = utils.fetch_stock_data(["BBCA", "TLKM"], price_only=True)
+            download.assert_called_once()
+            self.assertEqual(data["BBCA.JK"]["Current Price"], 9100)
+            self.assertEqual(data["TLKM.JK"]["Current Price"], 3000)
+            self.assertEqual(data["BBCA.JK"]["Trailing P/E (PER)"], 0)
+            # The background fill made full info available for the next call
+            data = utils.fetch_stock_data(["BBCA"], price_only=True)
+        download.assert_called_once()
+        self.assertEqual(data["BBCA.JK"]["Trailing P/E (PER)"], 20.0)
+        self.assertEqual(sorted(requested), ["BBCA.JK", "TLKM.JK"])
+
+    def test_failed_symbols_are_not_cached(self):
+        import utils
+        from rate_limiter import RateLimiter
+        requested = []
+
+        class EmptyTicker:
+            def __init__(self, symbol):
+                requested.append(symbol)
+                self.info = {}
+                self.fast_info = None
+
+        utils.raw_info_cache.clear()
+        with patch.object(utils.yf, 'Ticker', EmptyTicker), \
+                patch.object(utils, 'yfinance_limiter', RateLimiter(max_calls=100, period=60.0)):
+            self.assertEqual(utils.fetch_enhanced_stock_data(["XXXX"]), {})
+            utils.fetch_enhanced_stock_data(["XXXX"])
+        self.assertEqual(requested, ["XXXX.JK", "XXXX.JK"])
+
+
+class TestStaleWhileRevalidate(unittest.TestCase):
+    """Expired entries are served at once and refreshed in the background."""
+
+    def test_stale_value_served_while_refreshing(self):
+        import threading
+        from data_cache import SWRCache
+        cache = SWRCache(ttl=0.05, max_stale=60)
+        release = threading.Event()
+        loads = []
+
+        def loader():
+            loads.append(1)
+            if len(loads) > 1:
+                release.wait(5)
+            return len(loads)
+
+        self.assertEqual(cache.get('IHSG', loader)[0], 1)
+        time.sleep(0.06)
+        value, as_of = cache.get('IHSG', loader)
+        self.assertEqual(value, 1)
+        self.assertLess(as_of, time.time() - 0.05)
+        # A second stale read does not start another refresh
+        self.assertEqual(cache.get('IHSG', loader)[0], 1)
+        release.set()
+        deadline = time.time() + 5
+        while cache.get('IHSG', loader)[0] != 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(loads), 2)
+        self.assertEqual(cache.refreshes, 1)
+
+    def test_entries_past_max_stale_block_on_reload(self):
+        from data_cache import SWRCache
+        cache = SWRCache(ttl=0.01, max_stale=0.05)
+        counter = iter(range(10))
+        self.assertEqual(cache.get('k', lambda: next(counter))[0], 0)
+        time.sleep(0.06)
+        self.assertEqual(cache.get('k', lambda: next(counter))[0], 1)
+        self.assertEqual(cache.misses, 2)
+
+    def test_failed_refresh_keeps_stale_value(self):
+        from data_cache import SWRCache
+        cache = SWRCache(ttl=0.01, max_stale=60)
+        cache.set('k', 'old')
+        time.sleep(0.02)
+
+        def broken():
+            raise ConnectionError("down")
+
+        self.assertEqual(cache.get('k', broken)[0], 'old')
+        deadline = time.time() + 5
+        while cache.claim_refresh(['k']) == [] and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(cache.lookup_many(['k'])[0], {'k': 'old'})
+
+    def test_empty_result_is_not_cached(self):
+        from data_cache import SWRCache
+        cache = SWRCache(ttl=0.01, max_stale=60)
+        nonempty = lambda r: bool(r[0])
+        # Synchronous load: returned to the caller but not stored
+        self.assertEqual(cache.get('k', lambda: ([], 3), nonempty)[0], ([], 3))
+        self.assertEqual(len(cache), 0)
+        cache.set('k', (['row'], 0))
+        time.sleep(0.02)
+        # Background refresh returning nothing keeps the stale rows
+        self.assertEqual(cache.get('k', lambda: ([], 3), nonempty)[0], (['row'], 0))
+        deadline = time.time() + 5
+        while cache.claim_refresh(['k']) == [] and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(cache.lookup_many(['k'])[0], {'k': (['row'], 0)})
+
+    def test_market_overview_outage_keeps_stale_rows(self):
+        import pages_market_overview as mo
+        mo.market_overview_cache.clear()
+        self.addCleanup(mo.market_overview_cache.clear)
+        with patch.object(mo, 'fetch_market_overview', return_value=([], 2)) as fetch:
+            self.assertEqual(mo.get_market_overview(['BBCA', 'BBRI'])[0], ([], 2))
+            mo.get_market_overview(['BBCA', 'BBRI'])
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(len(mo.market_overview_cache), 0)
+
+    def test_fetch_stock_data_serves_stale_rows(self):
+        import utils
+        from rate_limiter import RateLimiter
+        isolate_snapshot_cache(self)
+        utils.raw_info_cache.clear()
+        utils.raw_info_cache.set('BBCA.JK', {'regularMarketPrice': 9000})
+        refreshed = []
+        with patch.object(utils.raw_info_cache, 'ttl', 0), \
+                patch.object(utils.yf, 'Ticker', side_effect=AssertionError('blocking fetch')), \
+                patch.object(utils, 'yfinance_limiter', RateLimiter(max_calls=100, period=60.0)), \
+                patch.object(utils, 'run_in_background', side_effect=lambda fn, *args: refreshed.append(args)):
+            data = utils.fetch_stock_data(['BBCA'])
+        self.assertEqual(data['BBCA.JK']['Current Price'], 9000)
+        self.assertEqual(refreshed, [(['BBCA.JK'],)])
+        self.assertIsNotNone(utils.raw_info_as_of(['BBCA']))
+
+
+class TestAnalysisBundleCache(unittest.TestCase):
+    """get_stock_data caches each component with its own TTL."""
+
+    def setUp(self):
+        import pandas as pd
+        import pages_analysis
+        self.pa = pages_analysis
+        isolate_snapshot_cache(self)
+        patcher = patch.object(pages_analysis, 'snapshot_cache', MagicMock(get=MagicMock(return_value=None)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        pages_analysis._bundle_cache.clear()
+        self.addCleanup(pages_analysis._bundle_cache.clear)
+        self.calls = calls = []
+        history = pd.DataFrame({'Close': [100.0, 105.0]}, index=pd.date_range('2024-01-01', periods=2))
+
+        class FakeTicker:
+            def __init__(self, symbol):
+                self.symbol = symbol
+
+            @property
+            def info(self):
+                calls.append('info')
+                return {'trailingPE': 10.0, 'returnOnEquity': 0.2}
+
+            @property
+            def recommendations(self):
+                calls.append('recommendations')
+                return None
+
+            @property
+            def news(self):
+                calls.append('news')
+                return [{'title': 'Laba BBRI naik'}]
+
+        def get_history(symbol, period):
+            calls.append('history')
+            return history
+
+        store = patch.object(pages_analysis, 'bar_store', MagicMock(get_history=get_history))
+        store.start()
+        self.addCleanup(store.stop)
+        for name in ['yf', 'get_google_news_rss', 'get_kabarbursa_news', 'get_kontan_news', 'get_cnbc_news',
+                     'get_bisnis_news', 'get_detik_finance_news', 'get_idx_channel_news',
+                     'get_investing_indonesia_news', 'news_index']:
+            if name == 'yf':
+                replacement = MagicMock(Ticker=FakeTicker)
+            elif name == 'news_index':
+                replacement = MagicMock(headlines=MagicMock(return_value=[]))
+            else:
+                replacement = MagicMock(return_value=[])
+            p = patch.object(pages_analysis, name, replacement)
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_second_call_is_served_from_cache(self):
+        first = self.pa.get_stock_data('BBRI')
+        second = self.pa.get_stock_data('BBRI')
+        self.assertEqual(set(first), {'history', 'info', 'news', 'news_status', 'recommendations',
+                                      'current_price', 'ticker', 'analysis'})
+        self.assertEqual(second['current_price'], 105.0)
+        self.assertEqual(second['info'], {'trailingPE': 10.0, 'returnOnEquity': 0.2})
+        self.assertEqual(self.calls.count('history'), 1)
+        self.assertEqual(self.calls.count('info'), 1)
+        self.assertEqual(self.calls.count('news'), 1)
+
+    def test_news_expires_independently_of_history(self):
+        with patch.object(self.pa, 'ANALYSIS_NEWS_TTL', -1):
+            self.pa.get_stock_data('BBRI')
+            self.pa.get_stock_data('BBRI')
+        self.assertEqual(self.calls.count('history'), 1)
+        self.assertEqual(self.calls.count('info'), 1)
+        self.assertEqual(self.calls.count('news'), 2)
+
+    def test_empty_news_is_not_cached(self):
+        self.pa.yf.Ticker.news = property(lambda t: self.calls.append('news') or [])  # Every source empty
+        first = self.pa.get_stock_data('BBRI')
+        self.pa.get_stock_data('BBRI')
+        self.assertEqual(first['news'], [])
+        self.assertEqual(self.calls.count('news'), 2)
+        self.assertEqual(self.calls.count('info'), 1)
+
+    def test_history_valid_until_next_session(self):
+        import datetime
+        wib = self.pa.WIB
+        saturday = datetime.datetime(2024, 6, 8, 10, 0, tzinfo=wib).timestamp()
+        monday_open = datetime.datetime(2024, 6, 10, 9, 0, tzinfo=wib).timestamp()
+        self.assertEqual(self.pa._next_bar_expiry(saturday), monday_open)
+        in_session = datetime.datetime(2024, 6, 10, 10, 0, tzinfo=wib).timestamp()
+        self.assertEqual(self.pa._next_bar_expiry(in_session), in_session + self.pa.ANALYSIS_INTRADAY_TTL)
+        after_close = datetime.datetime(2024, 6, 11, 17, 0, tzinfo=wib).timestamp()
+        self.assertEqual(self.pa._next_bar_expiry(after_close),
+                         datetime.datetime(2024, 6, 12, 9, 0, tzinfo=wib).timestamp())
+
+
+class TestBarStore(unittest.TestCase):
+    """Incremental OHLCV store: full fetch once, then only new bars."""
+
+    def setUp(self):
+        import pandas as pd
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        dates = pd.date_range('2024-01-01', periods=30, freq='B', tz='Asia/Jakarta')
+        self.upstream = pd.DataFrame({
+            'Open': 100.0, 'High': 110.0, 'Low': 90.0, 'Close': [100.0 + i for i in range(30)],
+            'Volume': 1000, 'Dividends': 0.0, 'Stock Splits': 0.0,
+        }, index=dates)
+        self.requests = []
+        test = self
+
+        class FakeTicker:
+            def __init__(self, symbol):
+                self.symbol = symbol
+
+            def history(self, period=None, start=None):
+                test.requests.append(('period', period) if period else ('start', start))
+                if start is not None:
+                    return test.upstream[test.upstream.index >= pd.Timestamp(start, tz='Asia/Jakarta')]
+                return test.upstream
+
+        patcher = patch('bar_store.yf.Ticker', FakeTicker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_store(self, **kwargs):
+        from bar_store import BarStore
+        from rate_limiter import RateLimiter
+        kwargs.setdefault('use_parquet', False)
+        kwargs.setdefault('limiter', RateLimiter(max_calls=100, period=60.0))
+        return BarStore(root=self.root, **kwargs)
+
+    def append_bar(self, close, **extra):
+        import pandas as pd
+        next_day = self.upstream.index[-1] + pd.offsets.BDay(1)
+        row = dict(self.upstream.iloc[-1], Close=close, **extra)
+        self.upstream = pd.concat([self.upstream, pd.DataFrame([row], index=[next_day])])
+
+    def test_delta_fetch_appends_only_new_bars(self):
+        store = self.make_store(refresh_interval=0)
+        self.assertEqual(len(store.get_history('BBRI.JK', '5y')), 30)
+        self.append_bar(200.0)
+        history = store.get_history('BBRI.JK', '5y')
+        self.assertEqual(len(history), 31)
+        self.assertEqual(history['Close'].iloc[-1], 200.0)
+        self.assertEqual(self.requests[0], ('period', '5y'))
+        self.assertEqual(self.requests[1][0], 'start')
+        self.assertEqual(store.stats(), {'full_fetches': 1, 'delta_fetches': 1, 'rebuilds': 0})
+
+    def test_fresh_store_served_without_network(self):
+        store = self.make_store(refresh_interval=60)
+        store.get_history('BBRI.JK', '5y')
+        store.get_history('BBRI.JK', '1mo')
+        self.assertEqual(len(self.requests), 1)
+
+    def test_adjusted_prices_trigger_rebuild(self):
+        store = self.make_store(refresh_interval=0)
+        store.get_history('BBRI.JK', '5y')
+        self.upstream = self.upstream.assign(Close=self.upstream['Close'] / 2)  # 2:1 split re-adjustment
+        history = store.get_history('BBRI.JK', '5y')
+        self.assertEqual(history['Close'].iloc[0], 50.0)
+        self.assertEqual(store.stats()['rebuilds'], 1)
+        self.assertEqual(self.requests[-1], ('period', '5y'))
+
+    def test_new_dividend_bar_triggers_rebuild(self):
+        store = self.make_store(refresh_interval=0)
+        store.get_history('BBRI.JK', '5y')
+        self.append_bar(130.0, Dividends=5.0)
+        store.get_history('BBRI.JK', '5y')
+        self.assertEqual(store.stats()['rebuilds'], 1)
+
+    def test_yahoo_requests_take_limiter_tokens(self):
+        import bar_store
+        from rate_limiter import RateLimiter
+        store = self.make_store(refresh_interval=0, limiter=RateLimiter(max_calls=1, period=60.0))
+        self.assertEqual(len(store.get_history('BBRI.JK', '5y')), 30)
+        self.append_bar(200.0)
+        history = store.get_history('BBRI.JK', '5y')  # No token left: stored bars are served
+        self.assertEqual(len(history), 30)
+        self.assertTrue(store.get_history('BBCA.JK', '5y').empty)
+        self.assertTrue(store.get_history('BBRI.JK', '10y').empty)
+        self.assertEqual(len(self.requests), 1)
+        # The shared store charges the process-wide Yahoo budget
+        with patch.object(bar_store, 'yfinance_limiter', RateLimiter(max_calls=0, period=60.0)):
+            self.assertTrue(bar_store.BarStore(root=self.root).get_history('TLKM.JK', '5y').empty)
+        self.assertEqual(len(self.requests), 1)
+
+    def test_trade_planner_charges_only_yahoo_syncs(self):
+        import pages_trade_planner
+        from rate_limiter import RateLimiter
+        limiter = RateLimiter(max_calls=1, period=60.0)
+        with patch.object(pages_trade_planner, 'bar_store', self.make_store(limiter=limiter)):
+            self.assertEqual(len(pages_trade_planner._fetch_intraday('BBRI.JK')), 1)
+            self.assertEqual(limiter.remaining, 0)
+            self.assertEqual(len(pages_trade_planner._fetch_intraday('BBRI.JK')), 1)  # Fresh bars from disk
+            self.assertTrue(pages_trade_planner._fetch_intraday('BBCA.JK').empty)  # No token left
+        self.assertEqual(len(self.requests), 1)
+
+    def test_period_slicing_matches_yfinance_semantics(self):
+        store = self.make_store()
+        self.assertEqual(len(store.get_history('BBRI.JK', '5d')), 5)
+        self.assertEqual(len(store.get_history('BBRI.JK', '1d')), 1)
+        month = store.get_history('BBRI.JK', '1mo')
+        self.assertTrue(len(month) < 30 and len(month) >= 20)
+
+    def test_csv_round_trip_keeps_timezone(self):
+        store = self.make_store()
+        store.get_history('BBRI.JK', '5y')
+        loaded = store.load('BBRI.JK')
+        self.assertEqual(str(loaded.index.tz), 'Asia/Jakarta')
+        self.assertTrue(loaded.index.equals(self.upstream.index))
+
+    def test_parquet_format_when_available(self):
+        from bar_store import PARQUET_AVAILABLE
+        if not PARQUET_AVAILABLE:
+            self.skipTest("pyarrow not installed")
+        store = self.make_store(use_parquet=True)
+        store.get_history('BBRI.JK', '5y')
+        self.assertTrue(os.path.exists(os.path.join(self.root, 'BBRI.JK.parquet')))
+        self.assertEqual(len(store.load('BBRI.JK')), 30)
+
+
+class TestNewsAggregator(unittest.TestCase):
+    """News sources run concurrently under per-source and total deadlines."""
+
+    def test_slow_source_is_cut_at_its_deadline(self):
+        from news_aggregator import NewsSource, aggregate_news
+
+        def slow():
+            time.sleep(1.0)
+            return [{'title': 'late'}]
+
+        news, status = aggregate_news([
+            NewsSource('fast', lambda: [{'title': 'a'}, {'title': 'b'}]),
+            NewsSource('slow', slow, timeout=0.1),
+            NewsSource('empty', lambda: []),
+        ], total_budget=2.0)
+        self.assertEqual([n['title'] for n in news], ['a', 'b'])
+        self.assertEqual(status['fast']['status'], 'ok')
+        self.assertEqual(status['fast']['count'], 2)
+        self.assertEqual(status['slow'], {'status': 'timeout', 'count': 0, 'elapsed': 0.1})
+        self.assertEqual(status['empty']['status'], 'empty')
+
+    def test_total_budget_caps_tail_latency(self):
+        from news_aggregator import NewsSource, aggregate_news
+        _, status = aggregate_news([NewsSource(f's{i}', lambda: time.sleep(1.0)) for i in range(3)],
+                                   total_budget=0.1, source_timeout=5.0)
+        self.assertEqual([s['status'] for s in status.values()], ['timeout'] * 3)
+        self.assertTrue(all(s['elapsed'] == 0.1 for s in status.values()))  # Cut at the budget, not 5 s
+
+    def test_results_keep_source_order_and_errors_are_reported(self):
+        from news_aggregator import NewsSource, aggregate_news
+
+        def later():
+            time.sleep(0.05)
+            return [{'title': 'first source'}]
+
+        def broken():
+            raise ConnectionError("feed down")
+
+        news, status = aggregate_news([
+            NewsSource('A', later),
+            NewsSource('B', lambda: [{'title': 'second source'}]),
+            NewsSource('C', broken),
+        ])
+        self.assertEqual([n['title'] for n in news], ['first source', 'second source'])
+        self.assertEqual(status['C']['status'], 'error')
+
+
+class TestFeedClient(unittest.TestCase):
+    """Pooled feed fetching with ETag / Last-Modified revalidation."""
+
+    def setUp(self):
+        import http_client
+        self.http = http_client
+        self.real_get_session = http_client.get_session
+        http_client.feed_cache.clear()
+        self.addCleanup(http_client.feed_cache.clear)
+        self.parsed = []
+
+        def parse(content):
+            feed = {'source': content}
+            self.parsed.append(feed)
+            return feed
+
+        p = patch.object(http_client.feedparser, 'parse', side_effect=parse)
+        p.start()
+        self.addCleanup(p.stop)
+        self.session = MagicMock()
+        p = patch.object(http_client, 'get_session', return_value=self.session)
+        p.start()
+        self.addCleanup(p.stop)
+
+    @staticmethod
+    def response(status, content=b'', headers=None):
+        chunks = [content[i:i + 1024] for i in range(0, len(content), 1024)]
+        response = MagicMock(status_code=status, headers=headers or {})
+        response.iter_content.side_effect = lambda chunk_size: iter(chunks)
+        return response
+
+    def test_not_modified_is_served_from_feed_cache(self):
+        url = 'https://news.google.com/rss/search?q=BBRI'
+        self.session.get.side_effect = [
+            self.response(200, b'<rss/>', {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}),
+            self.response(304),
+        ]
+        first = self.http.fetch_feed(url)
+        second = self.http.fetch_feed(url)
+        self.assertIs(second, first)
+        self.assertEqual(len(self.parsed), 1)
+        headers = self.session.get.call_args_list[1].kwargs['headers']
+        self.assertEqual(headers['If-None-Match'], '"v1"')
+        self.assertEqual(headers['If-Modified-Since'], 'Mon, 01 Jan 2024 00:00:00 GMT')
+
+    def test_network_error_falls_back_to_cached_feed(self):
+        import requests
+        url = 'https://news.google.com/rss/search?q=TLKM'
+        self.session.get.side_effect = [self.response(200, b'<rss/>'), requests.ConnectionError("down")]
+        first = self.http.fetch_feed(url)
+        self.assertIs(self.http.fetch_feed(url), first)
+
+    def test_oversized_feed_is_rejected(self):
+        self.session.get.return_value = self.response(200, b'x' * (self.http.MAX_FEED_BYTES + 1))
+        feed = self.http.fetch_feed('https://example.com/feed')
+        self.assertEqual(feed, {'source': b''})
+        self.assertIsNone(self.http.feed_cache.get('https://example.com/feed'))
+        self.assertTrue(self.session.get.call_args.kwargs['stream'])
+
+    def test_oversized_feed_stops_reading_early(self):
+        limit = self.http.MAX_FEED_BYTES
+        read = []
+
+        def endless(chunk_size):
+            while True:
+                read.append(chunk_size)
+                yield b'x' * chunk_size
+
+        streamed = self.response(200)
+        streamed.iter_content.side_effect = endless
+        self.session.get.return_value = streamed
+        self.assertEqual(self.http.fetch_feed('https://example.com/endless'), {'source': b''})
+        self.assertLessEqual(len(read) * self.http.READ_CHUNK_BYTES, limit + self.http.READ_CHUNK_BYTES)
+        streamed.close.assert_called_once()
+        # A declared Content-Length over the limit is rejected before reading the body
+        declared = self.response(200, b'<rss/>', {'Content-Length': str(limit + 1)})
+        self.session.get.return_value = declared
+        self.http.fetch_feed('https://example.com/declared')
+        declared.iter_content.assert_not_called()
+
+    def test_session_is_shared_and_pooled(self):
+        with patch.object(self.http, '_session', None):
+            session = self.real_get_session()
+            self.assertIs(self.real_get_session(), session)
+        adapter = session.get_adapter('https://news.google.com')
+        self.assertEqual(adapter._pool_maxsize, self.http.POOL_MAXSIZE)
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    """Compiled keyword matching: one pass, no overlapping double counts."""
+
+    def setUp(self):
+        from keyword_matcher import KeywordMatcher
+        self.matcher = KeywordMatcher(
+            {'positive': ['naik', 'kenaikan', 'laba'], 'negative': ['lemah', 'melemah', 'jual', 'utang']},
+            boundaries={'jual': 'word', 'utang': 'prefix'},
+        )
+
+    def test_longest_keyword_wins_without_double_count(self):
+        self.assertEqual(self.matcher.find('Rupiah MELEMAH, kenaikan suku bunga'),
+                         [('negative', 'melemah'), ('positive', 'kenaikan')])
+
+    def test_boundary_rules(self):
+        self.assertEqual(self.matcher.find('Penjualan naik'), [('positive', 'naik')])
+        self.assertEqual(self.matcher.find('Investor jual saham'), [('negative', 'jual')])
+        self.assertEqual(self.matcher.find('Piutang usaha'), [])
+        self.assertEqual(self.matcher.find('Utangnya membengkak'), [('negative', 'utang')])
+
+    def test_batch_matches_map_back_to_each_text(self):
+        batch = self.matcher.find_batch(['laba naik', '', 'saham melemah', 'netral'])
+        self.assertEqual(batch, [[('positive', 'laba'), ('positive', 'naik')], [], [('negative', 'melemah')], []])
+
+    def test_unknown_boundary_rule_rejected(self):
+        from keyword_matcher import KeywordMatcher
+        with self.assertRaises(ValueError):
+            KeywordMatcher({'positive': ['naik']}, default_boundary='fuzzy')
+
+    def test_analyze_sentiment_keeps_tagged_structure(self):
+        import pages_analysis
+        result = pages_analysis.analyze_sentiment([
+            {'title': 'Laba BBRI naik, dividen jumbo', 'link': 'https://a', 'publisher': 'Kontan'},
+            {'content': {'title': 'Saham melemah tertekan aksi jual'}},
+            {'title': 'Penjualan semen stabil'},
+            {'title': ''},
+        ])
+        self.assertEqual(result['score'], 0)
+        self.assertEqual(result['positive_news'][0]['positive_keywords'], ['naik', 'dividen', 'laba'])
+        self.assertEqual(result['positive_news'][0]['sentiment_score'], 3)
+        self.assertEqual(result['negative_news'][0]['negative_keywords'], ['jual', 'tertekan', 'melemah'])
+        self.assertEqual(result['negative_news'][0]['sentiment_score'], -3)
+        self.assertEqual(result['neutral_news'][0]['title'], 'Penjualan semen stabil')
+        self.assertEqual(set(result), {'score', 'label', 'summary', 'positive_news', 'negative_news', 'neutral_news'})
+
+
+class TestNewsIndex(unittest.TestCase):
+    """Universe news index: general feeds fetched once, headlines tagged by ticker."""
+
+    def make_index(self, **kwargs):
+        from news_index import NewsIndex
+        return NewsIndex(['BBCA', 'BUMI', 'GOTO'], feeds=[('Kontan', 'saham')], **kwargs)
+
+    def test_tags_tickers_case_sensitively(self):
+        index = self.make_index()
+        tags = index.tag(['BBCA dan GOTO naik', 'Harga bumi turun', 'BUMI rights issue', 'BBCAX bukan ticker'])
+        self.assertEqual(tags, [['BBCA', 'GOTO'], [], ['BUMI'], []])
+
+    def test_add_files_item_under_each_ticker_once(self):
+        index = self.make_index()
+        item = {'title': 'BBCA dan GOTO naik', 'link': 'https://x/1', 'providerPublishTime': 1}
+        self.assertEqual(index.add([item, dict(item)]), 2)
+        self.assertEqual([i['link'] for i in index.headlines('BBCA.JK')], ['https://x/1'])
+        self.assertEqual(index.headlines('GOTO')[0]['symbols'], ['BBCA', 'GOTO'])
+        self.assertEqual(index.headlines('BUMI'), [])
+
+    def test_bucket_keeps_newest_items(self):
+        index = self.make_index(max_items=2)
+        index.add([{'title': f'BBCA {i}', 'link': f'l{i}', 'providerPublishTime': i} for i in range(4)])
+        self.assertEqual([i['link'] for i in index.headlines('BBCA')], ['l3', 'l2'])
+        # An evicted link may be indexed again
+        self.assertEqual(index.add([{'title': 'BBCA 0', 'link': 'l0', 'providerPublishTime': 9}]), 1)
+
+    def test_refresh_reads_each_feed_once(self):
+        import news_index as ni
+        feed = MagicMock(entries=[{'title': 'BBCA cetak laba', 'link': 'https://x/2'}])
+        with patch.object(ni, 'fetch_feed', return_value=feed) as fetch:
+            index = self.make_index()
+            self.assertEqual(index.refresh(), 1)
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(index.headlines('BBCA')[0]['publisher'], 'Kontan')
+        self.assertFalse(index.is_stale())
+
+    def test_ensure_fresh_schedules_one_background_job(self):
+        import news_index as ni
+        index = self.make_index()
+        with patch.object(ni, 'run_in_background') as background:
+            index.ensure_fresh()
+            index.ensure_fresh()
+        self.assertEqual(background.call_count, 1)
+
+    def test_universe_covers_market_indices(self):
+        from config import MARKET_INDICES
+        from news_index import universe_symbols
+        symbols = universe_symbols()
+        self.assertEqual(set(symbols), {s for group in MARKET_INDICES.values() for s in group})
+
+
+class TestNewsDedup(unittest.TestCase):
+    """Near-duplicate headlines from several sources collapse into one item."""
+
+    def setUp(self):
+        self.news = [
+            {'title': 'Laba BBCA Naik 12% di Kuartal III 2024 - Kontan', 'link': 'https://a', 'publisher': 'Kontan'},
+            {'title': 'Laba BBCA naik 12 persen di kuartal III 2024 - CNBC Indonesia', 'link': 'https://b',
+             'publisher': 'CNBC Indonesia'},
+            {'title': 'BBCA bagikan dividen interim Rp 50 per saham', 'link': 'https://c', 'publisher': 'Bisnis.com'},
+            {'title': 'Laba BBCA Naik 12% di Kuartal III 2024', 'link': 'https://d', 'publisher': 'Google News'},
+        ]
+
+    def test_collapses_cluster_into_first_item(self):
+        from news_dedup import collapse_near_duplicates
+        result = collapse_near_duplicates(self.news)
+        self.assertEqual([r['link'] for r in result], ['https://a', 'https://c'])
+        self.assertEqual(result[0]['source_count'], 3)
+        self.assertEqual(result[0]['sources'], ['Kontan', 'CNBC Indonesia', 'Google News'])
+        self.assertEqual(result[1]['source_count'], 1)
+        self.assertNotIn('source_count', self.news[0])  # Input items are not modified
+
+    def test_same_link_is_one_story(self):
+        from news_dedup import collapse_near_duplicates
+        news = [{'title': 'BBRI rilis laporan keuangan', 'link': 'https://x', 'publisher': 'A'},
+                {'title': 'Judul lain sama sekali', 'link': 'https://x', 'publisher': 'B'}]
+        self.assertEqual(len(collapse_near_duplicates(news)), 1)
+
+    def test_untitled_items_are_kept(self):
+        from news_dedup import collapse_near_duplicates
+        news = [{'content': {'title': 'Nested'}}, {'title': ''}]
+        self.assertEqual(collapse_near_duplicates(news), news)
+        nested = collapse_near_duplicates(news[:1] * 2, title_of=lambda i: i['content']['title'])
+        self.assertEqual(nested[0]['source_count'], 2)
+
+    def test_sentiment_counts_story_once(self):
+        from news_dedup import collapse_near_duplicates
+        from pages_analysis import analyze_sentiment
+        raw = analyze_sentiment(self.news)
+        collapsed = analyze_sentiment(collapse_near_duplicates(self.news))
+        self.assertEqual(len(raw['positive_news']), 4)  # 'naik' x3 + 'dividen'
+        self.assertEqual(len(collapsed['positive_news']), 2)
+        self.assertEqual(collapsed['positive_news'][0]['source_count'], 3)
+
+
+class TestIndicatorEngine(unittest.TestCase):
+    """Shared indicator engine: lazy columns memoized per (symbol, last bar)."""
+
+    def setUp(self):
+        import numpy as np
+        import pandas as pd
+        from indicators import clear_indicator_cache
+        clear_indicator_cache()
+        self.addCleanup(clear_indicator_cache)
+        rng = np.random.default_rng(7)
+        close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.02, 300)))
+        self.history = pd.DataFrame({
+            'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+            'Volume': rng.integers(1000, 5000, 300),
+        }, index=pd.date_range('2023-01-02', periods=300, freq='B'))
+
+    def test_matches_reference_formulas(self):
+        from indicators import get_indicators
+        ind = get_indicators(self.history, 'BBCA')
+        close = self.history['Close']
+        delta = close.diff()
+        gain = delta.where(delta > 0, 0).rolling(14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+        self.assertAlmostEqual(ind.last('rsi', 14), (100 - 100 / (1 + gain / loss)).iloc[-1])
+        self.assertAlmostEqual(ind.last('sma', 50), close.rolling(50).mean().iloc[-1])
+        macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        self.assertAlmostEqual(ind.last('macd_signal'), macd.ewm(span=9, adjust=False).mean().iloc[-1])
+        self.assertTrue(0 <= ind.last('adx', 14) <= 100)
+
+    def test_reuses_computed_columns(self):
+        from indicators import get_indicators
+        ind = get_indicators(self.history, 'BBCA')
+        ind.last('adx', 14)
+        computed = ind.computed
+        ind.last('atr', 14)  # Shared with ADX
+        again = get_indicators(self.history.copy(), 'BBCA')
+        again.last('adx', 14)
+        self.assertIs(again, ind)
+        self.assertEqual(ind.computed, computed)
+
+    def test_new_bar_gets_new_set(self):
+        from indicators import get_indicators
+        first = get_indicators(self.history.iloc[:-1], 'BBCA')
+        self.assertIsNot(get_indicators(self.history, 'BBCA'), first)
+        self.assertIsNot(get_indicators(self.history, 'BBRI'), get_indicators(self.history, 'BBCA'))
+        self.assertIsNot(get_indicators(self.history), get_indicators(self.history))
+
+    def test_intraday_update_of_last_bar_gets_new_set(self):
+        from indicators import get_indicators
+        first = get_indicators(self.history, 'BBCA')
+        first.last('rsi', 14)
+        live = self.history.copy()
+        live.iloc[-1, live.columns.get_loc('Close')] *= 1.05  # Same timestamp and row count
+        updated = get_indicators(live, 'BBCA')
+        self.assertIsNot(updated, first)
+        self.assertEqual(updated.frame()['Close'].iloc[-1], live['Close'].iloc[-1])
+        self.assertNotAlmostEqual(updated.last('rsi', 14), first.last('rsi', 14))
+        self.assertIs(get_indicators(live.copy(), 'BBCA'), updated)
+        live.iloc[-1, live.columns.get_loc('Volume')] += 100
+        self.assertIsNot(get_indicators(live, 'BBCA'), updated)
+
+    def test_frame_and_defaults(self):
+        from indicators import get_indicators
+        ind = get_indicators(self.history.iloc[:10], 'BBCA')
+        df = ind.frame(('rsi', 14), ('macd', None))
+        self.assertIn('RSI14', df.columns)
+        self.assertIn('MACD', df.columns)
+        self.assertNotIn('RSI14', self.history.columns)
+        self.assertEqual(ind.last('sma', 50, default=-1), -1)
+        with self.assertRaises(ValueError):
+            ind.series('vwap', 5)
+        with self.assertRaises(ValueError):
+            ind.series('rsi')
+
+    def test_signals_read_streaming_states(self):
+        import signals
+        from streaming_indicators import IndicatorStateStore, StreamingIndicators
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        store = IndicatorStateStore(root=tmp.name)
+        with patch.object(signals, 'indicator_states', store):
+            streamed = signals.get_multi_timeframe_signals(self.history, 'BBCA')
+            with patch.object(StreamingIndicators, 'from_history') as reseed:
+                again = signals.get_multi_timeframe_signals(self.history, 'BBCA')
+            reseed.assert_not_called()
+        self.assertEqual(streamed, signals.get_multi_timeframe_signals(self.history))
+        self.assertEqual(again, streamed)
+        self.assertEqual(store._states['BBCA'].bars, len(self.history) - 1)
+
+    def test_streaming_view_falls_back_for_custom_windows(self):
+        from indicators import IndicatorSet
+        from streaming_indicators import IndicatorStateStore
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        view = IndicatorStateStore(root=tmp.name).view('BBCA', self.history)
+        batch = IndicatorSet(self.history)
+        self.assertAlmostEqual(view.last('rsi', 14), batch.last('rsi', 14))
+        self.assertAlmostEqual(view.last('macd_signal'), batch.last('macd_signal'))
+        self.assertAlmostEqual(view.last('ema', 7), batch.last('ema', 7))  # Not a streaming spec
+        short = IndicatorStateStore(root=tmp.name).view('BBRI', self.history.iloc[:30])
+        self.assertEqual(short.last('sma', 50, default=-1), -1)
+
+
+class TestStreamingIndicators(unittest.TestCase):
+    """O(1)-per-bar indicator states agree with the batch engine and persist."""
+
+    def setUp(self):
+        import numpy as np
+        import pandas as pd
+        rng = np.random.default_rng(3)
+        close = np.round(1000 * np.exp(np.cumsum(rng.normal(0, 0.02, 260))))
+        close[100:120] = close[100]  # Suspended stretch: flat bars
+        self.history = pd.DataFrame({
+            'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+            'Volume': rng.integers(1000, 5000, 260).astype(float),
+        }, index=pd.date_range('2023-01-02', periods=260, freq='B'))
+        self.history.iloc[100:120, 1] = close[100]
+        self.history.iloc[100:120, 2] = close[100]
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+
+    def assertMatchesEngine(self, values, history):
+        import pandas as pd
+        from indicators import IndicatorSet
+        from streaming_indicators import DEFAULT_SPECS
+        batch = IndicatorSet(history)
+        for name, window in DEFAULT_SPECS + [('macd_signal', None)]:
+            column = f"{name.upper()}{window or ''}"
+            expected = batch.series(name, window).iloc[-1]
+            if pd.isna(expected):
+                self.assertTrue(values[column] is None or values[column] != values[column], column)
+            else:
+                self.assertAlmostEqual(values[column], expected, places=6, msg=column)
+
+    def test_matches_batch_engine_at_every_stage(self):
+        from streaming_indicators import StreamingIndicators
+        for cut in (1, 20, 110, 125, 260):
+            state = StreamingIndicators.from_history(self.history.iloc[:cut])
+            self.assertMatchesEngine(state.values(), self.history.iloc[:cut])
+
+    def test_peek_does_not_commit(self):
+        from streaming_indicators import StreamingIndicators
+        state = StreamingIndicators.from_history(self.history.iloc[:-1])
+        before = state.values()
+        last = self.history.iloc[-1][['High', 'Low', 'Close', 'Volume']].to_dict()
+        peeked = state.peek(last)
+        self.assertEqual(state.values(), before)
+        self.assertMatchesEngine(peeked, self.history)
+
+    def test_serialization_round_trip(self):
+        import json
+        from streaming_indicators import StreamingIndicators
+        state = StreamingIndicators.from_history(self.history.iloc[:200])
+        restored = StreamingIndicators.from_dict(json.loads(json.dumps(state.to_dict())))
+        self.assertEqual(restored.extend(self.history), 60)
+        self.assertMatchesEngine(restored.values(), self.history)
+
+    def test_store_only_processes_new_bars(self):
+        from streaming_indicators import IndicatorStateStore, StreamingIndicators
+        store = IndicatorStateStore(root=self.root)
+        store.latest('BBCA.JK', self.history.iloc[:200])
+        self.assertTrue(os.path.exists(os.path.join(self.root, 'BBCA.JK.indicators.json')))
+
+        reloaded = IndicatorStateStore(root=self.root)
+        with patch.object(StreamingIndicators, 'from_history') as reseed:
+            values = reloaded.latest('BBCA.JK', self.history)
+        reseed.assert_not_called()
+        self.assertEqual(reloaded._states['BBCA.JK'].bars, 259)
+        self.assertMatchesEngine(values, self.history)
+
+    def test_store_reseeds_after_price_adjustment(self):
+        from streaming_indicators import IndicatorStateStore
+        store = IndicatorStateStore(root=self.root)
+        store.latest('BBCA.JK', self.history.iloc[:200])
+        adjusted = self.history.copy()
+        adjusted[['Open', 'High', 'Low', 'Close']] *= 0.5  # Split re-adjusts the whole history
+        values = store.latest('BBCA.JK', adjusted)
+        self.assertEqual(store.reseeds, 1)
+        self.assertMatchesEngine(values, adjusted)
+
+
+class TestTechnicalScanner(unittest.TestCase):
+    """Vectorized scanner over a dates x symbols panel."""
+
+    def make_panel(self, n_symbols=4, n_bars=260, seed=5):
+        import numpy as np
+        import pandas as pd
+        rng = np.random.default_rng(seed)
+        close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_bars, n_symbols)), axis=0))
+        index = pd.date_range('2024-01-01', periods=n_bars, freq='B')
+        columns = [f"S{i:03d}" for i in range(n_symbols)]
+        frame = lambda values: pd.DataFrame(values, index=index, columns=columns)
+        return {'Close': frame(close), 'High': frame(close * 1.01), 'Low': frame(close * 0.99),
+                'Volume': frame(np.full(close.shape, 1000.0))}
+
+    def test_matches_single_symbol_engine(self):
+        import pandas as pd
+        from indicators import IndicatorSet
+        from signals import get_technical_signals
+        from scanner import scan_panel
+        panel = self.make_panel()
+        table = scan_panel(panel).set_index('Saham')
+        for symbol in panel['Close'].columns:
+            history = pd.DataFrame({field: panel[field][symbol] for field in panel})
+            ind = IndicatorSet(history)
+            row = table.loc[symbol]
+            self.assertAlmostEqual(row['RSI14'], ind.last('rsi', 14), places=6)
+            self.assertAlmostEqual(row['ADX14'], ind.last('adx', 14), places=6)
+            self.assertAlmostEqual(row['MA200'], ind.last('sma', 200), places=6)
+            self.assertEqual(row['Sinyal'], get_technical_signals(history)['signal'])
+
+    def test_ranked_best_first_and_short_history_flagged(self):
+        import numpy as np
+        from scanner import scan_panel
+        panel = self.make_panel(n_symbols=6)
+        panel['Close'].iloc[:230, 2] = np.nan  # Listed 30 bars ago
+        table = scan_panel(panel)
+        self.assertEqual(list(table['Skor']), sorted(table['Skor'], reverse=True))
+        short = table.set_index('Saham').loc['S002']
+        self.assertEqual(short['Sinyal'], 'DATA KURANG')
+        self.assertTrue(np.isnan(short['MA200']))
+
+    def test_golden_cross_detected(self):
+        import numpy as np
+        import pandas as pd
+        from scanner import scan_panel
+        close = np.concatenate([np.linspace(2000, 1000, 230), np.linspace(1000, 4000, 30)])
+        index = pd.date_range('2024-01-01', periods=len(close), freq='B')
+        panel = {f: pd.DataFrame({'X': close * m}, index=index)
+                 for f, m in (('Close', 1), ('High', 1.01), ('Low', 0.99), ('Volume', 1))}
+        cross = pd.Series(close).rolling(50).mean() - pd.Series(close).rolling(200).mean()
+        crossed_at = int(np.argmax(cross.to_numpy() > 0))
+        table = scan_panel(panel, lookback=len(close) - crossed_at + 1)
+        self.assertEqual(table.loc[0, 'Cross MA'], 'Golden Cross')
+
+    def test_full_universe_scan(self):
+        from scanner import scan_panel
+        panel = self.make_panel(n_symbols=300, n_bars=250)
+        table = scan_panel(panel)
+        self.assertEqual(len(table), 300)
+        self.assertEqual(set(table['Saham']), set(panel['Close'].columns))
+
+    def test_load_panel_aligns_symbols(self):
+        import pandas as pd
+        import scanner
+        panel = self.make_panel(n_symbols=2, n_bars=60)
+        histories = {f"{s}.JK": pd.DataFrame({f: panel[f][s] for f in panel}).iloc[i * 5:]
+                     for i, s in enumerate(panel['Close'].columns)}
+        store = MagicMock(get_history=lambda ticker, period: histories.get(ticker, pd.DataFrame()))
+        with patch.object(scanner, 'bar_store', store):
+            loaded, failed = scanner.load_panel(['S000', 'S001', 'ZZZZ'])
+        self.assertEqual(failed, [('ZZZZ', 'No data')])
+        self.assertEqual(list(loaded['Close'].columns), ['S000', 'S001'])
+        self.assertEqual(len(loaded['Close']), 60)
+        self.assertEqual(int(loaded['Close']['S001'].isna().sum()), 5)
+
+
+class TestParamSweep(unittest.TestCase):
+    """Signal threshold sweep over shared-memory price arrays."""
+
+    def test_workers_do_not_import_streamlit_pages(self):
+        import subprocess
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        code = ("import sys, param_sweep; "
+                "print(sorted(m for m in ('streamlit', 'pages_analysis', 'news_index') if m in sys.modules))")
+        out = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, timeout=60)
+        self.assertEqual(out.stdout.strip(), '[]', out.stderr)
+
+    def make_histories(self, n_symbols=3, n_bars=300):
+        import numpy as np
+        import pandas as pd
+        histories = {}
+        for i in range(n_symbols):
+            rng = np.random.default_rng(i)
+            close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.02, n_bars)))
+            index = pd.date_range('2023-01-02', periods=n_bars, freq='B', tz='Asia/Jakarta')
+            histories[f"S{i}"] = pd.DataFrame({
+                'Open': close * (1 + rng.normal(0, 0.005, n_bars)), 'High': close * 1.01,
+                'Low': close * 0.99, 'Close': close, 'Volume': rng.integers(100_000, 1_000_000, n_bars).astype(float),
+            }, index=index)
+        return histories
+
+    def test_param_generation(self):
+        from param_sweep import grid_params, random_params
+        grid = grid_params({'rsi_oversold': [20, 25], 'adx_trend': [20, 25, 30]})
+        self.assertEqual(len(grid), 6)
+        self.assertIn({'rsi_oversold': 20, 'adx_trend': 30}, grid)
+        sample = random_params({'rsi_oversold': (15, 35), 'ema_fast': [5, 8]}, n=10, seed=1)
+        self.assertEqual(len(sample), 10)
+        self.assertEqual(sample, random_params({'rsi_oversold': (15, 35), 'ema_fast': [5, 8]}, n=10, seed=1))
+        self.assertTrue(all(15 <= p['rsi_oversold'] <= 35 for p in sample))
+        with self.assertRaises(ValueError):
+            grid_params({'rsi_typo': [1]})
+
+    def test_params_change_scalar_and_series_alike(self):
+        from signals import get_multi_timeframe_signals, multi_timeframe_signal_series
+        history = self.make_histories(n_symbols=1)['S0']
+        params = {'rsi_oversold': 35, 'rsi_overbought': 60, 'adx_trend': 15, 'ema_fast': 8}
+        series = multi_timeframe_signal_series(history, params=params)
+        for i in (120, 200, len(history) - 1):
+            signals = get_multi_timeframe_signals(history.iloc[:i + 1], params=params)
+            for sig in signals:
+                self.assertEqual(series[f"{sig['label']} Sinyal"].iloc[i], sig['signal'])
+
+    def test_pool_matches_serial_and_results_are_queryable(self):
+        import pandas as pd
+        from param_sweep import SweepResults, grid_params, run_sweep
+        histories = self.make_histories()
+        params = grid_params({'rsi_oversold': [20, 30], 'adx_trend': [20, 25]})
+        _, serial = run_sweep(histories, params, processes=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            results = SweepResults(os.path.join(tmp, 'sweep.sqlite3'))
+            run_id, pooled = run_sweep(histories, params, processes=2, results=results)
+            pd.testing.assert_frame_equal(serial, pooled)
+            self.assertEqual(len(pooled), 3 * 4)
+
+            summary = results.summary(run_id, '1 Bulan')
+            self.assertEqual(len(summary), 4)
+            self.assertTrue((summary['symbols'] == 3).all())
+            rows = results.query("SELECT symbol, rsi_oversold, adx_trend, ema_fast FROM sweep_results "
+                                 "WHERE run_id = ? AND rsi_oversold = 30", [run_id])
+            self.assertEqual(len(rows), 6)
+            self.assertTrue((rows['ema_fast'] == 5).all())  # Default filled in
+
+
+class TestAutoRejectScanner(unittest.TestCase):
+    """Vectorized ARA/ARB proximity over a whole universe."""
+
+    def test_limits_and_tick_distances(self):
+        from scanner import scan_limits
+        table = scan_limits(['A', 'B', 'C', 'D', 'E'], [1000, 1000, 200, 150, float('nan')],
+                            [1250, 1240, 171, 149, 500], near_ticks=3).set_index('Saham')
+        self.assertNotIn('E', table.index)  # No previous close
+        self.assertEqual(list(table['ARA']), [1250, 1250, 250, 202])
+        self.assertEqual(list(table['ARB']), [850, 850, 170, 128])
+        self.assertEqual(table.loc['A', 'Status'], 'ARA')
+        self.assertEqual(table.loc['B', 'Tick ke ARA'], 2)   # 1240 -> 1245 -> 1250
+        self.assertEqual(table.loc['B', 'Status'], 'Dekat ARA')
+        self.assertEqual(table.loc['C', 'Tick ke ARB'], 1)
+        self.assertEqual(table.loc['C', 'Status'], 'Dekat ARB')
+        self.assertEqual(table.loc['D', 'Tick ke ARA'], 52)  # 149 -> 199 by 1, 200 -> 202 by 2
+        self.assertEqual(table.loc['D', 'Status'], '-')
+
+    def test_matches_scalar_rules_across_universe(self):
+        import numpy as np
+        from scanner import scan_limits
+        from utils import ara_arb_limits
+        rng = np.random.default_rng(3)
+        prev = rng.integers(50, 40000, 500).astype(float)
+        table = scan_limits([f"S{i}" for i in range(500)], prev, prev, board='acceleration')
+        for p, ara, arb in zip(prev[:100], table['ARA'], table['ARB']):
+            self.assertEqual((ara, arb), ara_arb_limits(p, 'acceleration'))
+
+    def test_sources(self):
+        import pandas as pd
+        from scanner import limits_from_overview, limits_from_panel
+        rows = [{'Symbol': 'BBRI', 'Price': 4990, 'Change': 990}, {'Symbol': 'TLKM', 'Price': None, 'Change': 0}]
+        table = limits_from_overview(rows)
+        self.assertEqual(list(table['Saham']), ['BBRI'])
+        self.assertEqual(table.iloc[0]['ARA'], 5000)      # Prev close 4000 -> +25%
+        self.assertEqual(table.iloc[0]['Tick ke ARA'], 1)
+        close = pd.DataFrame({'AAAA': [100.0, 130.0], 'BBBB': [300.0, 258.0]})
+        table = limits_from_panel({'Close': close}).set_index('Saham')
+        self.assertEqual(table.loc['AAAA', 'ARA'], 135)
+        self.assertEqual(table.loc['BBBB', 'ARB'], 256)   # 255 rounded up to the 2-tick
+        self.assertEqual(table.loc['BBBB', 'Tick ke ARB'], 1)
+
+
+class TestLimitStreaks(unittest.TestCase):
+    """Historical ARA/ARB streak detection over a dates x symbols panel."""
+
+    def make_panel(self):
+        import numpy as np
+        import pandas as pd
+        index = pd.date_range('2024-01-01', periods=10, freq='B')
+        close = pd.DataFrame({
+            'AAAA': [100, 135, 182, 182, np.nan, 244, 250, 250, 250, 251],  # ARA x3 around a suspension
+            'BBBB': [1000, 850, 725, 700, 700, 700, 700, 700, 700, 700],    # ARB x2
+            'CCCC': [np.nan, np.nan, 100, 135, 100, 100, 100, 135, 182, 244],  # Single ARA, then ARA x3 to the end
+        }, index=index, dtype=float)
+        volume = close.notna().astype(float) * 1000
+        volume.loc[index[3], 'AAAA'] = 0  # Suspended bar reported with zero volume
+        return {'Close': close, 'Volume': volume}
+
+    def test_event_table(self):
+        import math
+        from limit_events import find_limit_streaks
+        events = find_limit_streaks(self.make_panel())
+        rows = {(r['Saham'], r['Tipe']): r for _, r in events.iterrows()}
+        self.assertEqual(set(rows), {('AAAA', 'ARA'), ('BBBB', 'ARB'), ('CCCC', 'ARA')})
+        a = rows[('AAAA', 'ARA')]
+        self.assertEqual((a['Hari Limit'], a['Hari Suspensi']), (3, 2))
+        self.assertEqual((a['Harga Awal'], a['Harga Akhir']), (100, 244))
+        self.assertAlmostEqual(a['Return Hari Berikut %'], (250 / 244 - 1) * 100)
+        b = rows[('BBBB', 'ARB')]
+        self.assertEqual((b['Hari Limit'], b['Harga Akhir']), (2, 725))
+        self.assertTrue(math.isnan(rows[('CCCC', 'ARA')]['Return Hari Berikut %']))  # Streak still running
+        self.assertEqual(len(find_limit_streaks(self.make_panel(), min_length=4)), 0)
+
+    def test_adjusted_prices_within_tolerance(self):
+        from limit_events import find_limit_streaks, mark_limit_hits
+        panel = self.make_panel()
+        adjusted = {'Close': panel['Close'] * 0.987, 'Volume': panel['Volume']}  # Dividend-adjusted history
+        self.assertEqual(len(find_limit_streaks(adjusted)), 3)
+        state = mark_limit_hits(panel['Close'], panel['Volume'])
+        self.assertTrue(state['suspended'][3, 0] and state['suspended'][4, 0])
+        self.assertFalse(state['suspended'][0, 2])  # Not yet listed
+
+
+class TestSnapshotCache(unittest.TestCase):
+    """Persistent SQLite snapshot cache shared across processes."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'snapshots.sqlite3')
+
+    def make_cache(self, **kwargs):
+        from snapshot_cache import SnapshotCache
+        return SnapshotCache(path=self.path, **kwargs)
+
+    def test_put_and_get_round_trip(self):
+        cache = self.make_cache()
+        info = {'regularMarketPrice': 9000, 'trailingPE': 20.1, 'sector': 'Financial Services'}
+        cache.put('BBCA.JK', info)
+        self.assertEqual(cache.get('BBCA.JK'), info)
+        self.assertEqual(cache.get('BBCA.JK', groups=('price',)), {'regularMarketPrice': 9000})
+        self.assertIsNone(cache.get('BBRI.JK'))
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (2, 1, 3))
+
+    def test_field_groups_expire_independently(self):
+        cache = self.make_cache(ttls={'price': 0.05})
+        cache.put('BBCA.JK', {'regularMarketPrice': 9000, 'trailingPE': 20.1})
+        time.sleep(0.06)
+        self.assertIsNone(cache.get('BBCA.JK', groups=('price', 'fundamentals')))
+        self.assertEqual(cache.get('BBCA.JK', groups=('fundamentals',)), {'trailingPE': 20.1})
+        cache.update_group('BBCA.JK', 'price', {'regularMarketPrice': 9100})
+        self.assertEqual(cache.get('BBCA.JK', groups=('price',)), {'regularMarketPrice': 9100})
+
+    def test_second_instance_sees_same_file(self):
+        self.make_cache().put('TLKM.JK', {'regularMarketPrice': 3000})
+        other = self.make_cache()
+        self.assertEqual(other.get('TLKM.JK', groups=('price',)), {'regularMarketPrice': 3000})
+
+    def test_size_cap_evicts_least_recently_accessed(self):
+        cache = self.make_cache(max_bytes=64 * 1024)
+        for i in range(60):
+            cache.put(f'S{i:03d}.JK', {'longBusinessSummary': 'x' * 4000})
+        stats = cache.stats()
+        self.assertGreater(stats['evictions'], 0)
+        self.assertLessEqual(stats['size_bytes'], 2 * 64 * 1024)
+        self.assertIsNotNone(cache.get('S059.JK', groups=('profile',)))
+
+    def test_unwritable_path_disables_cache(self):
+        from snapshot_cache import SnapshotCache
+        blocker = os.path.join(os.path.dirname(self.path), 'not_a_dir')
+        with open(blocker, 'w') as f:
+            f.write('x')
+        cache = SnapshotCache(path=os.path.join(blocker, 'db.sqlite3'))
+        cache.put('BBCA.JK', {'regularMarketPrice': 1})
+        self.assertIsNone(cache.get('BBCA.JK'))
+        self.assertTrue(cache.disabled)
+
+    def test_snapshot_hit_skips_yahoo_and_limiter(self):
+        import utils
+        cache = isolate_snapshot_cache(self)
+        cache.put('BBCA.JK', {'regularMarketPrice': 9000, 'trailingPE': 20.0, 'trailingEps': 450})
+        limiter = MagicMock()
+        utils.raw_info_cache.clear()
+        with patch.object(utils.yf, 'Ticker', side_effect=AssertionError('network')), \
+                patch.object(utils, 'yfinance_limiter', limiter):
+            data = utils.fetch_stock_data(['BBCA'])
+        self.assertEqual(data['BBCA.JK']['Current Price'], 9000)
+        self.assertEqual(data['BBCA.JK']['Trailing P/E (PER)'], 20.0)
+        limiter.acquire.assert_not_called()
+
+
 class TestStateManagerHardening(unittest.TestCase):
     """ISO 25010: Query Parameter Input Validation"""
 
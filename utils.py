@@ -1,16 +1,18 @@
 import re
-import time
 import math
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
-import streamlit as st
 import yfinance as yf
 import numpy as np
 import requests
 
+from data_cache import SWRCache
+from fetch_engine import DEFAULT_MAX_WORKERS, fetch_concurrently, run_in_background
 from logger import get_logger, log_security_event, log_user_action
 from rate_limiter import yfinance_limiter
+from singleflight import yahoo_flight
+from snapshot_cache import QUOTE_GROUPS, snapshot_cache
 
 # ── Security & Validation Constants ──────────────────────────
 MAX_SYMBOL_LENGTH = 10
@@ -20,6 +22,13 @@ MAX_INPUT_VALUE = 1_000_000_000_000  # 1 Trillion Rupiah cap
 MAX_YEARS_COMPOUND = 100  # Max years for compound interest to prevent DoS
 MAX_STEPS_ARA_ARB = 20  # Max steps for ARA/ARB calculation
 
+# ── Per-Symbol Caches ────────────────────────────────────────
+SYMBOL_CACHE_TTL = 300  # seconds
+SYMBOL_CACHE_MAX_STALE = 1800  # serve stale info (refreshing in background) up to 30 minutes
+SYMBOL_CACHE_MAX_ENTRIES = 2000
+raw_info_cache = SWRCache(ttl=SYMBOL_CACHE_TTL, max_stale=SYMBOL_CACHE_MAX_STALE,
+                          max_entries=SYMBOL_CACHE_MAX_ENTRIES)  # Yahoo info shared by Scraper & Screener
+
 
 def _safe_float(value, default=0.0):
     """Safely convert a value to float, returning default for None/NaN/Inf.
@@ -119,6 +128,98 @@ def round_price_to_tick(price: float, tick: int, mode: str = 'floor') -> int:
         return round(price / tick) * tick
 
 
+# ── Vectorized BEI Price Rules ───────────────────────────────
+# Same bands as the scalar functions above, as sorted boundaries for
+# np.searchsorted: band i holds prices in [BOUNDS[i-1], BOUNDS[i]).
+TICK_BOUNDS = np.array([200, 500, 2000, 5000], dtype=float)
+TICK_SIZES = np.array([1, 2, 5, 10, 25], dtype=np.int64)
+# Regular board: < 200 -> 35%, 200..5000 (inclusive) -> 25%, > 5000 -> 20%
+ARA_REGULAR_BOUNDS = np.array([200, np.nextafter(5000, np.inf)])
+ARA_REGULAR_PCTS = np.array([0.35, 0.25, 0.20])
+# Acceleration board: <= 10 -> 0 (absolute +/-1 rule), else 10%
+ARA_ACCELERATION_BOUNDS = np.array([np.nextafter(10, np.inf)])
+ARA_ACCELERATION_PCTS = np.array([0.0, 0.10])
+ARB_REGULAR_PCT = 0.15  # Flat, BEI Kep-00003/BEI/04-2025
+
+
+def _unwrap(values: np.ndarray, like):
+    """Return a Python scalar for scalar input, the array otherwise."""
+    return values.item() if np.ndim(like) == 0 else values
+
+
+def tick_sizes(prices):
+    """Array version of ``get_tick_size`` (scalar, list or ndarray in)."""
+    p = np.asarray(prices, dtype=float)
+    return _unwrap(TICK_SIZES[np.searchsorted(TICK_BOUNDS, p, side='right')], prices)
+
+
+def ara_arb_percentages(prices, board: str = 'regular'):
+    """Array version of ``get_ara_arb_percentage``."""
+    p = np.asarray(prices, dtype=float)
+    if board == 'acceleration':
+        pct = ARA_ACCELERATION_PCTS[np.searchsorted(ARA_ACCELERATION_BOUNDS, p, side='right')]
+    else:
+        pct = ARA_REGULAR_PCTS[np.searchsorted(ARA_REGULAR_BOUNDS, p, side='right')]
+        # NaN fails every comparison in the scalar rule and lands in its last branch
+        pct = np.where(np.isnan(p), ARA_REGULAR_PCTS[0], pct)
+    return _unwrap(pct, prices)
+
+
+def round_prices_to_ticks(prices, ticks, mode: str = 'floor'):
+    """Array version of ``round_price_to_tick`` (``ticks`` may be a scalar or an array)."""
+    p = np.asarray(prices, dtype=float)
+    t = np.asarray(ticks, dtype=float)
+    if mode == 'floor':
+        steps = np.floor(p / t)
+    elif mode == 'ceil':
+        steps = np.ceil(p / t)
+    else:
+        steps = np.round(p / t)  # Half to even, like round()
+    return _unwrap((steps * t).astype(np.int64), prices)
+
+
+def ara_arb_limits(prices, board: str = 'regular'):
+    """Next-session ARA and ARB prices for every price at once.
+
+    Same rules as one step of ``pages_ara_arb.calculate_ara_arb_sequence``:
+    percentage limit rounded inward to the tick of the limit price, at least
+    one tick above the price for ARA, never below Rp 1 for ARB, and the
+    +/- Rp 1 rule on the acceleration board at Rp 10 and below.
+
+    Returns (ara, arb) as int64 arrays; a scalar price goes through the
+    scalar rules and returns plain numbers.
+    """
+    if np.ndim(prices) == 0:
+        return _ara_arb_limit(prices, board)
+    p = np.asarray(prices, dtype=float)
+    acceleration = board == 'acceleration'
+
+    ara_limit = p * (1 + ara_arb_percentages(p, board))
+    ara = round_prices_to_ticks(ara_limit, tick_sizes(ara_limit), 'floor')
+    ara = np.where(ara <= p, p + tick_sizes(p), ara)
+
+    arb_pct = ara_arb_percentages(p, board) if acceleration else ARB_REGULAR_PCT
+    arb_limit = p * (1 - arb_pct)
+    arb = np.maximum(round_prices_to_ticks(arb_limit, tick_sizes(arb_limit), 'ceil'), 1)
+
+    if acceleration:
+        small = p <= 10
+        ara = np.where(small, p + 1, ara)
+        arb = np.where(small, np.maximum(1, p - 1), arb)
+    return ara.astype(np.int64), arb.astype(np.int64)
+
+
+def _ara_arb_limit(price: float, board: str = 'regular') -> Tuple[float, float]:
+    if board == 'acceleration' and price <= 10:
+        return price + 1, max(1, price - 1)
+    ara_limit = price * (1 + get_ara_arb_percentage(price, board))
+    ara = round_price_to_tick(ara_limit, get_tick_size(ara_limit), 'floor')
+    if ara <= price:
+        ara = price + get_tick_size(price)
+    arb_pct = get_ara_arb_percentage(price, board) if board == 'acceleration' else ARB_REGULAR_PCT
+    arb_limit = price * (1 - arb_pct)
+    return ara, max(round_price_to_tick(arb_limit, get_tick_size(arb_limit), 'ceil'), 1)
+
 
 def apply_format_values(df: pd.DataFrame, formatters: Dict[str, callable]) -> pd.DataFrame:
     df_out = df.copy()
@@ -238,85 +339,234 @@ def format_large_number(value: float) -> str:
         return "0"
 
 
-@st.cache_data(ttl=300, show_spinner=False)
-def fetch_stock_data(symbols: List[str]) -> Dict[str, Dict[str, float]]:
+def _to_jk_symbol(symbol: str) -> str:
+    """Append the IDX '.JK' suffix expected by Yahoo Finance if missing."""
+    return symbol if symbol.endswith('.JK') else f"{symbol}.JK"
+
+
+def _fetch_raw_info(symbol: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """Fetch the canonical Yahoo ``info`` payload for one '.JK' symbol.
+
+    Falls back to ``fast_info`` when ``info`` comes back empty; that partial
+    payload only carries price and market cap and is not persisted.
+    Returns (info, None) or (None, reason).
+    """
     logger = get_logger()
-    data = {}
-    failed_symbols = []
-    for i, symbol in enumerate(symbols):
+    stock = yf.Ticker(symbol)
+    info = {}
+    try:
+        info = stock.info or {}
+    except Exception as e:
+        logger.warning(f"yfinance info failed for {symbol}: {e}")
+
+    # If info is empty or only has minimal keys, try fast_info as fallback
+    if not info or len(info) <= 1:
+        logger.warning(f"Empty info for {symbol}, trying fast_info fallback")
         try:
-            if not yfinance_limiter.acquire():
-                log_security_event('rate_limit', f'Rate limit hit for {symbol}', 'WARNING')
-                failed_symbols.append((symbol, 'Rate limited'))
-                continue
-            if not symbol.endswith('.JK'):
-                symbol = f"{symbol}.JK"
+            fi = stock.fast_info
+            current_price = getattr(fi, 'last_price', None) or getattr(fi, 'regular_market_previous_close', None)
+            market_cap = getattr(fi, 'market_cap', 0)
+            if current_price and current_price > 0:
+                logger.info(f"Got price for {symbol} via fast_info: {current_price}")
+                return {
+                    'regularMarketPrice': float(current_price),
+                    'marketCap': float(market_cap) if market_cap else 0,
+                }, None
+        except Exception as e2:
+            logger.warning(f"fast_info also failed for {symbol}: {e2}")
+        return None, 'Empty info from Yahoo'
+
+    snapshot_cache.put(symbol, info)
+    return info, None
+
+
+def _cached_raw_info(tickers: List[str]) -> Tuple[Dict[str, Dict], List[str]]:
+    """Look up raw info in ``raw_info_cache`` then the snapshot cache, without network calls.
+
+    Stale entries are returned as hits and refreshed on a background thread.
+    """
+    cached, missing, stale = raw_info_cache.lookup_many(tickers)
+    refresh = raw_info_cache.claim_refresh(stale)
+    if refresh:
+        run_in_background(_refresh_raw_info, refresh)
+    if missing:
+        snapshots = snapshot_cache.get_many(missing, groups=QUOTE_GROUPS)
+        for ticker, info in snapshots.items():
+            cached[ticker] = info
+            raw_info_cache.set(ticker, info)
+        missing = [t for t in missing if t not in cached]
+    return cached, missing
+
+
+def _refresh_raw_info(tickers: List[str]) -> None:
+    """Background job replacing stale ``raw_info_cache`` entries."""
+    try:
+        fetched, _ = fetch_concurrently(
+            tickers, _fetch_raw_info, max_workers=DEFAULT_MAX_WORKERS,
+            limiter=yfinance_limiter, label='info refresh', flight=yahoo_flight,
+        )
+        for ticker, info in fetched.items():
+            raw_info_cache.set(ticker, info)
+    finally:
+        raw_info_cache.release_refresh(tickers)
 
-            # Small delay between requests to avoid Yahoo throttling on cloud
-            if i > 0:
-                time.sleep(0.5)
 
-            stock = yf.Ticker(symbol)
-            info = {}
-            try:
-                info = stock.info or {}
-            except Exception as e:
-                logger.warning(f"yfinance info failed for {symbol}: {e}")
-
-            # If info is empty or only has minimal keys, try fast_info as fallback
-            if not info or len(info) <= 1:
-                logger.warning(f"Empty info for {symbol}, trying fast_info fallback")
-                try:
-                    fi = stock.fast_info
-                    current_price = getattr(fi, 'last_price', None) or getattr(fi, 'regular_market_previous_close', None)
-                    if current_price and current_price > 0:
-                        data[symbol] = {
-                            'Symbol': symbol.replace('.JK', ''),
-                            'Current Price': float(current_price),
-                            'Price/Book (PBVR)': 0,
-                            'Trailing P/E (PER)': 0,
-                            'Total Debt/Equity (mrq) (DER)': 0,
-                            'Return on Equity (%) (ROE)': 0,
-                            'Diluted EPS (ttm) (EPS)': 0,
-                            'Forward Annual Dividend Rate (DPS)': 0,
-                            'Forward Annual Dividend Yield (%)': 0,
-                        }
-                        logger.info(f"Got price for {symbol} via fast_info: {current_price}")
-                        continue
-                except Exception as e2:
-                    logger.warning(f"fast_info also failed for {symbol}: {e2}")
-                failed_symbols.append((symbol, 'Empty info from Yahoo'))
-                continue
+def raw_info_as_of(symbols: List[str]) -> Optional[float]:
+    """Return when the oldest cached info among ``symbols`` was fetched (epoch seconds)."""
+    return raw_info_cache.as_of(_to_jk_symbol(s) for s in symbols)
 
-            current_price = None
-            price_keys = ['regularMarketPrice', 'regularMarketPreviousClose', 'currentPrice', 'previousClose']
-            for key in price_keys:
-                if key in info and info[key] is not None and info[key] > 0:
-                    current_price = info[key]
-                    break
-            if current_price is None:
-                failed_symbols.append((symbol, 'No price data in response'))
-                continue
-            forward_dividend_yield = _safe_float(info.get('dividendYield', 0))
-            roe = _safe_float(info.get('returnOnEquity', 0))
-            trailing_pe = _safe_float(info.get('trailingPE', 0))
-            price_to_book = _safe_float(info.get('priceToBook', 0))
-            debt_to_equity = _safe_float(info.get('debtToEquity', 0))
-            data[symbol] = {
-                'Symbol': symbol.replace('.JK', ''),
-                'Current Price': current_price,
-                'Price/Book (PBVR)': price_to_book,
-                'Trailing P/E (PER)': trailing_pe,
-                'Total Debt/Equity (mrq) (DER)': debt_to_equity,
-                'Return on Equity (%) (ROE)': roe,
-                'Diluted EPS (ttm) (EPS)': round(_safe_float(info.get('trailingEps', 0))),
-                'Forward Annual Dividend Rate (DPS)': round(_safe_float(info.get('dividendRate', 0))),
-                'Forward Annual Dividend Yield (%)': forward_dividend_yield,
-            }
+
+def fetch_raw_info(symbols: List[str], max_workers: int = DEFAULT_MAX_WORKERS) -> Tuple[Dict[str, Dict], List[Tuple[str, str]]]:
+    """Return the raw Yahoo ``info`` payload for many symbols, fetching each at most once.
+
+    Lookups go through ``raw_info_cache`` (stale-while-revalidate), then the
+    on-disk snapshot cache, and only the remaining misses are fetched concurrently. Snapshot hits
+    never draw a rate-limit token. Failed symbols are not cached so the next
+    call retries them.
+
+    Returns:
+        Tuple of (info keyed by '.JK' symbol in input order, list of (symbol, reason) failures).
+    """
+    tickers = list(dict.fromkeys(_to_jk_symbol(s) for s in symbols))
+    cached, missing = _cached_raw_info(tickers)
+    fetched, failed_symbols = fetch_concurrently(
+        missing, _fetch_raw_info, max_workers=max_workers,
+        limiter=yfinance_limiter, label='info fetch', flight=yahoo_flight,
+    )
+    for ticker, info in fetched.items():
+        raw_info_cache.set(ticker, info)
+
+    infos = {}
+    for ticker in tickers:
+        info = cached[ticker] if ticker in cached else fetched.get(ticker)
+        if info is not None:
+            infos[ticker] = info
+    return infos, failed_symbols
+
+
+def _project_rows(symbols: List[str], project, max_workers: int) -> Tuple[Dict[str, Dict[str, float]], List[Tuple[str, str]]]:
+    """Build one row per symbol by applying ``project`` to its raw info."""
+    infos, failed_symbols = fetch_raw_info(symbols, max_workers=max_workers)
+    data = {}
+    for ticker, info in infos.items():
+        row, reason = project(ticker, info)
+        if row is not None:
+            data[ticker] = row
+        else:
+            failed_symbols.append((ticker, reason))
+    return data, failed_symbols
+
+
+def _fetch_price_only_rows(symbols: List[str], max_workers: int) -> Tuple[Dict[str, Dict[str, float]], List[Tuple[str, str]]]:
+    """Build scraper rows from cached info where available, else from a bulk price download."""
+    tickers = list(dict.fromkeys(_to_jk_symbol(s) for s in symbols))
+    cached, missing = _cached_raw_info(tickers)
+    prices = fetch_bulk_prices(missing) if missing else {}
+    if missing:
+        run_in_background(fetch_raw_info, missing, max_workers)
+
+    data, failed_symbols = {}, []
+    for ticker in tickers:
+        info = cached[ticker] if ticker in cached else None
+        if info is None and ticker in prices:
+            info = {'regularMarketPrice': prices[ticker]}
+        if info is None:
+            failed_symbols.append((ticker, 'No price data in bulk download'))
+            continue
+        row, reason = _quote_row_from_info(ticker, info)
+        if row is not None:
+            data[ticker] = row
+        else:
+            failed_symbols.append((ticker, reason))
+    return data, failed_symbols
+
+
+def _quote_row_from_info(symbol: str, info: Dict) -> Tuple[Optional[Dict[str, float]], Optional[str]]:
+    """Project a Yahoo ``info`` payload onto a scraper row."""
+    current_price = None
+    price_keys = ['regularMarketPrice', 'regularMarketPreviousClose', 'currentPrice', 'previousClose']
+    for key in price_keys:
+        if key in info and info[key] is not None and info[key] > 0:
+            current_price = info[key]
+            break
+    if current_price is None:
+        return None, 'No price data in response'
+    forward_dividend_yield = _safe_float(info.get('dividendYield', 0))
+    roe = _safe_float(info.get('returnOnEquity', 0))
+    trailing_pe = _safe_float(info.get('trailingPE', 0))
+    price_to_book = _safe_float(info.get('priceToBook', 0))
+    debt_to_equity = _safe_float(info.get('debtToEquity', 0))
+    return {
+        'Symbol': symbol.replace('.JK', ''),
+        'Current Price': current_price,
+        'Price/Book (PBVR)': price_to_book,
+        'Trailing P/E (PER)': trailing_pe,
+        'Total Debt/Equity (mrq) (DER)': debt_to_equity,
+        'Return on Equity (%) (ROE)': roe,
+        'Diluted EPS (ttm) (EPS)': round(_safe_float(info.get('trailingEps', 0))),
+        'Forward Annual Dividend Rate (DPS)': round(_safe_float(info.get('dividendRate', 0))),
+        'Forward Annual Dividend Yield (%)': forward_dividend_yield,
+    }, None
+
+
+def _download_prices(tickers: List[str]) -> Optional[pd.DataFrame]:
+    """One rate-limited multi-ticker download of recent daily bars."""
+    if not yfinance_limiter.acquire():
+        log_security_event('rate_limit', f'Rate limit hit for bulk price download: {len(tickers)} symbols', 'WARNING')
+        return None
+    return yf.download(tickers, period="5d", group_by="ticker", progress=False,
+                       threads=False, timeout=HTTP_REQUEST_TIMEOUT)
+
+
+def fetch_bulk_prices(symbols: List[str]) -> Dict[str, float]:
+    """Fetch the latest close for many symbols with one multi-ticker ``yf.download``.
+
+    Each chunk of up to MAX_SYMBOLS_PER_REQUEST tickers costs a single
+    rate-limit token. Symbols without a usable close are left out.
+
+    Returns:
+        Dict of '.JK' symbol -> last close, in input order.
+    """
+    logger = get_logger()
+    tickers = list(dict.fromkeys(_to_jk_symbol(s) for s in symbols))
+    prices: Dict[str, float] = {}
+    for start in range(0, len(tickers), MAX_SYMBOLS_PER_REQUEST):
+        chunk = tickers[start:start + MAX_SYMBOLS_PER_REQUEST]
+        try:
+            df = yahoo_flight.do(('download', tuple(chunk), '5d'), _download_prices, chunk)
         except Exception as e:
-            logger.error(f"Exception fetching {symbol}: {type(e).__name__}: {e}")
-            failed_symbols.append((symbol, str(e)[:100]))
+            logger.warning(f"Bulk price download failed for {len(chunk)} symbols: {e}")
+            continue
+        if df is None or df.empty:
             continue
+        for ticker in chunk:
+            try:
+                pdf = df[ticker] if isinstance(df.columns, pd.MultiIndex) else df
+                closes = pd.to_numeric(pdf['Close'], errors='coerce').dropna()
+                if not closes.empty and closes.iloc[-1] > 0:
+                    prices[ticker] = float(closes.iloc[-1])
+            except (KeyError, TypeError, ValueError):
+                continue
+    return {t: prices[t] for t in tickers if t in prices}
+
+
+def fetch_stock_data(symbols: List[str], max_workers: int = DEFAULT_MAX_WORKERS,
+                     price_only: bool = False) -> Dict[str, Dict[str, float]]:
+    """Fetch scraper metrics for many symbols concurrently.
+
+    Rows are projections of the shared raw info (see ``fetch_raw_info``), so
+    editing a watchlist or switching to the Screener only fetches symbols not
+    seen recently. Rows are keyed by '.JK' symbol in input order.
+
+    With ``price_only=True`` symbols without cached info get a price-only row
+    from one bulk download (fundamentals zero), and their full info is
+    fetched on a background thread so the next call returns complete rows.
+    """
+    logger = get_logger()
+    if price_only:
+        data, failed_symbols = _fetch_price_only_rows(symbols, max_workers)
+    else:
+        data, failed_symbols = _project_rows(symbols, _quote_row_from_info, max_workers)
 
     if failed_symbols:
         logger.warning(f"Failed symbols: {failed_symbols}")
@@ -329,106 +579,57 @@ def fetch_stock_data(symbols: List[str]) -> Dict[str, Dict[str, float]]:
 # StockAnalysis helpers removed; we use Yahoo Finance only
 
 
-@st.cache_data(ttl=300, show_spinner=False)
-def fetch_enhanced_stock_data(symbols: List[str]) -> Dict[str, Dict[str, float]]:
+def _enhanced_row_from_info(symbol: str, info: Dict) -> Tuple[Optional[Dict[str, float]], Optional[str]]:
+    """Project a Yahoo ``info`` payload onto a screener row."""
+    # Determine a valid current price using several candidates
+    current_price = None
+    for key in ['regularMarketPrice', 'currentPrice', 'regularMarketPreviousClose', 'previousClose', 'ask', 'bid', 'open']:
+        try:
+            v = info.get(key)
+            if v is not None and float(v) > 0:
+                current_price = float(v)
+                break
+        except Exception:
+            pass
+    if current_price is None:
+        return None, 'No price data'
+
+    return {
+        'Symbol': symbol.replace('.JK', ''),
+        'Current Price': current_price,
+        'Market Cap': _safe_float(info.get('marketCap', 0)),
+        'Shares Outstanding': _safe_float(info.get('sharesOutstanding', 0)),
+        'Float Shares': _safe_float(info.get('floatShares', 0)),
+        'Institutional Ownership %': _safe_float(info.get('institutionOwnership', 0)) * 100,
+        'Insider Ownership %': _safe_float(info.get('heldPercentInsiders', 0)) * 100,
+        'Price/Book (PBVR)': _safe_float(info.get('priceToBook', 0)),
+        'Trailing P/E (PER)': _safe_float(info.get('trailingPE', 0)),
+        'Return on Equity (%) (ROE)': _safe_float(info.get('returnOnEquity', 0)) * 100,
+        'Return on Assets (%) (ROA)': _safe_float(info.get('returnOnAssets', 0)) * 100,
+        'Net Income': _safe_float(info.get('netIncomeToCommon', 0)),
+        'Cash from Operations': _safe_float(info.get('operatingCashflow', 0)),
+        'Free Cash Flow': _safe_float(info.get('freeCashflow', info.get('freeCashFlow', info.get('operatingCashflow', 0)))),
+        'Total Assets': _safe_float(info.get('totalAssets', 0)),
+        'Total Equity': _safe_float(info.get('totalStockholderEquity', 0)),
+        'Total Liabilities': _safe_float(info.get('totalDebt', 0)),
+        'EPS': _safe_float(info.get('trailingEps', 0)),
+        'Dividend Yield %': _safe_float(info.get('dividendYield', 0)) * 100,
+    }, None
+
+
+def fetch_enhanced_stock_data(symbols: List[str], max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, Dict[str, float]]:
     """Fetch richer set of metrics for screener (modeled from SahamBackup).
 
     Returns data including: Current Price, Market Cap, Shares Outstanding,
     Float Shares, Institutional/Insider Ownership %, PBV, PER, ROE, ROA,
     Net Income, Free Cash Flow, Cash from Operations, Total Assets/Equity/Liabilities.
+    Built from the same raw info as ``fetch_stock_data``, so opening the
+    Scraper and then the Screener costs one Yahoo round-trip per symbol.
     """
     logger = get_logger()
-    data: Dict[str, Dict[str, float]] = {}
-    failed_symbols = []
-    for i, symbol in enumerate(symbols):
-        try:
-            if not yfinance_limiter.acquire():
-                log_security_event('rate_limit', f'Rate limit hit for enhanced fetch: {symbol}', 'WARNING')
-                failed_symbols.append((symbol, 'Rate limited'))
-                continue
-            if not symbol.endswith('.JK'):
-                symbol = f"{symbol}.JK"
-
-            # Small delay between requests to avoid Yahoo throttling
-            if i > 0:
-                time.sleep(0.5)
-
-            stock = yf.Ticker(symbol)
-            info = {}
-            try:
-                info = stock.info or {}
-            except Exception as e:
-                logger.warning(f"yfinance info failed for enhanced {symbol}: {e}")
-
-            if not info or len(info) <= 1:
-                logger.warning(f"Empty info for enhanced {symbol}, trying fast_info fallback")
-                try:
-                    fi = stock.fast_info
-                    current_price = getattr(fi, 'last_price', None) or getattr(fi, 'regular_market_previous_close', None)
-                    market_cap = getattr(fi, 'market_cap', 0)
-                    if current_price and current_price > 0:
-                        data[symbol] = {
-                            'Symbol': symbol.replace('.JK', ''),
-                            'Current Price': float(current_price),
-                            'Market Cap': float(market_cap) if market_cap else 0,
-                            'Shares Outstanding': 0, 'Float Shares': 0,
-                            'Institutional Ownership %': 0, 'Insider Ownership %': 0,
-                            'Price/Book (PBVR)': 0, 'Trailing P/E (PER)': 0,
-                            'Return on Equity (%) (ROE)': 0, 'Return on Assets (%) (ROA)': 0,
-                            'Net Income': 0, 'Cash from Operations': 0,
-                            'Free Cash Flow': 0, 'Total Assets': 0,
-                            'Total Equity': 0, 'Total Liabilities': 0,
-                            'EPS': 0, 'Dividend Yield %': 0,
-                        }
-                        continue
-                except Exception as e2:
-                    logger.warning(f"fast_info also failed for enhanced {symbol}: {e2}")
-                failed_symbols.append((symbol, 'Empty info from Yahoo'))
-                continue
-
-            # Determine a valid current price using several candidates
-            current_price = None
-            for key in ['regularMarketPrice', 'currentPrice', 'regularMarketPreviousClose', 'previousClose', 'ask', 'bid', 'open']:
-                try:
-                    v = info.get(key)
-                    if v is not None and float(v) > 0:
-                        current_price = float(v)
-                        break
-                except Exception:
-                    pass
-            if current_price is None:
-                failed_symbols.append((symbol, 'No price data'))
-                continue
-
-            data[symbol] = {
-                'Symbol': symbol.replace('.JK', ''),
-                'Current Price': current_price,
-                'Market Cap': _safe_float(info.get('marketCap', 0)),
-                'Shares Outstanding': _safe_float(info.get('sharesOutstanding', 0)),
-                'Float Shares': _safe_float(info.get('floatShares', 0)),
-                'Institutional Ownership %': _safe_float(info.get('institutionOwnership', 0)) * 100,
-                'Insider Ownership %': _safe_float(info.get('heldPercentInsiders', 0)) * 100,
-                'Price/Book (PBVR)': _safe_float(info.get('priceToBook', 0)),
-                'Trailing P/E (PER)': _safe_float(info.get('trailingPE', 0)),
-                'Return on Equity (%) (ROE)': _safe_float(info.get('returnOnEquity', 0)) * 100,
-                'Return on Assets (%) (ROA)': _safe_float(info.get('returnOnAssets', 0)) * 100,
-                'Net Income': _safe_float(info.get('netIncomeToCommon', 0)),
-                'Cash from Operations': _safe_float(info.get('operatingCashflow', 0)),
-                'Free Cash Flow': _safe_float(info.get('freeCashflow', info.get('freeCashFlow', info.get('operatingCashflow', 0)))),
-                'Total Assets': _safe_float(info.get('totalAssets', 0)),
-                'Total Equity': _safe_float(info.get('totalStockholderEquity', 0)),
-                'Total Liabilities': _safe_float(info.get('totalDebt', 0)),
-                'EPS': _safe_float(info.get('trailingEps', 0)),
-                'Dividend Yield %': _safe_float(info.get('dividendYield', 0)) * 100,
-            }
-        except Exception as e:
-            logger.error(f"Exception in enhanced fetch for {symbol}: {type(e).__name__}: {e}")
-            failed_symbols.append((symbol, str(e)[:100]))
-            continue
+    data, failed_symbols = _project_rows(symbols, _enhanced_row_from_info, max_workers)
 
     if failed_symbols:
         logger.warning(f"Enhanced fetch failed symbols: {failed_symbols}")
 
     return data
-
-